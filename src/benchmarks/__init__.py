@@ -0,0 +1,4 @@
+"""Reproducible load benchmarks for ShopAI.
+
+Run ``python -m src.benchmarks --help`` for the command line driver.
+"""
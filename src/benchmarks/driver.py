@@ -0,0 +1,348 @@
+"""Benchmark driver for ShopAI autocomplete.
+
+This module replays a keystroke trace against the real ASGI app, wired to a
+FakePlacesServer through the production service registry, and reports
+throughput, latency percentiles and upstream Places calls per request. Results
+can be saved as per-scenario baselines in a JSON file; later runs are compared
+against them and regressions beyond a tolerance are reported.
+
+Requests are sent at their trace times divided by ``speed``, so keystrokes of
+one search supersede each other as they would in a browser; a speed of 0 sends
+every request at once to measure peak throughput. Latency percentiles cover
+completed requests, superseded and failed ones are counted separately.
+
+Example:
+    >>> from src.benchmarks.driver import SCENARIOS, run_scenario
+    >>> from src.benchmarks.trace import synthesize_trace
+    >>> from src.main import app
+    >>> result = await run_scenario(app, "default", synthesize_trace(seed=0))
+    >>> print(result.latency_p95, result.upstream_per_request)
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import httpx
+import orjson
+
+from ..core.config import Settings
+from ..services.service_registry import ServiceRegistry
+from .fake_places import FakePlacesServer, synthetic_places
+from .trace import Keystroke, load_trace, synthesize_trace
+
+AUTOCOMPLETE_URL = "/api/v1/locations/autocomplete"
+
+# FakePlacesServer options of each named upstream scenario
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "default": {"latency": 0.08, "jitter": 0.04},
+    "flaky": {"latency": 0.08, "jitter": 0.04, "error_rate": 0.05},
+    "quota": {"latency": 0.08, "jitter": 0.04, "qps": 60},
+    "slow": {"latency": 0.4, "jitter": 0.3},
+}
+
+# Compared metric -> (whether higher is worse, change ignored as noise)
+REGRESSION_METRICS = {
+    "latency_p50": (True, 0.002),
+    "latency_p95": (True, 0.002),
+    "latency_p99": (True, 0.002),
+    "throughput": (False, 0.0),
+    "upstream_per_request": (True, 0.01),
+    "error_rate": (True, 0.01),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Outcome of one benchmark run.
+
+    Attributes:
+        scenario: Name of the upstream scenario
+        requests: Requests sent
+        completed: Requests answered with suggestions
+        superseded: Requests cancelled by a newer keystroke of their session
+        errors: Requests that failed otherwise
+        duration: Seconds from the first request to the last response
+        throughput: Completed requests per second
+        latency_p50: Median latency of completed requests, in seconds
+        latency_p95: 95th percentile latency of completed requests
+        latency_p99: 99th percentile latency of completed requests
+        latency_mean: Mean latency of completed requests
+        upstream_calls: Requests the fake Places server received
+        upstream_per_request: Upstream calls per request sent
+        error_rate: Share of requests that failed
+    """
+
+    scenario: str
+    requests: int
+    completed: int
+    superseded: int
+    errors: int
+    duration: float
+    throughput: float
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    latency_mean: float
+    upstream_calls: int
+    upstream_per_request: float
+    error_rate: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dictionary."""
+        return asdict(self)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """The q-th percentile of values, interpolating between ranks.
+
+    Args:
+        values: Observations
+        q: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 for no observations
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def benchmark_settings(**overrides: Any) -> Settings:
+    """Production settings for the Google backend, pointed at a fake server."""
+    options: Dict[str, Any] = {
+        "google_maps_api_key": "benchmark",
+        "environment": "production",
+        "location_backend": "google",
+        "places_base_url": "http://fake-places",
+    }
+    options.update(overrides)
+    return Settings(**options)
+
+
+async def run_benchmark(
+    app: Any,
+    trace: Sequence[Keystroke],
+    server: FakePlacesServer,
+    settings: Optional[Settings] = None,
+    speed: float = 1.0,
+    include_details: bool = True,
+    scenario: str = "custom",
+) -> BenchmarkResult:
+    """Replay a trace against the app with a fake Places upstream.
+
+    Services are built from ``settings`` as at startup, with the Places client
+    talking to ``server`` in process, and replace the app's services for the
+    duration of the run.
+
+    Args:
+        app: The ASGI app, normally ``src.main.app``
+        trace: Keystrokes to replay
+        server: Fake Places upstream
+        settings: Service settings; defaults to :func:`benchmark_settings`
+        speed: Replay speed relative to the trace times; 0 sends all at once
+        include_details: Whether requests ask for place details
+        scenario: Name recorded in the result
+
+    Returns:
+        BenchmarkResult: Throughput, latency and upstream usage of the run
+    """
+    registry = ServiceRegistry.from_settings(
+        settings or benchmark_settings(),
+        places_transport=httpx.ASGITransport(app=server),
+    )
+    previous = getattr(app.state, "services", None)
+    app.state.services = registry
+    upstream_before = server.stats.total
+    latencies: List[float] = []
+    outcomes = {"superseded": 0, "errors": 0}
+    loop = asyncio.get_running_loop()
+
+    async def send(client: httpx.AsyncClient, keystroke: Keystroke) -> None:
+        if speed > 0:
+            delay = keystroke.at / speed - (loop.time() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        sent = time.perf_counter()
+        response = await client.post(
+            AUTOCOMPLETE_URL,
+            json={
+                "query": keystroke.query,
+                "include_details": include_details,
+                "session_token": keystroke.session,
+            },
+        )
+        latency = time.perf_counter() - sent
+        if response.status_code == 200:
+            latencies.append(latency)
+        elif response.json().get("code") == "request_superseded":
+            outcomes["superseded"] += 1
+        else:
+            outcomes["errors"] += 1
+
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            started = loop.time()
+            await asyncio.gather(*(send(client, keystroke) for keystroke in trace))
+            duration = loop.time() - started
+    finally:
+        app.state.services = previous
+        await registry.aclose()
+
+    requests = len(trace)
+    upstream_calls = server.stats.total - upstream_before
+    return BenchmarkResult(
+        scenario=scenario,
+        requests=requests,
+        completed=len(latencies),
+        superseded=outcomes["superseded"],
+        errors=outcomes["errors"],
+        duration=duration,
+        throughput=len(latencies) / duration if duration else 0.0,
+        latency_p50=percentile(latencies, 50),
+        latency_p95=percentile(latencies, 95),
+        latency_p99=percentile(latencies, 99),
+        latency_mean=sum(latencies) / len(latencies) if latencies else 0.0,
+        upstream_calls=upstream_calls,
+        upstream_per_request=upstream_calls / requests if requests else 0.0,
+        error_rate=outcomes["errors"] / requests if requests else 0.0,
+    )
+
+
+async def run_scenario(
+    app: Any,
+    scenario: str,
+    trace: Sequence[Keystroke],
+    places: int = 1_000,
+    seed: int = 0,
+    **kwargs: Any,
+) -> BenchmarkResult:
+    """Replay a trace against a fresh fake server configured as a scenario.
+
+    Args:
+        app: The ASGI app
+        scenario: Key of :data:`SCENARIOS`
+        trace: Keystrokes to replay
+        places: Places in the fake server's corpus
+        seed: Seed of the corpus, latency jitter and injected errors
+        **kwargs: Passed on to :func:`run_benchmark`
+
+    Returns:
+        BenchmarkResult: Result of the run
+    """
+    server = FakePlacesServer(
+        synthetic_places(places, seed), seed=seed, **SCENARIOS[scenario]
+    )
+    return await run_benchmark(app, trace, server, scenario=scenario, **kwargs)
+
+
+def compare_to_baseline(
+    result: BenchmarkResult, baseline: Dict[str, Any], tolerance: float = 0.1
+) -> List[str]:
+    """List the metrics of a result that regressed against a baseline.
+
+    A metric regresses when it is worse than the baseline by more than
+    ``tolerance`` relative to it and by more than its noise allowance.
+
+    Args:
+        result: The new result
+        baseline: A saved result of the same scenario, see :func:`as_dict`
+        tolerance: Allowed relative change, e.g. 0.1 for 10%
+
+    Returns:
+        List[str]: One description per regressed metric; empty if none
+    """
+    regressions = []
+    current = result.as_dict()
+    for metric, (higher_is_worse, noise) in REGRESSION_METRICS.items():
+        if metric not in baseline:
+            continue
+        old, new = float(baseline[metric]), float(current[metric])
+        change = new - old if higher_is_worse else old - new
+        if change > noise and change > abs(old) * tolerance:
+            regressions.append(f"{metric}: {old:.4g} -> {new:.4g}")
+    return regressions
+
+
+def load_baselines(path: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """Read saved baselines keyed by scenario; empty if the file is missing."""
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: Union[str, Path], result: BenchmarkResult) -> None:
+    """Store a result as the baseline of its scenario, keeping the others."""
+    baselines = load_baselines(path)
+    baselines[result.scenario] = result.as_dict()
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(baselines, option=orjson.OPT_INDENT_2))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run a benchmark from the command line; returns 1 on regressions."""
+    parser = argparse.ArgumentParser(description="Benchmark ShopAI autocomplete")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="default")
+    parser.add_argument("--trace", help="JSONL request log to replay")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--searches", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--places", type=int, default=1_000)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--no-details", action="store_true")
+    parser.add_argument("--baseline", help="JSON file of baselines by scenario")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store this run as baseline"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    # The app module reads settings at import; services come from the driver
+    os.environ.setdefault("GOOGLE_MAPS_API_KEY", "benchmark")
+    from ..main import app
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = synthesize_trace(
+            users=args.users, searches_per_user=args.searches, seed=args.seed
+        )
+    result = asyncio.run(
+        run_scenario(
+            app,
+            args.scenario,
+            trace,
+            places=args.places,
+            seed=args.seed,
+            speed=args.speed,
+            include_details=not args.no_details,
+        )
+    )
+    print(orjson.dumps(result.as_dict(), option=orjson.OPT_INDENT_2).decode())
+
+    if not args.baseline:
+        return 0
+    if args.save_baseline:
+        save_baseline(args.baseline, result)
+        print(f"Saved baseline for {args.scenario} to {args.baseline}")
+        return 0
+    baseline = load_baselines(args.baseline).get(args.scenario)
+    if baseline is None:
+        print(f"No baseline for {args.scenario} in {args.baseline}")
+        return 0
+    regressions = compare_to_baseline(result, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,269 @@
+"""Local stand-in for the Google Places web service.
+
+This module provides FakePlacesServer, an ASGI app answering the autocomplete
+and details endpoints used by AsyncPlacesClient with Google-shaped payloads
+from a seeded synthetic corpus. Each request can be delayed by a fixed latency
+plus random jitter, fail at a configured error rate, or be rejected with
+OVER_QUERY_LIMIT once a per-second or total quota is used up, so benchmarks
+see realistic upstream behaviour without network access or billing. Requests
+are counted per endpoint and outcome.
+
+The server runs in process behind ``httpx.ASGITransport``, or over HTTP with
+``python -m src.benchmarks.fake_places``.
+
+Example:
+    >>> import httpx
+    >>> from src.benchmarks.fake_places import FakePlacesServer
+    >>> from src.services.places_client import AsyncPlacesClient
+    >>> server = FakePlacesServer(latency=0.08, jitter=0.02, error_rate=0.01)
+    >>> client = AsyncPlacesClient(
+    ...     key="benchmark", transport=httpx.ASGITransport(app=server)
+    ... )
+    >>> predictions = await client.places_autocomplete("coffee")
+    >>> server.stats.as_dict()
+    {'autocomplete': 1, 'details': 0, 'errors': 0, 'throttled': 0}
+"""
+import argparse
+import asyncio
+import random
+import time
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import orjson
+
+from ..services.places_client import AUTOCOMPLETE_PATH, DETAILS_PATH
+from ..services.synthetic_places import synthetic_places as generate_places
+
+MAX_PREDICTIONS = 5
+
+
+@dataclass
+class FakePlacesStats:
+    """Requests answered by the fake server.
+
+    Attributes:
+        autocomplete: Autocomplete requests received
+        details: Details requests received
+        errors: Requests answered with an injected error
+        throttled: Requests rejected with OVER_QUERY_LIMIT
+    """
+
+    autocomplete: int = 0
+    details: int = 0
+    errors: int = 0
+    throttled: int = 0
+
+    @property
+    def total(self) -> int:
+        """All requests received."""
+        return self.autocomplete + self.details
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+def synthetic_places(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate a reproducible corpus of Places details results.
+
+    The places are those of the synthetic location backend, see
+    :func:`src.services.synthetic_places.synthetic_places`.
+
+    Args:
+        count: Number of places
+        seed: Random seed; the same seed yields the same places
+
+    Returns:
+        List of details ``result`` payloads with a ``place_id``, sorted by name
+    """
+    places = [place.to_result() for place in generate_places(count, seed)]
+    places.sort(key=lambda place: place["name"].casefold())
+    return places
+
+
+class FakePlacesServer:
+    """ASGI app imitating the Google Places autocomplete and details API.
+
+    Autocomplete matches the query as a prefix of a place name or of any word
+    in it, case-insensitively. Details return only the requested fields.
+
+    Attributes:
+        latency: Seconds every request takes before jitter
+        jitter: Extra seconds added uniformly at random, up to this amount
+        error_rate: Share of requests answered with ``error_status``
+        error_status: API status of injected errors
+        qps: Requests per second allowed before OVER_QUERY_LIMIT, or None
+        quota: Total requests allowed before OVER_QUERY_LIMIT, or None
+        stats: Request counters
+    """
+
+    def __init__(
+        self,
+        places: Optional[List[Dict[str, Any]]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: str = "UNKNOWN_ERROR",
+        qps: Optional[float] = None,
+        quota: Optional[int] = None,
+        seed: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.places = places if places is not None else synthetic_places(1_000, seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.qps = qps
+        self.quota = quota
+        self.stats = FakePlacesStats()
+        self._rng = random.Random(seed)
+        self._clock = clock
+        self._window_start = clock()
+        self._window_count = 0
+        self._by_id = {place["place_id"]: place for place in self.places}
+        # Sorted (token, index) pairs: every name and each word of it
+        self._tokens = sorted(
+            (token, i)
+            for i, place in enumerate(self.places)
+            for token in {place["name"].casefold(), *place["name"].casefold().split()}
+        )
+        self._keys = [token for token, _ in self._tokens]
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await receive()
+            await send({"type": "lifespan.startup.complete"})
+            await receive()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+        params = {
+            key: values[0]
+            for key, values in parse_qs(scope["query_string"].decode()).items()
+        }
+        status, body = await self.handle(scope["path"], params)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": orjson.dumps(body)})
+
+    async def handle(
+        self, path: str, params: Dict[str, str]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Answer one request.
+
+        Args:
+            path: Request path
+            params: Query parameters
+
+        Returns:
+            The HTTP status code and JSON body
+        """
+        if path == AUTOCOMPLETE_PATH:
+            self.stats.autocomplete += 1
+        elif path == DETAILS_PATH:
+            self.stats.details += 1
+        else:
+            return 404, {"status": "NOT_FOUND"}
+        if self._throttled():
+            self.stats.throttled += 1
+            return 200, {"status": "OVER_QUERY_LIMIT"}
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats.errors += 1
+            return 200, {"status": self.error_status}
+        if path == AUTOCOMPLETE_PATH:
+            predictions = self.autocomplete(params.get("input", ""))
+            status = "OK" if predictions else "ZERO_RESULTS"
+            return 200, {"status": status, "predictions": predictions}
+        place = self._by_id.get(params.get("placeid", ""))
+        if place is None:
+            return 200, {"status": "NOT_FOUND"}
+        fields = params.get("fields")
+        return 200, {"status": "OK", "result": self.details(place, fields)}
+
+    def autocomplete(self, text: str) -> List[Dict[str, Any]]:
+        """Predictions for places whose name, or a word of it, starts with text."""
+        prefix = " ".join(text.casefold().split())
+        if not prefix:
+            return []
+        matches = set()
+        for token_index in range(bisect_left(self._keys, prefix), len(self._keys)):
+            token, place_index = self._tokens[token_index]
+            if not token.startswith(prefix):
+                break
+            matches.add(place_index)
+        predictions = []
+        # Places are sorted by name, so the lowest indices come first
+        for place_index in sorted(matches)[:MAX_PREDICTIONS]:
+            place = self.places[place_index]
+            predictions.append({
+                "place_id": place["place_id"],
+                "description": f"{place['name']}, {place['vicinity']}",
+                "structured_formatting": {
+                    "main_text": place["name"],
+                    "secondary_text": place["vicinity"],
+                },
+                "types": place["types"],
+            })
+        return predictions
+
+    @staticmethod
+    def details(place: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+        """A place's details result, limited to a comma separated field mask."""
+        if not fields:
+            return dict(place)
+        # Places accepts the singular "type" for the "types" result key
+        wanted = {"types" if field == "type" else field for field in fields.split(",")}
+        return {key: value for key, value in place.items() if key in wanted}
+
+    def _throttled(self) -> bool:
+        if self.quota is not None and self.stats.total > self.quota:
+            return True
+        if self.qps is None:
+            return False
+        now = self._clock()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count > self.qps
+
+
+def main() -> None:
+    """Serve a fake Places server over HTTP."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--places", type=int, default=1_000)
+    parser.add_argument("--latency", type=float, default=0.08)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--qps", type=float, default=None)
+    parser.add_argument("--quota", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    server = FakePlacesServer(
+        synthetic_places(args.places, args.seed),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        qps=args.qps,
+        quota=args.quota,
+        seed=args.seed,
+    )
+    uvicorn.run(server, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Keystroke traces for ShopAI benchmarks.
+
+A trace is a time-ordered list of autocomplete requests as a search box sends
+them: one request per keystroke once a minimum prefix is typed, all requests
+of one search sharing a session token. Traces are synthesized reproducibly
+from a list of searches, or loaded from JSONL request logs with one object per
+line holding at least ``query`` and optionally ``at`` (seconds from the start
+of the trace) and ``session``. Log lines without ``at`` are expanded into
+keystrokes as if each query were typed.
+
+Example:
+    >>> from src.benchmarks.trace import keystrokes, synthesize_trace
+    >>> [k.query for k in keystrokes("coffee", session="s1")]
+    ['co', 'cof', 'coff', 'coffe', 'coffee']
+    >>> trace = synthesize_trace(users=50, seed=1)
+"""
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, List, Sequence, Union
+
+import orjson
+
+# Searches typed in synthesized traces, matching the fake Places corpus
+DEFAULT_QUERIES = (
+    "coffee", "corner coffee", "bakery", "golden bakery", "books", "old books",
+    "pharmacy", "central pharmacy", "supermarket", "pizza", "river pizza",
+    "sushi", "shoes", "little shoes", "electronics", "florist", "market",
+    "royal sushi", "harbour coffee", "park florist",
+)
+MIN_PREFIX = 2
+
+
+@dataclass(frozen=True)
+class Keystroke:
+    """One autocomplete request of a trace.
+
+    Attributes:
+        at: Seconds from the start of the trace when the request is sent
+        session: Session token shared by the keystrokes of one search
+        query: Text typed so far
+    """
+
+    at: float
+    session: str
+    query: str
+
+
+def keystrokes(
+    query: str,
+    session: str,
+    start: float = 0.0,
+    interval: float = 0.15,
+    min_prefix: int = MIN_PREFIX,
+) -> List[Keystroke]:
+    """Expand a search into the requests sent while typing it.
+
+    Args:
+        query: Complete search text
+        session: Session token of the search
+        start: Seconds from the start of the trace of the first request
+        interval: Seconds between keystrokes
+        min_prefix: Shortest prefix that triggers a request
+
+    Returns:
+        One Keystroke per typed character from ``min_prefix`` on, skipping
+        prefixes that end in whitespace
+    """
+    result = []
+    at = start
+    for end in range(min_prefix, len(query) + 1):
+        prefix = query[:end]
+        if prefix[-1].isspace():
+            continue
+        result.append(Keystroke(round(at, 6), session, prefix))
+        at += interval
+    return result
+
+
+def synthesize_trace(
+    queries: Sequence[str] = DEFAULT_QUERIES,
+    users: int = 20,
+    searches_per_user: int = 5,
+    interval: float = 0.15,
+    think_time: float = 1.0,
+    seed: int = 0,
+) -> List[Keystroke]:
+    """Generate a reproducible multi-user keystroke trace.
+
+    Each user runs ``searches_per_user`` searches picked at random from
+    ``queries``, typing with jittered keystroke intervals and pausing for a
+    jittered think time between searches. Users start at random offsets within
+    the first think time, so popular searches repeat across users.
+
+    Args:
+        queries: Searches to pick from
+        users: Simulated users typing concurrently
+        searches_per_user: Searches each user runs
+        interval: Mean seconds between keystrokes
+        think_time: Mean seconds between searches of a user
+        seed: Random seed; the same seed yields the same trace
+
+    Returns:
+        Keystrokes of all users ordered by send time
+    """
+    rng = random.Random(seed)
+    trace: List[Keystroke] = []
+    for user in range(users):
+        at = rng.uniform(0, think_time)
+        for search in range(searches_per_user):
+            query = rng.choice(queries)
+            session = f"user{user}-search{search}"
+            for keystroke in keystrokes(query, session, interval=0):
+                trace.append(Keystroke(round(at, 6), session, keystroke.query))
+                at += interval * rng.uniform(0.5, 1.5)
+            at += think_time * rng.uniform(0.5, 1.5)
+    trace.sort(key=lambda keystroke: keystroke.at)
+    return trace
+
+
+def load_trace(
+    path: Union[str, Path], interval: float = 0.15, think_time: float = 1.0
+) -> List[Keystroke]:
+    """Load a trace from a JSONL request log.
+
+    Args:
+        path: JSONL file with one request object per line
+        interval: Seconds between keystrokes of lines without ``at``
+        think_time: Seconds between searches of lines without ``at``
+
+    Returns:
+        Keystrokes ordered by send time
+
+    Raises:
+        ValueError: If a line is not a JSON object with a ``query`` string
+    """
+    trace: List[Keystroke] = []
+    at = 0.0
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+                query = entry["query"]
+            except (orjson.JSONDecodeError, TypeError, KeyError) as e:
+                raise ValueError(f"{path}:{number}: not a request object") from e
+            if not isinstance(query, str):
+                raise ValueError(f"{path}:{number}: query must be a string")
+            session = str(entry.get("session", f"line{number}"))
+            if "at" in entry:
+                trace.append(Keystroke(float(entry["at"]), session, query))
+                continue
+            typed = keystrokes(query, session, at, interval)
+            trace.extend(typed)
+            at = (typed[-1].at if typed else at) + think_time
+    trace.sort(key=lambda keystroke: keystroke.at)
+    return trace
+
+
+def save_trace(trace: Iterable[Keystroke], path: Union[str, Path]) -> None:
+    """Write a trace as JSONL, readable by :func:`load_trace`."""
+    with open(path, "wb") as f:
+        for keystroke in trace:
+            f.write(orjson.dumps(asdict(keystroke)) + b"\n")
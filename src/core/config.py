@@ -11,7 +11,7 @@ Example:
 """
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables.
@@ -19,9 +19,159 @@ class Settings(BaseSettings):
     Attributes:
         google_maps_api_key: API key for Google Maps Places API
         environment: Current environment (development/production)
+        places_details_concurrency: Maximum concurrent place details lookups
+        places_details_timeout: Timeout in seconds for a single details lookup
+        places_http2: Whether the Places client negotiates HTTP/2
+        places_timeout: Timeout in seconds for a single Places HTTP request
+        places_retry_timeout: Total seconds to keep retrying a Places request
+        places_max_connections: Size of the Places client connection pool
+        places_max_keepalive_connections: Idle connections kept alive in the pool
+        places_base_url: Places web service root, e.g. a local fake Places
+            server for benchmarks
+        location_cache_size: Maximum autocomplete results kept in memory
+        location_cache_ttl: Seconds an in-memory autocomplete result stays fresh
+        location_cache_path: SQLite file for the persistent result tier, if any
+        location_cache_persistent_ttl: Seconds a persisted result stays fresh
+        place_details_cache_size: Maximum places kept in the details cache
+        place_details_ttl: Seconds stable place details stay fresh
+        place_details_volatile_ttl: Seconds volatile place details stay fresh
+        location_batch_concurrency: Queries of a batch request run at once
+        location_backend: Places backend (auto/google/gazetteer/synthetic/mock);
+            auto uses Google in production and mock data otherwise
+        gazetteer_path: CSV/JSONL place file or ``.idx`` place index for the
+            gazetteer backend
+        synthetic_place_count: Places generated for the synthetic backend
+        synthetic_seed: Seed of the synthetic corpus and latency jitter
+        synthetic_result_count: Predictions the synthetic backend returns
+        synthetic_latency: Seconds each synthetic backend call takes
+        synthetic_jitter: Extra random seconds added to each synthetic call
+        geo_index_max_size: Maximum places held by the nearby-search index
+        response_cache_size: Maximum encoded location responses kept in memory
+        response_cache_ttl: Seconds encoded responses are served; also the
+            Cache-Control max-age sent to browsers and CDNs
+        response_cache_gzip_min_size: Smallest response body stored gzipped
+        response_cache_degraded_ttl: Seconds stale or detail-less responses are
+            served and may be cached downstream; 0 sends them with no-store
+        places_autocomplete_rate: Autocomplete calls per second within quota
+        places_autocomplete_burst: Autocomplete calls allowed in a burst
+        places_autocomplete_concurrency: Maximum autocomplete calls in flight
+        places_details_rate: Details call budget per second; calls are weighted
+            by the data they bill
+        places_details_burst: Details call budget allowed in a burst
+        places_rate_limit_wait: Seconds a call may wait for budget before the
+            request degrades to cached or detail-less results
+        places_autocomplete_timeout: Seconds to wait for an autocomplete call
+        location_cache_stale_ttl: Seconds past expiry cached suggestions are
+            still served while being refreshed in the background
+        place_details_stale_ttl: Seconds past expiry cached place details are
+            still served while being refreshed in the background
+        circuit_failure_threshold: Consecutive upstream failures that open the
+            Places circuit breaker
+        circuit_recovery_timeout: Seconds the circuit stays open before probing
+        circuit_slow_call_threshold: Seconds after which an upstream call counts
+            as a failure
+        session_debounce: Seconds an autocomplete request waits when it follows
+            the previous one of its session that closely; 0 disables debouncing
+        session_max_count: Autocomplete sessions tracked at once
+        llm_max_batch_size: Most prompts sent to the LLM provider in one call
+        llm_batch_window: Seconds a prompt waits for others to share its batch
+        llm_max_concurrency: Most LLM batches and streams in flight at once
+        llm_timeout: Seconds an LLM batch may take, or a stream may wait for
+            its next chunk
+        llm_cache_size: Maximum LLM responses kept in memory
+        llm_cache_ttl: Seconds a cached LLM response is served
+        llm_cache_path: SQLite file for the persistent LLM response tier, if any
+        llm_semantic_cache_threshold: Similarity from which a near-duplicate
+            prompt reuses a cached response; unset disables the semantic tier
+        intent_llm: Whether search intents are parsed by the LLM runtime; off
+            by default, since the bundled local provider does not answer with
+            intent JSON, and the LLM is then not built at all
+        intent_cache_size: Maximum parsed search intents kept in memory
+        intent_cache_ttl: Seconds a parsed search intent is reused
+        shared_cache_backend: Cache tier shared by all workers for suggestions
+            and place details (none/shm/redis)
+        shared_cache_path: Memory-mapped file of the shm backend
+        shared_cache_slots: Entries the shm backend holds
+        shared_cache_slot_size: Bytes per shm entry; larger values are skipped
+        shared_cache_url: Server of the redis backend, as redis://host:port/db
+        warmup_path: Snapshot JSON or JSONL traffic log of the queries and
+            place_ids warmed at startup; unset disables warm-up
+        warmup_max_queries: Most queries warmed
+        warmup_max_places: Most place_ids warmed
+        warmup_rate: Upstream Places calls per second the warm-up may make, on
+            top of live traffic
+        warmup_concurrency: Warm-up lookups, and upstream calls, in flight at once
+        warmup_timeout: Seconds after which warm-up stops and the app reports
+            ready regardless
     """
     google_maps_api_key: str
     environment: Literal["development", "production"] = "development"
+    places_details_concurrency: int = 10
+    places_details_timeout: float = 5.0
+    places_http2: bool = False
+    places_timeout: float = 10.0
+    places_retry_timeout: float = 60.0
+    places_max_connections: int = 100
+    places_max_keepalive_connections: int = 20
+    places_base_url: str = "https://maps.googleapis.com"
+    location_cache_size: int = 10_000
+    location_cache_ttl: float = 300.0
+    location_cache_path: Optional[str] = None
+    location_cache_persistent_ttl: float = 86_400.0
+    place_details_cache_size: int = 200_000
+    place_details_ttl: float = 86_400.0
+    place_details_volatile_ttl: float = 600.0
+    location_batch_concurrency: int = 8
+    location_backend: Literal[
+        "auto", "google", "gazetteer", "synthetic", "mock"
+    ] = "auto"
+    gazetteer_path: Optional[str] = None
+    synthetic_place_count: int = 10_000
+    synthetic_seed: int = 0
+    synthetic_result_count: int = 5
+    synthetic_latency: float = 0.0
+    synthetic_jitter: float = 0.0
+    geo_index_max_size: int = 1_000_000
+    response_cache_size: int = 10_000
+    response_cache_ttl: float = 60.0
+    response_cache_gzip_min_size: int = 1024
+    response_cache_degraded_ttl: float = 0.0
+    places_autocomplete_rate: float = 50.0
+    places_autocomplete_burst: float = 100.0
+    places_autocomplete_concurrency: int = 50
+    places_details_rate: float = 50.0
+    places_details_burst: float = 100.0
+    places_rate_limit_wait: float = 0.25
+    places_autocomplete_timeout: float = 3.0
+    location_cache_stale_ttl: float = 3_600.0
+    place_details_stale_ttl: float = 86_400.0
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0
+    circuit_slow_call_threshold: float = 2.5
+    session_debounce: float = 0.05
+    session_max_count: int = 100_000
+    llm_max_batch_size: int = 16
+    llm_batch_window: float = 0.005
+    llm_max_concurrency: int = 4
+    llm_timeout: float = 30.0
+    llm_cache_size: int = 10_000
+    llm_cache_ttl: float = 86_400.0
+    llm_cache_path: Optional[str] = None
+    llm_semantic_cache_threshold: Optional[float] = None
+    intent_llm: bool = False
+    intent_cache_size: int = 10_000
+    intent_cache_ttl: float = 86_400.0
+    shared_cache_backend: Literal["none", "shm", "redis"] = "none"
+    shared_cache_path: str = "/dev/shm/shopai-cache"
+    shared_cache_slots: int = 65_536
+    shared_cache_slot_size: int = 4_096
+    shared_cache_url: str = "redis://localhost:6379/0"
+    warmup_path: Optional[str] = None
+    warmup_max_queries: int = 500
+    warmup_max_places: int = 1_000
+    warmup_rate: float = 5.0
+    warmup_concurrency: int = 4
+    warmup_timeout: float = 120.0
     
     class Config:
         env_file = ".env"
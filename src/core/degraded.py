@@ -0,0 +1,52 @@
+"""Tracking of degraded results for ShopAI requests.
+
+When an upstream is slow, over budget or behind an open circuit breaker,
+services still answer with what they have: stale cache entries, or
+suggestions without details. Such an answer is fine to send once but must not
+be cached as if it were complete. Services call :func:`mark_degraded` when
+they fall back, and callers that cache results collect the reasons with
+:func:`track_degraded` around the call.
+
+Example:
+    >>> from src.core.degraded import track_degraded
+    >>> with track_degraded() as degraded:
+    ...     suggestions = await service.get_location_suggestions("coffee")
+    >>> degraded
+    {'details_unavailable'}
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Set
+
+_reasons: ContextVar[Optional[Set[str]]] = ContextVar("degraded", default=None)
+
+
+@contextmanager
+def track_degraded() -> Iterator[Set[str]]:
+    """Collect why results produced within the block are degraded.
+
+    Tasks started within the block inherit the collector, so fallbacks taken
+    in background work done for the request are recorded as well.
+
+    Yields:
+        Set[str]: Reasons recorded by :func:`mark_degraded`, empty if the
+        results are complete and fresh
+    """
+    reasons: Set[str] = set()
+    token = _reasons.set(reasons)
+    try:
+        yield reasons
+    finally:
+        _reasons.reset(token)
+
+
+def mark_degraded(*reasons: str) -> None:
+    """Record that the current result is stale or incomplete.
+
+    Args:
+        reasons: Short reasons, e.g. ``stale_suggestions``; ignored when no
+            caller is tracking
+    """
+    collected = _reasons.get()
+    if collected is not None:
+        collected.update(reasons)
@@ -9,12 +9,16 @@ and general exceptions, returning appropriate JSON responses.
 Functions:
     error_handler_middleware(request: Request, call_next): Middleware to handle 
     exceptions and return appropriate JSON responses.
+    timing_middleware(request: Request, call_next): Middleware to record request
+    latency by route and report it in a Server-Timing header.
     
 """
+import time
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from .exceptions import AppException
+from .metrics import ERRORS, REQUEST_SECONDS
 
 
 async def error_handler_middleware(request: Request, call_next):
@@ -36,11 +40,59 @@ async def error_handler_middleware(request: Request, call_next):
     try:
         return await call_next(request)
     except AppException as e:
+        ERRORS.inc(code=e.code)
         return JSONResponse(
             status_code=400,
             content={"code": e.code, "message": e.message, "details": e.details},
         )
     except Exception as e:
+        ERRORS.inc(code="internal_error")
         return JSONResponse(
             status_code=500, content={"code": "internal_error", "message": str(e)}
         )
+
+
+def _route_template(request: Request) -> str:
+    """
+    Returns the path template of the route that handled a request, e.g.
+    "/api/v1/locations/{place_id}", or "unmatched".
+    Routes of included routers may only know their path below the include
+    prefix, so the prefix is recovered from the concrete request path.
+    """
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    try:
+        suffix = template.format(**request.path_params)
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = request.url.path
+    if path.endswith(suffix):
+        return path[: len(path) - len(suffix)] + template
+    return template
+
+
+async def timing_middleware(request: Request, call_next):
+    """
+    Middleware to record request latency by method, route and status code.
+    The route is the matched path template, so path parameters do not create
+    new series; unmatched paths share one "unmatched" route. The duration is
+    also returned to the client in a Server-Timing header.
+    Args:
+        request (Request): The incoming HTTP request.
+        call_next (Callable): The next middleware or request handler.
+    Returns:
+        Response: The response of the handler.
+    """
+    started = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+    REQUEST_SECONDS.observe(
+        elapsed,
+        method=request.method,
+        route=_route_template(request),
+        status=str(response.status_code),
+    )
+    response.headers["Server-Timing"] = f"app;dur={elapsed * 1000:.1f}"
+    return response
@@ -0,0 +1,209 @@
+"""HTTP response cache for ShopAI.
+
+This module provides ResponseCache, which stores the final encoded body of a
+response, plus a gzip copy for larger bodies, keyed by a normalized request.
+Repeat requests are answered with the stored bytes without touching services
+or re-encoding JSON. Every response carries a weak ETag, honoured through
+If-None-Match with 304 replies, and Cache-Control so browsers and CDNs can
+absorb repeat keystrokes as well. Degraded results, such as stale entries or
+suggestions without details served while the upstream is failing, are sent
+once but kept out of both the cache and downstream caches, or cached only
+briefly when ``degraded_ttl`` is set.
+
+Example:
+    >>> from src.core.response_cache import ResponseCache
+    >>> cache = ResponseCache(ttl=60)
+    >>> response = await cache.serve(
+    ...     request, ("autocomplete", "starbucks"), lambda: load_suggestions()
+    ... )
+    >>> response.headers["cache-control"]
+    'public, max-age=60'
+"""
+import gzip
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+from ..services.cache import CacheStats, TTLCache
+from .degraded import track_degraded
+from .metrics import CACHE_LOOKUPS, STAGE_SECONDS
+from .responses import dumps
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """A response body encoded once and served many times.
+
+    Attributes:
+        body: JSON body
+        etag: Weak entity tag derived from the body
+        gzipped: Gzip-compressed body, if the body was large enough
+        max_age: Seconds clients may cache the body, if not the cache's ttl;
+            0 forbids storing it
+    """
+
+    body: bytes
+    etag: str
+    gzipped: Optional[bytes] = None
+    max_age: Optional[float] = None
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows a gzip response."""
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """LRU cache of encoded JSON responses with conditional request support.
+
+    Attributes:
+        ttl: Seconds entries are served, also sent as Cache-Control max-age
+        gzip_min_size: Smallest body in bytes that is stored gzip-compressed
+        degraded_ttl: Seconds degraded responses are served, also sent as their
+            max-age; 0 sends them with no-store and does not keep them
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 60.0,
+        gzip_min_size: int = 1024,
+        degraded_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.gzip_min_size = gzip_min_size
+        self.degraded_ttl = degraded_ttl
+        self._entries: TTLCache[EncodedResponse] = TTLCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss, eviction and expiration counters."""
+        return self._entries.stats
+
+    def get(self, key: Hashable) -> Optional[EncodedResponse]:
+        """Return the stored response for ``key``, if fresh."""
+        return self._entries.get(key)
+
+    def put(
+        self, key: Hashable, content: Any, ttl: Optional[float] = None
+    ) -> EncodedResponse:
+        """Encode ``content`` once and store it under ``key``.
+
+        Args:
+            key: Normalized request identity
+            content: JSON-compatible data, which may contain pydantic models
+            ttl: Seconds the entry is served and may be cached by clients,
+                defaults to ``ttl``
+
+        Returns:
+            EncodedResponse: The stored response
+        """
+        entry = self.encode(content, ttl)
+        self._entries.set(key, entry, ttl)
+        return entry
+
+    def encode(self, content: Any, max_age: Optional[float] = None) -> EncodedResponse:
+        """Encode ``content`` without storing it.
+
+        Args:
+            content: JSON-compatible data, which may contain pydantic models
+            max_age: Seconds clients may cache the body, defaults to ``ttl``
+
+        Returns:
+            EncodedResponse: The encoded response
+        """
+        with STAGE_SECONDS.time(stage="serialization"):
+            body = dumps(content)
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        gzipped = None
+        if len(body) >= self.gzip_min_size:
+            gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+        return EncodedResponse(
+            body=body, etag=f'W/"{digest}"', gzipped=gzipped, max_age=max_age
+        )
+
+    def render(self, entry: EncodedResponse, request: Request) -> Response:
+        """Build the reply to ``request`` from a stored response.
+
+        Args:
+            entry: The stored response
+            request: Incoming request, for its conditional and encoding headers
+
+        Returns:
+            Response: 304 if the client's copy is current, else the body, gzipped
+            when the client accepts it
+        """
+        max_age = self.ttl if entry.max_age is None else entry.max_age
+        headers: Dict[str, str] = {
+            "ETag": entry.etag,
+            "Cache-Control": f"public, max-age={int(max_age)}",
+            "Vary": "Accept-Encoding",
+        }
+        if max_age <= 0:
+            headers["Cache-Control"] = "no-store"
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, entry.etag):
+            return Response(status_code=304, headers=headers)
+        body = entry.body
+        if entry.gzipped is not None and _accepts_gzip(
+            request.headers.get("accept-encoding", "")
+        ):
+            body = entry.gzipped
+            headers["Content-Encoding"] = "gzip"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def serve(
+        self,
+        request: Request,
+        key: Hashable,
+        produce: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """Reply from the cache, producing and storing the content on a miss.
+
+        Content the services marked as degraded is stored for ``degraded_ttl``
+        only, and sent with the same max-age, or with no-store if that is 0.
+
+        Args:
+            request: Incoming request
+            key: Normalized request identity
+            produce: Zero-argument coroutine factory returning the content
+
+        Returns:
+            Response: The encoded reply, see :meth:`render`
+        """
+        entry = self.get(key)
+        CACHE_LOOKUPS.inc(cache="response", result="miss" if entry is None else "hit")
+        if entry is None:
+            with track_degraded() as degraded:
+                content = await produce()
+            if not degraded:
+                entry = self.put(key, content)
+            elif self.degraded_ttl > 0:
+                entry = self.put(key, content, self.degraded_ttl)
+            else:
+                entry = self.encode(content, max_age=0)
+        return self.render(entry, request)
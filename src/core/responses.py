@@ -0,0 +1,52 @@
+"""Fast JSON responses for ShopAI.
+
+This module provides an orjson-backed response class for hot endpoints. Service
+results are already validated pydantic models, so instead of letting FastAPI
+validate them again against ``response_model`` and convert them to plain data,
+routes return ``FastJSONResponse`` and the models are encoded straight to bytes.
+
+Example:
+    >>> from src.core.responses import FastJSONResponse
+    >>> @router.post("/autocomplete", response_model=LocationAutocompleteResponse,
+    ...              response_class=FastJSONResponse)
+    ... async def autocomplete(...):
+    ...     return FastJSONResponse({"suggestions": suggestions})
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from .metrics import STAGE_SECONDS
+
+
+def _default(obj: Any) -> Any:
+    """Encode pydantic models by their field values; orjson handles the rest."""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content, which may contain pydantic models, to JSON bytes.
+
+    Args:
+        content: JSON-compatible data, models, or dataclasses
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes models with orjson, without re-validation.
+
+    Returning an instance from a route skips FastAPI's ``response_model``
+    validation; ``response_model`` still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with STAGE_SECONDS.time(stage="serialization"):
+            return dumps(content)
@@ -1,8 +1,15 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 
 from .core.config import get_settings
-from .services.service_factory import get_location_service
+from .services.service_factory import (
+    get_location_service,
+    get_response_cache,
+    get_service_registry,
+)
+from .services.service_registry import ServiceRegistry
 from .routes.v1 import create_v1_router
 
 description = """
@@ -10,23 +17,38 @@ description = """
 One single app for all your shopping needs
 """
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared services on startup and close them on shutdown"""
+    app.state.services = ServiceRegistry.from_settings(get_settings())
+    app.state.services.start()
+    try:
+        yield
+    finally:
+        await app.state.services.aclose()
+
 app = FastAPI(
     title="ShopAI",
     description=description,
     version="1.0.0",
     docs_url=None,  # Disable default docs
     redoc_url=None,  # Disable default redoc
+    lifespan=lifespan,
 )
 
 # Add middleware
-from .core.middleware import error_handler_middleware
+from .core.middleware import error_handler_middleware, timing_middleware
 app.middleware("http")(error_handler_middleware)
+# Registered last so it wraps error handling and sees the final status code
+app.middleware("http")(timing_middleware)
 
 # Initialize settings with environment
 settings = get_settings()
 
 # Configure routes with production mode
-v1_router = create_v1_router(get_location_service)
+v1_router = create_v1_router(
+    get_location_service, get_response_cache, get_service_registry
+)
 app.include_router(v1_router)
 
 @app.get("/docs", include_in_schema=False)
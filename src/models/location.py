@@ -1,5 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import Annotated, List, Dict, Literal
+
+DetailField = Literal[
+    "latitude", "longitude", "formatted_address", "types", "name", "vicinity",
+    "url", "website", "formatted_phone_number", "international_phone_number",
+    "rating", "user_ratings_total", "price_level", "opening_hours",
+    "wheelchair_accessible_entrance", "delivery", "dine_in", "editorial_summary",
+]
 
 class LocationDetails(BaseModel):
     latitude: float = Field(..., description="Location latitude")
@@ -21,15 +28,84 @@ class LocationDetails(BaseModel):
     dine_in: bool | None = Field(None)
     editorial_summary: str | None = Field(None)
 
+class LatLng(BaseModel):
+    lat: float = Field(..., ge=-90, le=90, description="Latitude")
+    lng: float = Field(..., ge=-180, le=180, description="Longitude")
+
 class LocationSuggestion(BaseModel):
     place_id: str = Field(..., description="Unique Google Maps place identifier")
     description: str = Field(..., description="Full place description")
     main_text: str = Field(..., description="Primary text for the location")
     secondary_text: str | None = Field(None, description="Additional location details")
     details: LocationDetails | None = Field(None, description="Detailed place information")
+    distance_meters: float | None = Field(None, description="Distance from the requested point, if any")
 
 class LocationAutocompleteRequest(BaseModel):
     query: str = Field(..., min_length=2, max_length=100, description="Location search query")
+    include_details: bool = Field(True, description="Fetch place details for each suggestion")
+    fields: List[DetailField] | None = Field(
+        None,
+        description="Place detail fields to fetch; coordinates, address and name are always included",
+    )
+    near: LatLng | None = Field(None, description="Bias and rank suggestions around this point")
+    radius: int | None = Field(None, gt=0, le=50_000, description="Bias radius in meters around near")
+    session_token: str | None = Field(
+        None,
+        min_length=1,
+        max_length=128,
+        description="Autocomplete session; a newer request on it cancels older ones. Sent to Google as the Places session token",
+    )
 
 class LocationAutocompleteResponse(BaseModel):
     suggestions: List[LocationSuggestion]
+
+class LocationNearbyResponse(BaseModel):
+    suggestions: List[LocationSuggestion]
+
+class LocationDetailsEvent(BaseModel):
+    place_id: str = Field(..., description="Place the details belong to")
+    details: LocationDetails | None = Field(None, description="Place details, or null if the lookup failed")
+
+class LocationIntent(BaseModel):
+    query: str = Field(..., min_length=1, description="What to search for, without filters or location")
+    types: List[str] = Field(default_factory=list, description="Google Places types the places should have")
+    max_price_level: int | None = Field(None, ge=0, le=4, description="Highest acceptable price level")
+    open_now: bool | None = Field(None, description="Whether places must be open now")
+    delivery: bool | None = Field(None, description="Whether places must offer delivery")
+    dine_in: bool | None = Field(None, description="Whether places must offer dine-in")
+    location: str | None = Field(None, description="Place name to search around, e.g. a neighbourhood")
+
+class LocationSearchRequest(BaseModel):
+    query: str = Field(..., min_length=2, max_length=200, description="Free-text shopping request")
+    near: LatLng | None = Field(None, description="Search around this point instead of the location in the query")
+    radius: int | None = Field(None, gt=0, le=50_000, description="Search radius in meters")
+    fields: List[DetailField] | None = Field(
+        None,
+        description="Place detail fields to return; fields the intent filters on are always included",
+    )
+
+class LocationSearchResponse(BaseModel):
+    intent: LocationIntent
+    suggestions: List[LocationSuggestion]
+
+class LocationBatchAutocompleteRequest(BaseModel):
+    queries: List[Annotated[str, Field(min_length=2, max_length=100)]] = Field(
+        ..., min_length=1, max_length=100, description="Location search queries"
+    )
+    include_details: bool = Field(True, description="Fetch place details for each suggestion")
+    fields: List[DetailField] | None = Field(
+        None,
+        description="Place detail fields to fetch; coordinates, address and name are always included",
+    )
+
+class LocationBatchError(BaseModel):
+    code: str = Field(..., description="Error code")
+    message: str = Field(..., description="Human-readable error message")
+
+class LocationBatchResult(BaseModel):
+    query: str = Field(..., description="Query as sent in the request")
+    suggestions: List[LocationSuggestion] | None = Field(None, description="Suggestions, if the query succeeded")
+    error: LocationBatchError | None = Field(None, description="Error, if the query failed")
+
+class LocationBatchAutocompleteResponse(BaseModel):
+    results: List[LocationBatchResult]
@@ -1,17 +1,27 @@
+from typing import Callable
 from fastapi import APIRouter
 from .health.health_router import HealthRouter
+from .metrics.metrics_router import MetricsRouter
 from .location.location_router import LocationRouter
+from ...core.response_cache import ResponseCache
 from ...services.location_service import LocationService
+from ...services.service_registry import ServiceRegistry
 
-def create_v1_router(location_service: LocationService) -> APIRouter:
+def create_v1_router(
+    location_service: Callable[[], LocationService],
+    response_cache: Callable[[], ResponseCache],
+    service_registry: Callable[[], ServiceRegistry],
+) -> APIRouter:
     """Create and configure v1 API router"""
     router = APIRouter(prefix="/api/v1")
     
     # Add route handlers
-    health_router = HealthRouter()
-    location_router = LocationRouter(location_service)
+    health_router = HealthRouter(service_registry)
+    metrics_router = MetricsRouter()
+    location_router = LocationRouter(location_service, response_cache)
     
     router.include_router(health_router.get_router())
+    router.include_router(metrics_router.get_router())
     router.include_router(location_router.get_router())
     
     return router
@@ -1,16 +1,23 @@
 """Health check endpoints for ShopAI API.
 
 This module provides health check endpoints to verify API availability
-and system status.
+and system status: ``/ping`` answers as soon as the process serves requests,
+``/ready`` only once startup jobs such as the cache warm-up have finished.
 
 Example:
     >>> from fastapi import FastAPI
     >>> from src.routes.v1.health.health_router import HealthRouter
+    >>> from src.services.service_factory import get_service_registry
     >>> app = FastAPI()
-    >>> health_router = HealthRouter()
+    >>> health_router = HealthRouter(get_service_registry)
     >>> app.include_router(health_router.get_router())
 """
-from fastapi import APIRouter
+from typing import Annotated, Callable
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from ....services.service_registry import ServiceRegistry
 from ..base_router import BaseRouter
 
 class HealthRouter(BaseRouter):
@@ -19,9 +26,10 @@ class HealthRouter(BaseRouter):
     Provides simple endpoints to verify API availability and system status.
     """
     
-    def __init__(self):
-        """Initialize health router with ping endpoint."""
+    def __init__(self, get_service_registry: Callable[[], ServiceRegistry]):
+        """Initialize health router with ping and readiness endpoints."""
         self._router = APIRouter(tags=["Health"])
+        self._get_service_registry = get_service_registry
         self._configure_routes()
 
     def get_router(self) -> APIRouter:
@@ -42,3 +50,24 @@ class HealthRouter(BaseRouter):
                 dict: Response with "pong" message
             """
             return {"response": "pong"}
+
+        @self._router.get("/ready")
+        async def ready(
+            services: Annotated[
+                ServiceRegistry, Depends(self._get_service_registry)
+            ],
+        ):
+            """Readiness check for load balancers and rollouts.
+            
+            Returns:
+                JSONResponse: ``ready`` and the cache warm-up status, with
+                status 503 while the warm-up is still running
+            """
+            warmer = services.warmer
+            return JSONResponse(
+                status_code=200 if services.ready else 503,
+                content={
+                    "ready": services.ready,
+                    "warmup": None if warmer is None else warmer.status(),
+                },
+            )
@@ -9,30 +9,111 @@ Classes:
 Dependencies:
     - fastapi.APIRouter
     - fastapi.Depends
+    - fastapi.WebSocket
     - typing.Annotated
     - typing.Callable
     - ..base_router.BaseRouter
     - ....models.location.LocationAutocompleteRequest
     - ....models.location.LocationAutocompleteResponse
+    - ....models.location.LocationDetails
     - ....services.location_service.LocationService
 """
 
-from typing import Annotated, Callable
-from fastapi import APIRouter, Depends
+import asyncio
+import logging
+import uuid
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from ..base_router import BaseRouter
 from ....models.location import (
+    DetailField,
+    LatLng,
     LocationAutocompleteRequest,
     LocationAutocompleteResponse,
+    LocationBatchAutocompleteRequest,
+    LocationBatchAutocompleteResponse,
+    LocationDetails,
+    LocationNearbyResponse,
+    LocationSearchRequest,
+    LocationSearchResponse,
 )
-from ....services.location_service import LocationService
+from ....core.exceptions import AppException
+from ....core.metrics import ERRORS
+from ....core.response_cache import ResponseCache
+from ....core.responses import FastJSONResponse, dumps
+from ....services.location_service import LocationService, normalize_query
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def _encode_ndjson(event: str, data: Any) -> bytes:
+    """Encode a stream event as a single NDJSON line."""
+    return dumps({"event": event, "data": data}) + b"\n"
+
+
+def _encode_sse(event: str, data: Any) -> bytes:
+    """Encode a stream event as a Server-Sent Events message."""
+    return b"event: %s\ndata: %s\n\n" % (event.encode(), dumps(data))
+
+
+def _fields_key(fields: Optional[List[str]]) -> Optional[tuple]:
+    """Order-insensitive cache key part for a detail field projection."""
+    return None if fields is None else tuple(sorted(set(fields)))
+
+
+def _near(
+    request: Union[LocationAutocompleteRequest, LocationSearchRequest],
+) -> Optional[Tuple[float, float]]:
+    """The (lat, lng) bias point of an autocomplete or search request, if any."""
+    return (request.near.lat, request.near.lng) if request.near else None
+
+
+def _autocomplete_key(request: LocationAutocompleteRequest) -> Hashable:
+    """Response cache key of an autocomplete request."""
+    return (
+        "autocomplete",
+        normalize_query(request.query),
+        request.include_details,
+        _fields_key(request.fields),
+        _near(request),
+        request.radius,
+    )
 
 
 class LocationRouter(BaseRouter):
     """
     LocationRouter is responsible for handling location-related API routes.
     Methods:
-        __init__(get_location_service: Callable[[], LocationService]):
-            Initializes the LocationRouter with a location service provider.
+        __init__(get_location_service: Callable[[], LocationService],
+                 get_response_cache: Callable[[], ResponseCache]):
+            Initializes the LocationRouter with a location service provider and
+            the provider of the cache of encoded responses.
         get_router() -> APIRouter:
             Returns the configured APIRouter instance.
         _configure_routes():
@@ -42,22 +123,348 @@ class LocationRouter(BaseRouter):
             Endpoint to get location suggestions based on user input.
             - Request: LocationAutocompleteRequest
             - Response: LocationAutocompleteResponse
+        GET /locations/autocomplete:
+            Cacheable variant of autocomplete for browsers and CDNs.
+            - Query: query, include_details, fields, lat, lng, radius, session_token
+            - Response: LocationAutocompleteResponse
+        POST /locations/autocomplete:batch:
+            Endpoint to get location suggestions for many queries in one request.
+            Failed queries are reported per item instead of failing the batch.
+            - Request: LocationBatchAutocompleteRequest
+            - Response: LocationBatchAutocompleteResponse
+        POST /locations/autocomplete/stream:
+            Streaming variant of autocomplete. Sends a "suggestions" event with the
+            bare predictions, then a "details" event per suggestion as its details
+            arrive, then a "done" event. Responds with Server-Sent Events when the
+            client accepts text/event-stream, NDJSON otherwise.
+            - Request: LocationAutocompleteRequest
+            - Response: application/x-ndjson or text/event-stream
+        POST /locations/search:
+            Endpoint to search places with a free-text shopping request, e.g.
+            "cheap vegan takeaway near Kings Cross open now". The request is parsed
+            into a query and filters, and places are filtered and ranked by them.
+            - Request: LocationSearchRequest
+            - Response: LocationSearchResponse
+        WEBSOCKET /locations/autocomplete/ws:
+            Keystroke channel for autocomplete. The client sends one
+            LocationAutocompleteRequest JSON message per keystroke and receives
+            {"query", "suggestions"} or {"query", "error"} messages for the latest
+            query only; older in-flight queries are cancelled. The connection is
+            one autocomplete session unless messages carry a session_token.
+        GET /locations/nearby:
+            Endpoint to find known places around a point, nearest first, e.g. for
+            a store locator. Answered from the local geo index.
+            - Query: lat, lng, radius (meters), limit, fields (optional, repeatable)
+            - Response: LocationNearbyResponse
+        GET /locations/{place_id}:
+            Endpoint to get details for a single place, e.g. once a suggestion
+            is selected. Names of the other routes, e.g. ``search``, are not
+            taken for place ids and answered with 405.
+            - Query: fields (optional, repeatable)
+            - Response: LocationDetails
+    Autocomplete, search, nearby and place details responses are cached encoded,
+    with an ETag for If-None-Match revalidation and Cache-Control for browsers
+    and CDNs.
+    An autocomplete request with a session_token is answered with a
+    request_superseded error once a newer request arrives on that session.
     """
 
-    def __init__(self, get_location_service: Callable[[], LocationService]):
+    def __init__(
+        self,
+        get_location_service: Callable[[], LocationService],
+        get_response_cache: Callable[[], ResponseCache],
+    ):
         self._router = APIRouter(prefix="/locations", tags=["Location"])
         self._get_location_service = get_location_service
+        self._get_response_cache = get_response_cache
         self._configure_routes()
 
     def get_router(self) -> APIRouter:
         return self._router
 
     def _configure_routes(self):
-        @self._router.post("/autocomplete", response_model=LocationAutocompleteResponse)
+        async def autocomplete(
+            request: LocationAutocompleteRequest,
+            http_request: Request,
+            service: LocationService,
+            cache: ResponseCache,
+        ) -> Response:
+            async def load() -> Any:
+                suggestions = await service.get_location_suggestions(
+                    request.query,
+                    include_details=request.include_details,
+                    fields=request.fields,
+                    near=_near(request),
+                    radius=request.radius,
+                    session_token=request.session_token,
+                )
+                return {"suggestions": suggestions}
+
+            return await cache.serve(http_request, _autocomplete_key(request), load)
+
+        @self._router.post(
+            "/autocomplete",
+            response_model=LocationAutocompleteResponse,
+            response_class=FastJSONResponse,
+        )
         async def autocomplete_location(
             request: LocationAutocompleteRequest,
+            http_request: Request,
             service: Annotated[LocationService, Depends(self._get_location_service)],
-        ) -> LocationAutocompleteResponse:
+            cache: Annotated[ResponseCache, Depends(self._get_response_cache)],
+        ) -> Response:
             """Get location suggestions based on user input"""
-            suggestions = await service.get_location_suggestions(request.query)
-            return LocationAutocompleteResponse(suggestions=suggestions)
+            return await autocomplete(request, http_request, service, cache)
+
+        @self._router.get(
+            "/autocomplete",
+            response_model=LocationAutocompleteResponse,
+            response_class=FastJSONResponse,
+        )
+        async def get_autocomplete_location(
+            http_request: Request,
+            service: Annotated[LocationService, Depends(self._get_location_service)],
+            cache: Annotated[ResponseCache, Depends(self._get_response_cache)],
+            query: Annotated[str, Query(min_length=2, max_length=100)],
+            include_details: bool = True,
+            fields: Annotated[List[DetailField] | None, Query()] = None,
+            lat: Annotated[float | None, Query(ge=-90, le=90)] = None,
+            lng: Annotated[float | None, Query(ge=-180, le=180)] = None,
+            radius: Annotated[int | None, Query(gt=0, le=50_000)] = None,
+            session_token: Annotated[
+                str | None, Query(min_length=1, max_length=128)
+            ] = None,
+        ) -> Response:
+            """Get location suggestions; cacheable by browsers and CDNs"""
+            request = LocationAutocompleteRequest(
+                query=query,
+                include_details=include_details,
+                fields=fields,
+                near=None if lat is None or lng is None else LatLng(lat=lat, lng=lng),
+                radius=radius,
+                session_token=session_token,
+            )
+            return await autocomplete(request, http_request, service, cache)
+
+        @self._router.post(
+            "/autocomplete:batch",
+            response_model=LocationBatchAutocompleteResponse,
+            response_class=FastJSONResponse,
+        )
+        async def batch_autocomplete_location(
+            request: LocationBatchAutocompleteRequest,
+            service: Annotated[LocationService, Depends(self._get_location_service)],
+        ) -> FastJSONResponse:
+            """Get location suggestions for a batch of queries"""
+            outcomes = await service.get_location_suggestions_batch(
+                request.queries,
+                include_details=request.include_details,
+                fields=request.fields,
+            )
+            results = []
+            for query, outcome in zip(request.queries, outcomes):
+                if isinstance(outcome, AppException):
+                    error = {"code": outcome.code, "message": outcome.message}
+                    result = {"query": query, "suggestions": None, "error": error}
+                else:
+                    result = {"query": query, "suggestions": outcome, "error": None}
+                results.append(result)
+            return FastJSONResponse({"results": results})
+
+        @self._router.post(
+            "/autocomplete/stream",
+            response_class=StreamingResponse,
+            responses={
+                200: {"content": {NDJSON_MEDIA_TYPE: {}, SSE_MEDIA_TYPE: {}}}
+            },
+        )
+        async def stream_autocomplete_location(
+            request: LocationAutocompleteRequest,
+            http_request: Request,
+            service: Annotated[LocationService, Depends(self._get_location_service)],
+        ) -> StreamingResponse:
+            """Stream location suggestions, then their details as they arrive"""
+            events = service.stream_location_suggestions(
+                request.query,
+                fields=request.fields,
+                near=_near(request),
+                radius=request.radius,
+            )
+            # Fetch predictions before the response starts so errors get a
+            # regular error response instead of a broken stream
+            suggestions = await anext(events)
+            use_sse = SSE_MEDIA_TYPE in http_request.headers.get("accept", "")
+            encode = _encode_sse if use_sse else _encode_ndjson
+
+            async def body() -> AsyncIterator[bytes]:
+                try:
+                    yield encode(
+                        "suggestions",
+                        {"suggestions": suggestions},
+                    )
+                    if request.include_details:
+                        async for event in events:
+                            if await http_request.is_disconnected():
+                                break
+                            yield encode("details", event)
+                    yield encode("done", {})
+                finally:
+                    await events.aclose()
+
+            return StreamingResponse(
+                body(),
+                media_type=SSE_MEDIA_TYPE if use_sse else NDJSON_MEDIA_TYPE,
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        @self._router.post(
+            "/search",
+            response_model=LocationSearchResponse,
+            response_class=FastJSONResponse,
+        )
+        async def search_locations(
+            request: LocationSearchRequest,
+            http_request: Request,
+            service: Annotated[LocationService, Depends(self._get_location_service)],
+            cache: Annotated[ResponseCache, Depends(self._get_response_cache)],
+        ) -> Response:
+            """Search places with a free-text shopping request"""
+
+            async def load() -> Any:
+                intent, suggestions = await service.search_locations(
+                    request.query,
+                    near=_near(request),
+                    radius=request.radius,
+                    fields=request.fields,
+                )
+                return {"intent": intent, "suggestions": suggestions}
+
+            key = (
+                "search",
+                normalize_query(request.query),
+                _near(request),
+                request.radius,
+                _fields_key(request.fields),
+            )
+            return await cache.serve(http_request, key, load)
+
+        @self._router.websocket("/autocomplete/ws")
+        async def autocomplete_location_websocket(
+            websocket: WebSocket,
+            service: Annotated[LocationService, Depends(self._get_location_service)],
+        ) -> None:
+            """Answer autocomplete keystrokes, latest query only"""
+            await websocket.accept()
+            session_token = uuid.uuid4().hex
+            pending: Set["asyncio.Task[None]"] = set()
+            latest = 0
+
+            async def answer(sequence: int, request: LocationAutocompleteRequest):
+                try:
+                    suggestions = await service.get_location_suggestions(
+                        request.query,
+                        include_details=request.include_details,
+                        fields=request.fields,
+                        near=_near(request),
+                        radius=request.radius,
+                        session_token=request.session_token or session_token,
+                    )
+                    message = {"query": request.query, "suggestions": suggestions}
+                except AppException as e:
+                    if e.code == "request_superseded":
+                        return
+                    error = {"code": e.code, "message": e.message}
+                    message = {"query": request.query, "error": error}
+                except Exception as e:
+                    # Report the failure instead of leaving the keystroke
+                    # unanswered, as the HTTP routes do
+                    logger.exception("WebSocket autocomplete failed")
+                    ERRORS.inc(code="internal_error")
+                    error = {"code": "internal_error", "message": str(e)}
+                    message = {"query": request.query, "error": error}
+                # An older query may finish after a newer one was received
+                if sequence == latest:
+                    await websocket.send_text(dumps(message).decode())
+
+            try:
+                while True:
+                    text = await websocket.receive_text()
+                    try:
+                        request = LocationAutocompleteRequest.model_validate_json(text)
+                    except ValidationError as e:
+                        error = {"code": "invalid_request", "message": str(e)}
+                        await websocket.send_text(
+                            dumps({"query": None, "error": error}).decode()
+                        )
+                        continue
+                    latest += 1
+                    task = asyncio.ensure_future(answer(latest, request))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            except WebSocketDisconnect:
+                pass
+            finally:
+                for task in pending:
+                    task.cancel()
+
+        # Declared before /{place_id} so "nearby" is not taken for a place id
+        @self._router.get(
+            "/nearby",
+            response_model=LocationNearbyResponse,
+            response_class=FastJSONResponse,
+        )
+        async def nearby_locations(
+            http_request: Request,
+            service: Annotated[LocationService, Depends(self._get_location_service)],
+            cache: Annotated[ResponseCache, Depends(self._get_response_cache)],
+            lat: Annotated[float, Query(ge=-90, le=90)],
+            lng: Annotated[float, Query(ge=-180, le=180)],
+            radius: Annotated[int, Query(gt=0, le=50_000)] = 5_000,
+            limit: Annotated[int, Query(ge=1, le=100)] = 20,
+            fields: Annotated[List[DetailField] | None, Query()] = None,
+        ) -> Response:
+            """Find known places around a point, nearest first"""
+
+            async def load() -> Any:
+                suggestions = await service.get_nearby_places(
+                    lat, lng, radius, limit=limit, fields=fields
+                )
+                return {"suggestions": suggestions}
+
+            key = ("nearby", lat, lng, radius, limit, _fields_key(fields))
+            return await cache.serve(http_request, key, load)
+
+        # Declared last; paths of the routes above are not place ids
+        reserved: Dict[str, Set[str]] = {}
+
+        @self._router.get(
+            "/{place_id}",
+            response_model=LocationDetails,
+            response_class=FastJSONResponse,
+        )
+        async def get_location_details(
+            place_id: str,
+            http_request: Request,
+            service: Annotated[LocationService, Depends(self._get_location_service)],
+            cache: Annotated[ResponseCache, Depends(self._get_response_cache)],
+            fields: Annotated[List[DetailField] | None, Query()] = None,
+        ) -> Response:
+            """Get details for a single place"""
+            if place_id in reserved:
+                # e.g. GET /locations/search, which only accepts POST
+                raise HTTPException(
+                    status_code=405,
+                    detail="Method Not Allowed",
+                    headers={"Allow": ", ".join(sorted(reserved[place_id]))},
+                )
+            return await cache.serve(
+                http_request,
+                ("details", place_id, _fields_key(fields)),
+                lambda: service.get_place_details(place_id, fields=fields),
+            )
+
+        for route in self._router.routes:
+            name = route.path.removeprefix(f"{self._router.prefix}/")
+            if "/" not in name and "{" not in name:
+                methods = getattr(route, "methods", None) or ()
+                reserved.setdefault(name, set()).update(methods)
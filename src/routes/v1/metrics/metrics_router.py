@@ -0,0 +1,49 @@
+"""Metrics endpoint for ShopAI API.
+
+This module exposes the process metrics, such as request and stage latency
+histograms and upstream, error and cache counters, in the Prometheus text
+format for scraping.
+
+Example:
+    >>> from fastapi import FastAPI
+    >>> from src.routes.v1.metrics.metrics_router import MetricsRouter
+    >>> app = FastAPI()
+    >>> metrics_router = MetricsRouter()
+    >>> app.include_router(metrics_router.get_router())
+"""
+from fastapi import APIRouter, Response
+
+from ....core.metrics import CONTENT_TYPE, REGISTRY, MetricsRegistry
+from ..base_router import BaseRouter
+
+class MetricsRouter(BaseRouter):
+    """Router for the Prometheus metrics endpoint.
+
+    Attributes:
+        registry: Metrics rendered on each scrape
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        """Initialize metrics router with the metrics endpoint."""
+        self.registry = registry
+        self._router = APIRouter(tags=["Metrics"])
+        self._configure_routes()
+
+    def get_router(self) -> APIRouter:
+        """Get the configured metrics router.
+
+        Returns:
+            APIRouter: Router with the metrics endpoint
+        """
+        return self._router
+
+    def _configure_routes(self):
+        """Configure the metrics endpoint."""
+        @self._router.get("/metrics", include_in_schema=False)
+        async def metrics():
+            """Current metrics in the Prometheus text exposition format.
+
+            Returns:
+                Response: Plain-text metrics
+            """
+            return Response(content=self.registry.render(), media_type=CONTENT_TYPE)
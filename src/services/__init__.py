@@ -1,5 +1,12 @@
 from .base_llm_provider import BaseLLMProvider
+from .llm_cache import CachingLLMProvider
+from .llm_runtime import LLMRuntime
+from .local_llm_provider import LocalLLMProvider
 from .location_service import LocationService
 from .service_factory import get_location_service
+from .service_registry import ServiceRegistry
 
-__all__ = ['BaseLLMProvider', 'LocationService', 'get_location_service']
+__all__ = [
+    'BaseLLMProvider', 'CachingLLMProvider', 'LLMRuntime', 'LocalLLMProvider', 'LocationService',
+    'get_location_service', 'ServiceRegistry'
+]
@@ -1,10 +1,14 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any
 
 class BaseLLMProvider(ABC):
     """Base interface for LLM providers.
     
     This class defines the contract that all LLM providers must implement.
+    Providers with a native batch or streaming API override
+    :meth:`generate_batch` and :meth:`stream`; the defaults fall back to
+    :meth:`generate`.
     
     Attributes:
         model_name (str): Name of the LLM model being used
@@ -25,4 +29,29 @@ class BaseLLMProvider(ABC):
         Returns:
             Generated text response
         """
-        pass
\ No newline at end of file
+        pass
+    
+    async def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Generate responses for several prompts in one call.
+        
+        Args:
+            prompts: Input text prompts
+            
+        Returns:
+            Generated text responses, in prompt order
+        """
+        return list(await asyncio.gather(*(self.generate(p) for p in prompts)))
+    
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate a response for a prompt as a sequence of text chunks.
+        
+        Args:
+            prompt: Input text prompt
+            
+        Yields:
+            Chunks of the generated text response, in order
+        """
+        yield await self.generate(prompt)
+    
+    async def aclose(self) -> None:
+        """Release resources such as pooled connections, if any."""
@@ -0,0 +1,540 @@
+"""Caching primitives for ShopAI services.
+
+This module provides a tiered cache used in front of upstream Places calls:
+an in-process LRU cache with per-entry TTL and size-based eviction, an optional
+tier shared by all workers (see ``shared_cache``), and an optional on-disk
+SQLite tier that survives restarts. It also provides a compact place details
+cache with separate freshness for stable and volatile fields. All caches keep
+hit, miss and eviction counters.
+
+Example:
+    >>> from src.services.cache import TTLCache, SQLiteCache, TieredCache
+    >>> cache = TieredCache(TTLCache(max_size=1000, ttl=300), SQLiteCache("cache.db"))
+    >>> await cache.set("key", {"value": 1})
+    >>> await cache.get("key")
+    {'value': 1}
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness.
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that found no fresh entry
+        evictions: Entries dropped to respect the size limit
+        expirations: Entries dropped because their TTL elapsed
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+class TTLCache(Generic[V]):
+    """In-process LRU cache with per-entry TTL.
+
+    Entries are evicted least-recently-used first once ``max_size`` is reached
+    and are treated as missing once their TTL has elapsed. Expired entries are
+    kept for another ``stale_ttl`` seconds for :meth:`get_stale`.
+
+    Attributes:
+        max_size: Maximum number of entries kept in memory
+        ttl: Default time-to-live in seconds
+        stale_ttl: Seconds past expiry an entry can still be served stale
+        stats: Hit, miss, eviction and expiration counters
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        stale_ttl: float = 0.0,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        now = self._clock()
+        if expires_at <= now:
+            if expires_at + self.stale_ttl <= now:
+                del self._entries[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[V]:
+        """Return the value for ``key`` even if expired, within ``stale_ttl``."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] + self.stale_ttl <= self._clock():
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full."""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove ``key`` from the cache if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+
+class CacheTier(Protocol):
+    """Interface of the cache tiers below the in-process TTLCache.
+
+    Values are JSON-compatible; ``ttl`` overrides the tier's default lifetime.
+    """
+
+    stats: CacheStats
+
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class SQLiteCache:
+    """Persistent cache tier backed by a local SQLite file.
+
+    Values are stored as JSON text with a wall-clock expiry so entries survive
+    process restarts. Blocking SQLite calls run in a worker thread.
+
+    Attributes:
+        path: Path of the SQLite database file
+        ttl: Default time-to-live in seconds
+        stats: Hit, miss and expiration counters
+    """
+
+    def __init__(self, path: str, ttl: float = 86_400.0):
+        self.path = path
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the decoded value for ``key``, or None if missing or expired."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable ``value`` under ``key``."""
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] <= time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expirations += 1
+                row = None
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+            self._conn.commit()
+
+
+class TieredCache(Generic[V]):
+    """Read-through combination of an in-process tier and optional lower tiers.
+
+    Lookups check memory first, then the tier shared by all workers, then the
+    persistent tier; hits are promoted into the faster tiers. Values written to
+    the lower tiers pass through ``encode``/``decode`` so rich objects can be
+    stored as JSON.
+
+    Attributes:
+        memory: In-process LRU tier
+        persistent: Optional persistent tier (e.g. SQLiteCache)
+        shared: Optional cross-process tier (e.g. SharedMemoryCache, RedisCache)
+    """
+
+    def __init__(
+        self,
+        memory: TTLCache[V],
+        persistent: Optional[CacheTier] = None,
+        encode: Callable[[V], Any] = lambda value: value,
+        decode: Callable[[Any], V] = lambda value: value,
+        shared: Optional[CacheTier] = None,
+    ):
+        self.memory = memory
+        self.persistent = persistent
+        self.shared = shared
+        self._encode = encode
+        self._decode = decode
+
+    async def get(self, key: str) -> Optional[V]:
+        """Return the cached value for ``key`` from the fastest tier holding it."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        stored = None
+        if self.shared is not None:
+            stored = await self.shared.get(key)
+        if stored is None and self.persistent is not None:
+            stored = await self.persistent.get(key)
+            if stored is not None and self.shared is not None:
+                await self.shared.set(key, stored)
+        if stored is None:
+            return None
+        value = self._decode(stored)
+        self.memory.set(key, value)
+        return value
+
+    def get_stale(self, key: str) -> Optional[V]:
+        """Return an expired in-memory value still within its stale window."""
+        return self.memory.get_stale(key)
+
+    async def set(self, key: str, value: V) -> None:
+        """Store ``value`` in every tier."""
+        self.memory.set(key, value)
+        if self.shared is None and self.persistent is None:
+            return
+        stored = self._encode(value)
+        if self.shared is not None:
+            await self.shared.set(key, stored)
+        if self.persistent is not None:
+            await self.persistent.set(key, stored)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return counters for each tier."""
+        stats = {"memory": self.memory.stats.as_dict()}
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats.as_dict()
+        if self.persistent is not None:
+            stats["persistent"] = self.persistent.stats.as_dict()
+        return stats
+
+    def close(self) -> None:
+        """Release resources held by the lower tiers."""
+        if self.shared is not None:
+            self.shared.close()
+        if self.persistent is not None:
+            self.persistent.close()
+
+
+class PlaceDetailsCache:
+    """Per-place cache of Places detail fields with field-level freshness.
+
+    Fields are split into a stable group (address, geometry, ...) and a volatile
+    group (opening hours, ratings, ...) with separate TTLs, so a lookup can reuse
+    stable fields and refetch only the volatile ones. Each entry stores the fetch
+    time of both groups, a bitmask of cached fields and their values as a
+    zlib-compressed JSON list, which keeps hundreds of thousands of places
+    affordable in memory. Expired fields are kept another ``stale_ttl`` seconds
+    for :meth:`get_stale`.
+
+    Attributes:
+        fields: Canonical order of the cacheable Places fields
+        volatile_fields: Fields that expire after ``volatile_ttl``
+        max_size: Maximum number of places kept in memory
+        ttl: Seconds stable fields stay fresh
+        volatile_ttl: Seconds volatile fields stay fresh
+        stale_ttl: Seconds past expiry fields can still be served stale
+        stats: Hit (all requested fields fresh), miss and eviction counters
+
+    Example:
+        >>> cache = PlaceDetailsCache(["name", "rating"], volatile_fields={"rating"})
+        >>> cache.set("p1", {"name": "Cafe", "rating": 4.5})
+        >>> cache.get("p1", ["name", "rating"])
+        ({'name': 'Cafe', 'rating': 4.5}, [])
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        volatile_fields: Collection[str] = (),
+        max_size: int = 200_000,
+        ttl: float = 86_400.0,
+        volatile_ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        stale_ttl: float = 0.0,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.fields = list(fields)
+        self.volatile_fields = frozenset(volatile_fields)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.volatile_ttl = volatile_ttl
+        self.stale_ttl = stale_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._index = {field: i for i, field in enumerate(self.fields)}
+        self._volatile_mask = self._mask(self.volatile_fields)
+        self._stable_mask = self._mask(self.fields) & ~self._volatile_mask
+        # place_id -> (stable fetched at, volatile fetched at, field mask, payload)
+        self._entries: "OrderedDict[str, Tuple[float, float, int, bytes]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, place_id: str, fields: Optional[Sequence[str]] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Look up the requested fields of a place.
+
+        Args:
+            place_id: Places identifier
+            fields: Fields the caller needs, defaults to all cacheable fields
+
+        Returns:
+            A tuple of the fresh cached values keyed by field name and the list
+            of requested fields that are missing or stale and must be fetched
+        """
+        fields = self.fields if fields is None else fields
+        values = self._fresh_values(place_id)
+        missing = [field for field in fields if field not in values]
+        if missing:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        if values:
+            self._entries.move_to_end(place_id)
+        return {field: values[field] for field in fields if field in values}, missing
+
+    def get_stale(self, place_id: str, fields: Sequence[str]) -> Dict[str, Any]:
+        """Return cached values of the given fields, fresh or expired within
+        ``stale_ttl``, e.g. to serve while the fields are refreshed."""
+        values = self._values(place_id, self.stale_ttl)
+        return {field: values[field] for field in fields if field in values}
+
+    def set(self, place_id: str, values: Dict[str, Any], age: float = 0.0) -> None:
+        """Store freshly fetched field values for a place.
+
+        Fields not present in ``values`` keep their cached value while fresh.
+        A group that keeps fresh fields keeps its older fetch time, so every
+        cached field expires no later than it should and requests for other
+        field projections still find the fields fetched before.
+
+        Args:
+            place_id: Places identifier
+            values: Field values keyed by Places field name; None records a field
+                the place does not have
+            age: Seconds since the values were fetched, e.g. when they come from
+                a cache shared with other workers
+        """
+        values = {
+            field: value for field, value in values.items() if field in self._index
+        }
+        if not values:
+            return
+        now = self._clock() - age
+        merged = self._fresh_values(place_id)
+        new_mask = self._mask(values)
+        kept_mask = self._mask(merged) & ~new_mask
+        fetched_at = [now, now]
+        entry = self._entries.get(place_id)
+        if entry is not None:
+            groups = (self._stable_mask, self._volatile_mask)
+            for i, group_mask in enumerate(groups):
+                if not new_mask & group_mask:
+                    fetched_at[i] = entry[i]
+                elif kept_mask & group_mask:
+                    # Fresh fields not refetched stay; the group is as old as
+                    # its oldest field
+                    fetched_at[i] = min(entry[i], now)
+        stable_at, volatile_at = fetched_at
+        merged.update(values)
+        mask = self._mask(merged)
+        payload = zlib.compress(
+            json.dumps(
+                [merged[field] for field in self.fields if field in merged],
+                separators=(",", ":"),
+            ).encode()
+        )
+        self._entries[place_id] = (stable_at, volatile_at, mask, payload)
+        self._entries.move_to_end(place_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def export(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """Return the fresh fields of a place with the age of each field group.
+
+        The result is JSON-compatible and can be passed to :meth:`load`, e.g.
+        by another worker reading it from a shared cache.
+
+        Args:
+            place_id: Places identifier
+
+        Returns:
+            A dict with the ``values`` and the ``stable_age`` and ``volatile_age``
+            in seconds, or None if no field of the place is fresh
+        """
+        values = self._fresh_values(place_id)
+        if not values:
+            return None
+        stable_at, volatile_at = self._entries[place_id][:2]
+        now = self._clock()
+        return {
+            "values": values,
+            "stable_age": now - stable_at,
+            "volatile_age": now - volatile_at,
+        }
+
+    def load(
+        self,
+        place_id: str,
+        exported: Dict[str, Any],
+        fields: Optional[Collection[str]] = None,
+    ) -> None:
+        """Store values returned by :meth:`export`, keeping their fetch times.
+
+        Args:
+            place_id: Places identifier
+            exported: Result of :meth:`export`
+            fields: Only load the field groups holding any of these fields, so
+                fresher cached groups are not replaced; defaults to all groups
+        """
+        wanted = self._mask(self.fields if fields is None else fields)
+        groups = (
+            (self._stable_mask, exported["stable_age"]),
+            (self._volatile_mask, exported["volatile_age"]),
+        )
+        for group_mask, age in groups:
+            if not wanted & group_mask:
+                continue
+            values = {
+                field: value
+                for field, value in exported["values"].items()
+                if self._mask((field,)) & group_mask
+            }
+            if values:
+                self.set(place_id, values, age=age)
+
+    def delete(self, place_id: str) -> None:
+        """Remove a place from the cache if present."""
+        self._entries.pop(place_id, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def _fresh_values(self, place_id: str) -> Dict[str, Any]:
+        return self._values(place_id, 0.0)
+
+    def _values(self, place_id: str, grace: float) -> Dict[str, Any]:
+        entry = self._entries.get(place_id)
+        if entry is None:
+            return {}
+        stable_at, volatile_at, mask, payload = entry
+        if not mask & self._usable_mask(stable_at, volatile_at, self.stale_ttl):
+            del self._entries[place_id]
+            self.stats.expirations += 1
+            return {}
+        fresh_mask = self._usable_mask(stable_at, volatile_at, grace)
+        if not mask & fresh_mask:
+            return {}
+        cached = [field for field in self.fields if mask & (1 << self._index[field])]
+        values = json.loads(zlib.decompress(payload))
+        return {
+            field: value
+            for field, value in zip(cached, values)
+            if fresh_mask & (1 << self._index[field])
+        }
+
+    def _usable_mask(self, stable_at: float, volatile_at: float, grace: float) -> int:
+        now = self._clock()
+        mask = 0
+        if stable_at + self.ttl + grace > now:
+            mask |= self._stable_mask
+        if volatile_at + self.volatile_ttl + grace > now:
+            mask |= self._volatile_mask
+        return mask
+
+    def _mask(self, fields: Iterable[str]) -> int:
+        mask = 0
+        for field in fields:
+            index = self._index.get(field)
+            if index is not None:
+                mask |= 1 << index
+        return mask
@@ -0,0 +1,170 @@
+"""Circuit breaker for ShopAI upstream calls.
+
+This module provides CircuitBreaker, which stops calling an upstream that keeps
+failing or responding slowly. After ``failure_threshold`` consecutive failures
+the circuit opens and calls fail immediately with CircuitOpen instead of
+waiting out timeouts. Once ``recovery_timeout`` has passed the circuit goes
+half-open and lets a few probe calls through: a successful probe closes it, a
+failed one opens it again.
+
+Example:
+    >>> from src.services.circuit_breaker import CircuitBreaker, CircuitOpen
+    >>> breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30)
+    >>> try:
+    ...     result = await breaker.call(lambda: client.place(place_id))
+    ... except CircuitOpen:
+    ...     result = None  # serve stale data instead
+"""
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream while the circuit is open."""
+
+
+@dataclass
+class CircuitStats:
+    """Counters describing circuit breaker activity.
+
+    Attributes:
+        successes: Calls that completed in time
+        failures: Calls that failed or were slower than the slow call threshold
+        rejected: Calls refused without reaching the upstream
+        opened: Times the circuit opened
+    """
+
+    successes: int = 0
+    failures: int = 0
+    rejected: int = 0
+    opened: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the circuit
+        recovery_timeout: Seconds the circuit stays open before probing
+        half_open_max_calls: Probe calls allowed at once while half-open
+        slow_call_threshold: Seconds after which a successful call still counts
+            as a failure, or None to judge calls by errors only
+        stats: Success, failure, rejection and opening counters
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        slow_call_threshold: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.slow_call_threshold = slow_call_threshold
+        self.stats = CircuitStats()
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: ``closed``, ``open`` or ``half_open``."""
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; counts half-open probes."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        """Record a completed call, which may still count as a slow failure."""
+        if self.slow_call_threshold is not None and latency is not None:
+            if latency > self.slow_call_threshold:
+                self.record_failure()
+                return
+        self.stats.successes += 1
+        self._failures = 0
+        if self._state == HALF_OPEN:
+            self._state = CLOSED
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        self.stats.failures += 1
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._open()
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        is_failure: Callable[[BaseException], bool] = lambda e: True,
+    ) -> T:
+        """Run ``fn`` unless the circuit is open.
+
+        Args:
+            fn: Zero-argument coroutine factory performing the upstream call
+            is_failure: Tells whether an error reflects upstream health; other
+                errors, e.g. a place that does not exist, leave the state as is
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            CircuitOpen: If the circuit is open or its probes are taken
+        """
+        if not self.allow():
+            self.stats.rejected += 1
+            raise CircuitOpen("upstream circuit is open")
+        started = self._clock()
+        try:
+            result = await fn()
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            else:
+                self._release_probe()
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self.record_success(self._clock() - started)
+        return result
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._failures = 0
+        self.stats.opened += 1
+
+    def _release_probe(self) -> None:
+        if self._state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
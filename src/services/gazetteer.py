@@ -0,0 +1,379 @@
+"""Local gazetteer backend for ShopAI location search.
+
+This module provides an offline alternative to the Google Places client. Places
+are loaded from a CSV or JSONL file into memory and indexed with a sorted token
+vocabulary (prefix lookups by binary search, the flat equivalent of a trie) and
+a trigram index over the vocabulary for typo-tolerant fuzzy matching.
+
+Gazetteer implements the same ``places_autocomplete`` and ``place`` methods as
+AsyncPlacesClient and returns Google-shaped payloads, so LocationService can use
+it as its client and keep returning the usual LocationSuggestion and
+LocationDetails models.
+
+Example:
+    >>> from src.services.gazetteer import Gazetteer
+    >>> gazetteer = Gazetteer.from_file("stores.csv")
+    >>> predictions = await gazetteer.places_autocomplete("starb")
+    >>> details = await gazetteer.place(predictions[0]["place_id"])
+"""
+import bisect
+import csv
+import hashlib
+import heapq
+import json
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from googlemaps import exceptions
+
+# LocationDetails attributes carried through as optional place metadata
+METADATA_FIELDS = (
+    "vicinity", "url", "website", "formatted_phone_number",
+    "international_phone_number", "rating", "user_ratings_total", "price_level",
+    "opening_hours", "wheelchair_accessible_entrance", "delivery", "dine_in",
+    "editorial_summary",
+)
+_FLOAT_FIELDS = {"rating"}
+_INT_FIELDS = {"user_ratings_total", "price_level"}
+_BOOL_FIELDS = {"wheelchair_accessible_entrance", "delivery", "dine_in"}
+_JSON_FIELDS = {"opening_hours"}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded, accent-stripped word tokens."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(stripped)
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(slots=True)
+class GazetteerPlace:
+    """A single place known to the gazetteer.
+
+    Attributes:
+        place_id: Stable place identifier
+        name: Place name, used as the prediction main text
+        latitude: Place latitude
+        longitude: Place longitude
+        formatted_address: Full formatted address
+        secondary_text: Prediction secondary text, e.g. the locality
+        types: Place types
+        metadata: Optional LocationDetails attributes (rating, website, ...)
+    """
+
+    place_id: str
+    name: str
+    latitude: float
+    longitude: float
+    formatted_address: str
+    secondary_text: Optional[str] = None
+    types: Tuple[str, ...] = ()
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "GazetteerPlace":
+        """Build a place from a CSV row or JSON object.
+
+        Accepts ``lat``/``lng``/``lon`` and ``address`` aliases, pipe-separated
+        ``types`` strings and string-encoded numbers and booleans as found in CSV.
+
+        Raises:
+            ValueError: If a required column is missing or malformed
+        """
+        try:
+            name = record["name"]
+            latitude = float(_first(record, "latitude", "lat"))
+            longitude = float(_first(record, "longitude", "lng", "lon"))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid gazetteer record {record!r}: {e}") from e
+        address = _first(record, "formatted_address", "address", default=name)
+        types = record.get("types") or ()
+        if isinstance(types, str):
+            types = [t for t in types.split("|") if t]
+        place_id = record.get("place_id") or "gz_" + hashlib.sha1(
+            f"{name}|{latitude}|{longitude}".encode()
+        ).hexdigest()[:16]
+        metadata = {
+            key: _coerce(key, record[key])
+            for key in METADATA_FIELDS
+            if record.get(key) not in (None, "")
+        }
+        return cls(
+            place_id=place_id,
+            name=name,
+            latitude=latitude,
+            longitude=longitude,
+            formatted_address=address,
+            secondary_text=record.get("secondary_text") or _secondary(name, address),
+            types=tuple(types),
+            metadata=metadata,
+        )
+
+    def to_prediction(self) -> Dict[str, Any]:
+        """Render the place as a Places autocomplete prediction."""
+        description = self.name
+        if self.secondary_text:
+            description = f"{self.name}, {self.secondary_text}"
+        return {
+            "place_id": self.place_id,
+            "description": description,
+            "structured_formatting": {
+                "main_text": self.name,
+                "secondary_text": self.secondary_text,
+            },
+            "types": list(self.types),
+        }
+
+    def to_result(self) -> Dict[str, Any]:
+        """Render the place as a Places details result."""
+        result: Dict[str, Any] = {
+            "place_id": self.place_id,
+            "name": self.name,
+            "formatted_address": self.formatted_address,
+            "geometry": {"location": {"lat": self.latitude, "lng": self.longitude}},
+            "types": list(self.types),
+        }
+        result.update(self.metadata)
+        if "editorial_summary" in self.metadata:
+            overview = self.metadata["editorial_summary"]
+            result["editorial_summary"] = {"overview": overview}
+        return result
+
+
+class Gazetteer:
+    """In-memory place index answering prefix and fuzzy autocomplete queries.
+
+    Every query token must match a token of the place name or address, either
+    exactly, as a prefix, or (when nothing matches) by trigram similarity.
+    Candidates are ranked by match quality, a bonus for names starting with the
+    query, and popularity (``user_ratings_total``).
+
+    Attributes:
+        limit: Default number of predictions returned, like Google's five
+        fuzzy_threshold: Minimum trigram Jaccard similarity for fuzzy matches
+        max_expansions: Maximum vocabulary words a single prefix expands to
+    """
+
+    def __init__(
+        self,
+        places: Iterable[GazetteerPlace],
+        limit: int = 5,
+        fuzzy_threshold: float = 0.35,
+        max_expansions: int = 1000,
+    ):
+        self.limit = limit
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_expansions = max_expansions
+        self._places: List[GazetteerPlace] = []
+        self._by_id: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._popularity: List[float] = []
+        postings: Dict[str, Set[int]] = defaultdict(set)
+        for place in places:
+            if place.place_id in self._by_id:
+                continue
+            index = len(self._places)
+            self._places.append(place)
+            self._by_id[place.place_id] = index
+            self._names.append(" ".join(tokenize(place.name)))
+            self._popularity.append(
+                math.log1p(place.metadata.get("user_ratings_total") or 0)
+            )
+            for token in tokenize(f"{place.name} {place.formatted_address}"):
+                postings[token].add(index)
+
+        self._vocab: List[str] = sorted(postings)
+        self._postings: List[Tuple[int, ...]] = [
+            tuple(sorted(postings[word])) for word in self._vocab
+        ]
+        trigram_index: Dict[str, List[int]] = defaultdict(list)
+        for word_id, word in enumerate(self._vocab):
+            for trigram in _trigrams(word):
+                trigram_index[trigram].append(word_id)
+        self._trigram_index = dict(trigram_index)
+        self._max_popularity = max(self._popularity, default=0.0) or 1.0
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "Gazetteer":
+        """Load a gazetteer from a ``.csv`` or ``.jsonl`` file.
+
+        Args:
+            path: Path of the place file
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            Gazetteer: Index over the loaded places
+        """
+        return cls(load_places(path), **kwargs)
+
+    def get(self, place_id: str) -> Optional[GazetteerPlace]:
+        """Return the place with ``place_id``, if known."""
+        index = self._by_id.get(place_id)
+        return None if index is None else self._places[index]
+
+    def coordinates(self) -> Tuple[List[str], List[float], List[float]]:
+        """Return place ids, latitudes and longitudes, e.g. to seed a GeoIndex."""
+        return (
+            [place.place_id for place in self._places],
+            [place.latitude for place in self._places],
+            [place.longitude for place in self._places],
+        )
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[float, GazetteerPlace]]:
+        """Find the best matching places for a partial query.
+
+        Args:
+            query: Text the user has typed so far
+            limit: Number of results, defaults to ``self.limit``
+
+        Returns:
+            List of (score, place) pairs, best first
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        per_token: List[Dict[int, float]] = []
+        for token in tokens:
+            matches = self._match_token(token)
+            if not matches:
+                return []
+            per_token.append(matches)
+
+        per_token.sort(key=len)
+        candidates = set(per_token[0])
+        for matches in per_token[1:]:
+            candidates.intersection_update(matches)
+
+        normalized = " ".join(tokens)
+        scored = []
+        for index in candidates:
+            score = sum(matches[index] for matches in per_token) / len(tokens)
+            if self._names[index].startswith(normalized):
+                score += 0.5
+            score += 0.1 * self._popularity[index] / self._max_popularity
+            scored.append((score, index))
+        best = heapq.nlargest(limit or self.limit, scored, key=lambda item: item[0])
+        return [(score, self._places[index]) for score, index in best]
+
+    async def places_autocomplete(
+        self, input_text: str, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Return Google-shaped predictions for ``input_text``.
+
+        Extra Places parameters (language, types, session token, ...) are
+        accepted for compatibility and ignored.
+        """
+        return [place.to_prediction() for _, place in self.search(input_text)]
+
+    async def place(
+        self, place_id: str, fields: Optional[Sequence[str]] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Return a Google-shaped details response for ``place_id``.
+
+        Raises:
+            googlemaps.exceptions.ApiError: With status NOT_FOUND for unknown places
+        """
+        place = self.get(place_id)
+        if place is None:
+            raise exceptions.ApiError("NOT_FOUND", f"Unknown place {place_id}")
+        return {"status": "OK", "result": place.to_result()}
+
+    def _match_token(self, token: str) -> Dict[int, float]:
+        """Map place indices to the best match quality for one query token."""
+        matches: Dict[int, float] = {}
+        start = bisect.bisect_left(self._vocab, token)
+        end = min(
+            bisect.bisect_left(self._vocab, token + "\uffff"),
+            start + self.max_expansions,
+        )
+        for word_id in range(start, end):
+            quality = 1.0 if self._vocab[word_id] == token else 0.8
+            self._add_postings(matches, word_id, quality)
+        if matches:
+            return matches
+
+        query_trigrams = _trigrams(token)
+        shared: Dict[int, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            for word_id in self._trigram_index.get(trigram, ()):
+                shared[word_id] += 1
+        for word_id, count in shared.items():
+            similarity = count / (
+                len(query_trigrams) + len(_trigrams(self._vocab[word_id])) - count
+            )
+            if similarity >= self.fuzzy_threshold:
+                self._add_postings(matches, word_id, 0.6 * similarity)
+        return matches
+
+    def _add_postings(self, matches: Dict[int, float], word_id: int, quality: float):
+        for index in self._postings[word_id]:
+            if matches.get(index, 0.0) < quality:
+                matches[index] = quality
+
+
+def load_places(path: str) -> List[GazetteerPlace]:
+    """Read places from a ``.csv`` or ``.jsonl`` file.
+
+    Raises:
+        ValueError: If the file type is unsupported or a record is invalid
+    """
+    suffix = Path(path).suffix.lower()
+    with open(path, encoding="utf-8", newline="") as handle:
+        if suffix == ".csv":
+            records: Iterable[Dict[str, Any]] = csv.DictReader(handle)
+            return [GazetteerPlace.from_record(record) for record in records]
+        if suffix in (".jsonl", ".ndjson"):
+            return [
+                GazetteerPlace.from_record(json.loads(line))
+                for line in handle
+                if line.strip()
+            ]
+    raise ValueError(f"Unsupported gazetteer file type: {path}")
+
+
+def _first(record: Dict[str, Any], *keys: str, **default: Any) -> Any:
+    for key in keys:
+        if record.get(key) not in (None, ""):
+            return record[key]
+    if "default" in default:
+        return default["default"]
+    raise KeyError(keys[0])
+
+
+def _coerce(key: str, value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    if key in _FLOAT_FIELDS:
+        return float(value)
+    if key in _INT_FIELDS:
+        return int(value)
+    if key in _BOOL_FIELDS:
+        return value.strip().lower() in ("1", "true", "yes")
+    if key in _JSON_FIELDS:
+        return json.loads(value)
+    return value
+
+
+def _secondary(name: str, address: str) -> Optional[str]:
+    """Derive secondary text from an address that starts with the place name."""
+    if address.startswith(name):
+        rest = address[len(name):].lstrip(" ,")
+        return rest or None
+    return address if address != name else None
@@ -0,0 +1,217 @@
+"""Spatial index for ShopAI location ranking and nearby search.
+
+This module provides GeoIndex, an in-memory grid index over place coordinates.
+Places are bucketed into fixed-size latitude/longitude cells; a radius query
+collects the rows of the cells overlapping the search circle and scores them
+with a vectorized NumPy haversine, so large candidate sets cost one array
+operation instead of a Python loop. A read-only ``base`` index, such as a
+memory-mapped PlaceIndex, can answer for places known up front, so they are
+never copied into the grid.
+
+Example:
+    >>> from src.services.geo_index import GeoIndex
+    >>> index = GeoIndex()
+    >>> index.add("p1", 51.5074, -0.1278)
+    >>> index.nearby(51.5, -0.12, radius=2_000)
+    [('p1', 984.14...)]
+"""
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def haversine_m(
+    lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray
+) -> np.ndarray:
+    """Great-circle distances in meters from one point to many.
+
+    Args:
+        lat: Origin latitude in degrees
+        lng: Origin longitude in degrees
+        lats: Target latitudes in degrees
+        lngs: Target longitudes in degrees
+
+    Returns:
+        np.ndarray: Distance to each target in meters
+    """
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs) - math.radians(lng)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GeoIndex:
+    """Grid-bucketed point index with vectorized distance scoring.
+
+    Attributes:
+        cell_size: Grid cell edge in degrees (0.05° is roughly 5 km)
+        max_size: Maximum number of places; further new places are ignored
+        base: Optional read-only index with ``nearby`` and ``distances``
+            consulted alongside the grid; grid entries win for the same place
+    """
+
+    def __init__(
+        self,
+        cell_size: float = 0.05,
+        max_size: int = 1_000_000,
+        base: Optional[Any] = None,
+    ):
+        self.cell_size = cell_size
+        self.max_size = max_size
+        self.base = base
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._lats = np.empty(1024)
+        self._lngs = np.empty(1024)
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, place_id: str) -> bool:
+        return place_id in self._rows
+
+    def add(self, place_id: str, latitude: float, longitude: float) -> None:
+        """Insert a place, or move it if its coordinates changed."""
+        row = self._rows.get(place_id)
+        if row is not None:
+            if self._lats[row] == latitude and self._lngs[row] == longitude:
+                return
+            old_cell = self._cell(self._lats[row], self._lngs[row])
+            self._cells[old_cell].remove(row)
+        elif len(self._ids) >= self.max_size:
+            return
+        else:
+            row = len(self._ids)
+            self._reserve(row + 1)
+            self._ids.append(place_id)
+            self._rows[place_id] = row
+        self._lats[row] = latitude
+        self._lngs[row] = longitude
+        self._cells[self._cell(latitude, longitude)].append(row)
+
+    def add_many(
+        self,
+        place_ids: Sequence[str],
+        latitudes: Iterable[float],
+        longitudes: Iterable[float],
+    ) -> None:
+        """Bulk insert places, e.g. a whole gazetteer at startup."""
+        lats = np.asarray(latitudes, dtype=float)
+        lngs = np.asarray(longitudes, dtype=float)
+        for place_id, lat, lng in zip(place_ids, lats.tolist(), lngs.tolist()):
+            self.add(place_id, lat, lng)
+
+    def coordinates(self, place_id: str) -> Optional[Tuple[float, float]]:
+        """Return the (lat, lng) of a place, if indexed."""
+        row = self._rows.get(place_id)
+        if row is None:
+            return None
+        return float(self._lats[row]), float(self._lngs[row])
+
+    def distances(
+        self, lat: float, lng: float, place_ids: Sequence[str]
+    ) -> List[Optional[float]]:
+        """Distances in meters from a point to each place; None if not indexed."""
+        rows = [self._rows.get(place_id) for place_id in place_ids]
+        known = [row for row in rows if row is not None]
+        result: List[Optional[float]] = [None] * len(rows)
+        if known:
+            found = iter(
+                haversine_m(lat, lng, self._lats[known], self._lngs[known]).tolist()
+            )
+            result = [None if row is None else next(found) for row in rows]
+        unknown = [i for i, row in enumerate(rows) if row is None]
+        if unknown and self.base is not None:
+            from_base = self.base.distances(
+                lat, lng, [place_ids[i] for i in unknown]
+            )
+            for i, distance in zip(unknown, from_base):
+                result[i] = distance
+        return result
+
+    def nearby(
+        self, lat: float, lng: float, radius: float, limit: int = 20
+    ) -> List[Tuple[str, float]]:
+        """Find indexed places within ``radius`` meters, nearest first.
+
+        Args:
+            lat: Search center latitude
+            lng: Search center longitude
+            radius: Search radius in meters
+            limit: Maximum number of places returned
+
+        Returns:
+            List of (place_id, distance in meters) pairs
+        """
+        found = self._nearby_rows(lat, lng, radius, limit)
+        if self.base is None:
+            return found
+        # Grid entries are fresher than the base for the same place
+        merged = [
+            (place_id, distance)
+            for place_id, distance in self.base.nearby(lat, lng, radius, limit=limit)
+            if place_id not in self._rows
+        ]
+        merged.extend(found)
+        merged.sort(key=lambda item: item[1])
+        return merged[:limit]
+
+    def _nearby_rows(
+        self, lat: float, lng: float, radius: float, limit: int
+    ) -> List[Tuple[str, float]]:
+        rows = self._candidate_rows(lat, lng, radius)
+        if not rows:
+            return []
+        candidates = np.fromiter(rows, dtype=np.int64, count=len(rows))
+        distances = haversine_m(
+            lat, lng, self._lats[candidates], self._lngs[candidates]
+        )
+        inside = np.flatnonzero(distances <= radius)
+        if inside.size > limit:
+            inside = inside[np.argpartition(distances[inside], limit)[:limit]]
+        inside = inside[np.argsort(distances[inside], kind="stable")]
+        return [
+            (self._ids[candidates[i]], float(distances[i])) for i in inside.tolist()
+        ]
+
+    def _candidate_rows(self, lat: float, lng: float, radius: float) -> List[int]:
+        dlat = math.degrees(radius / EARTH_RADIUS_M)
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlng = min(math.degrees(radius / (EARTH_RADIUS_M * cos_lat)), 180.0)
+        lat_lo = int(math.floor((lat - dlat) / self.cell_size))
+        lat_hi = int(math.floor((lat + dlat) / self.cell_size))
+        # Unwrapped longitude cells, folded back across the antimeridian
+        lng_lo = int(math.floor((lng - dlng) / self.cell_size))
+        lng_hi = int(math.floor((lng + dlng) / self.cell_size))
+        lng_hi = min(lng_hi, lng_lo + int(round(360 / self.cell_size)))
+        lng_cells = {self._wrap(cell) for cell in range(lng_lo, lng_hi + 1)}
+        rows: List[int] = []
+        for lat_cell in range(lat_lo, lat_hi + 1):
+            for lng_cell in lng_cells:
+                rows.extend(self._cells.get((lat_cell, lng_cell), ()))
+        return rows
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (
+            int(math.floor(lat / self.cell_size)),
+            self._wrap(int(math.floor(lng / self.cell_size))),
+        )
+
+    def _wrap(self, lng_cell: int) -> int:
+        cells_around = int(round(360 / self.cell_size))
+        offset = int(math.floor(-180 / self.cell_size))
+        return (lng_cell - offset) % cells_around + offset
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._lats.size:
+            return
+        capacity = max(size, self._lats.size * 2)
+        self._lats = np.resize(self._lats, capacity)
+        self._lngs = np.resize(self._lngs, capacity)
@@ -0,0 +1,353 @@
+"""Prompt and response caching for ShopAI LLM providers.
+
+This module provides CachingLLMProvider, which wraps any BaseLLMProvider with
+two cache tiers:
+
+* An exact tier keyed on (model_name, temperature, prompt): an in-process LRU
+  cache with TTL, optionally backed by a persistent SQLite tier.
+* An optional semantic tier, SemanticCache, which answers near-duplicate
+  prompts ("coffee shops near me" / "coffee shop near me") with the response
+  of the most similar cached prompt. Prompts are embedded by a pluggable local
+  function and matched with one vectorized NumPy dot product. Callers filling
+  a fixed template pass the variable text as ``semantic_key``: only that text
+  is embedded, and it only matches keys sent with the same template, so the
+  shared template wording cannot make unrelated requests look alike.
+
+Only deterministic calls are cached: a provider sampling with a non-zero
+temperature is bypassed unless caching is forced. Hits, misses, bypasses and
+the provider latency that hits saved are counted.
+
+Example:
+    >>> from src.services.cache import TieredCache, TTLCache
+    >>> from src.services.llm_cache import CachingLLMProvider, SemanticCache
+    >>> llm = CachingLLMProvider(
+    ...     provider,
+    ...     TieredCache(TTLCache(max_size=10_000, ttl=3_600)),
+    ...     semantic=SemanticCache(threshold=0.9),
+    ... )
+    >>> await llm.generate("coffee shops near me")
+    >>> await llm.generate("Coffee shop near me")  # semantic hit
+    >>> llm.stats.hit_rate
+    0.5
+"""
+import hashlib
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .base_llm_provider import BaseLLMProvider
+from .cache import TieredCache, TTLCache
+from .singleflight import SingleFlight
+
+# Cached value: {"response": str, "latency": seconds the provider took}
+CachedResponse = Dict[str, Any]
+
+
+def hashed_ngram_embedding(text: str, dim: int = 256, n: int = 3) -> np.ndarray:
+    """Embed text as hashed character n-gram counts.
+
+    A cheap local embedding that needs no model: case and whitespace are
+    ignored, each word padded with spaces is split into character n-grams,
+    and every n-gram is hashed into one of ``dim`` buckets with a random sign.
+    Prompts that differ by a typo or a plural share most n-grams.
+
+    Args:
+        text: Text to embed
+        dim: Number of dimensions
+        n: n-gram length
+
+    Returns:
+        np.ndarray: Unit-length float32 vector, or zeros for empty text
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in text.casefold().split():
+        padded = f" {word} "
+        for i in range(max(1, len(padded) - n + 1)):
+            digest = zlib.crc32(padded[i:i + n].encode())
+            vector[digest % dim] += 1.0 if digest & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@dataclass
+class LLMCacheStats:
+    """Counters describing LLM cache effectiveness.
+
+    Attributes:
+        hits: Calls answered by the exact tier
+        semantic_hits: Calls answered by the semantic tier
+        misses: Calls that went to the provider
+        bypassed: Calls not cached because the provider samples randomly
+        saved_seconds: Provider latency avoided by hits
+    """
+
+    hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of cacheable calls answered by either tier."""
+        lookups = self.hits + self.semantic_hits + self.misses
+        return (self.hits + self.semantic_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the counters and hit rate as a plain dictionary."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class SemanticCache:
+    """Nearest-neighbour cache of responses by prompt embedding.
+
+    Embeddings are kept as rows of one float32 matrix, so a lookup is a single
+    matrix-vector product over all entries. Each entry has a scope, and a
+    lookup only matches entries of its own scope. When full, the oldest entry
+    is overwritten.
+
+    Attributes:
+        embed: Maps a prompt to a unit-length vector
+        threshold: Smallest cosine similarity that counts as the same prompt
+        max_size: Maximum number of entries
+        ttl: Seconds an entry is served
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], np.ndarray] = hashed_ngram_embedding,
+        threshold: float = 0.92,
+        max_size: int = 10_000,
+        ttl: float = 86_400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.embed = embed
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._vectors: Optional[np.ndarray] = None
+        self._stored_at = np.zeros(0)
+        self._scopes = np.zeros(0, dtype=np.int64)
+        self._values: List[Optional[CachedResponse]] = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(
+        self, prompt: str, scope: str = ""
+    ) -> Optional[Tuple[CachedResponse, float]]:
+        """Find the cached response of the most similar prompt.
+
+        Args:
+            prompt: Prompt to look up
+            scope: Only entries stored with this scope are matched
+
+        Returns:
+            The cached value and its similarity, or None if no fresh entry
+            reaches ``threshold``
+        """
+        if not self._values:
+            return None
+        size = len(self._values)
+        scores = self._vectors[:size] @ self._unit(self.embed(prompt))
+        scores[self._stored_at[:size] < self._clock() - self.ttl] = -np.inf
+        scores[self._scopes[:size] != hash(scope)] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self._values[best], float(scores[best])
+
+    def set(self, prompt: str, value: CachedResponse, scope: str = "") -> None:
+        """Store the response to ``prompt`` within ``scope``."""
+        vector = self._unit(self.embed(prompt))
+        if self._vectors is None:
+            self._vectors = np.zeros((16, vector.shape[0]), dtype=np.float32)
+            self._stored_at = np.zeros(16)
+            self._scopes = np.zeros(16, dtype=np.int64)
+        row = self._next
+        if row == len(self._values):
+            if row == self._vectors.shape[0]:
+                capacity = min(self.max_size, row * 2)
+                self._vectors = np.resize(self._vectors, (capacity, vector.shape[0]))
+                self._stored_at = np.resize(self._stored_at, capacity)
+                self._scopes = np.resize(self._scopes, capacity)
+            self._values.append(value)
+        else:
+            self._values[row] = value
+        self._vectors[row] = vector
+        self._stored_at[row] = self._clock()
+        self._scopes[row] = hash(scope)
+        self._next = (row + 1) % self.max_size
+
+    @staticmethod
+    def _unit(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class CachingLLMProvider(BaseLLMProvider):
+    """LLM provider wrapper serving repeat prompts from cache.
+
+    Concurrent calls for the same uncached prompt share one provider call.
+
+    Attributes:
+        provider: The wrapped provider
+        cache: Exact tier keyed on model, temperature and prompt
+        semantic: Optional near-duplicate tier
+        cache_sampled: Whether to cache a provider with non-zero temperature
+        stats: Hit, miss, bypass and saved latency counters
+    """
+
+    def __init__(
+        self,
+        provider: BaseLLMProvider,
+        cache: Optional[TieredCache[CachedResponse]] = None,
+        semantic: Optional[SemanticCache] = None,
+        cache_sampled: bool = False,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        super().__init__(provider.model_name, provider.temperature)
+        self.provider = provider
+        self.cache = cache or TieredCache(TTLCache(max_size=10_000, ttl=86_400.0))
+        self.semantic = semantic
+        self.cache_sampled = cache_sampled
+        self.stats = LLMCacheStats()
+        self._clock = clock
+        self._flight: SingleFlight[str] = SingleFlight()
+
+    @property
+    def bypass(self) -> bool:
+        """Whether calls skip the cache because responses are sampled."""
+        return self.provider.temperature > 0 and not self.cache_sampled
+
+    def cache_key(self, prompt: str) -> str:
+        """Exact tier key of a prompt for the wrapped model and temperature."""
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        model = self.provider.model_name
+        return f"llm|{model}|{self.provider.temperature!r}|{digest}"
+
+    async def generate(self, prompt: str, semantic_key: Optional[str] = None) -> str:
+        """Generate a response, from cache when possible.
+
+        Args:
+            prompt: Input text prompt
+            semantic_key: Variable part of a templated prompt, such as the
+                user's request; the semantic tier compares only this text,
+                against keys sent with the same template. Defaults to the
+                whole prompt.
+
+        Returns:
+            str: Generated text response
+        """
+        if self.bypass:
+            self.stats.bypassed += 1
+            return await self.provider.generate(prompt)
+        semantic = self._semantic_scope(prompt, semantic_key)
+        cached = await self._lookup(prompt, semantic)
+        if cached is not None:
+            return cached
+        key = self.cache_key(prompt)
+        return await self._flight.do(key, lambda: self._load(prompt, semantic))
+
+    async def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Generate responses, sending only uncached prompts to the provider."""
+        if self.bypass:
+            self.stats.bypassed += len(prompts)
+            return await self.provider.generate_batch(prompts)
+        responses: Dict[str, str] = {}
+        missing = []
+        for prompt in dict.fromkeys(prompts):
+            cached = await self._lookup(prompt)
+            if cached is None:
+                missing.append(prompt)
+            else:
+                responses[prompt] = cached
+        if missing:
+            started = self._clock()
+            generated = await self.provider.generate_batch(missing)
+            latency = self._clock() - started
+            for prompt, response in zip(missing, generated):
+                await self._store(prompt, response, latency)
+                responses[prompt] = response
+        return [responses[prompt] for prompt in prompts]
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream a response; cached responses arrive as a single chunk and
+        streamed responses are cached once complete."""
+        if self.bypass:
+            self.stats.bypassed += 1
+            async for chunk in self.provider.stream(prompt):
+                yield chunk
+            return
+        cached = await self._lookup(prompt)
+        if cached is not None:
+            yield cached
+            return
+        started = self._clock()
+        chunks = []
+        async for chunk in self.provider.stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        await self._store(prompt, "".join(chunks), self._clock() - started)
+
+    async def aclose(self) -> None:
+        """Close the cache tiers and the wrapped provider."""
+        self.cache.close()
+        await self.provider.aclose()
+
+    @staticmethod
+    def _semantic_scope(prompt: str, semantic_key: Optional[str]) -> Tuple[str, str]:
+        """Text embedded by the semantic tier and the scope it is matched in.
+
+        A templated prompt is scoped by its template, i.e. the prompt with the
+        key cut out; plain prompts share the default scope.
+        """
+        if semantic_key is None:
+            return prompt, ""
+        return semantic_key, prompt.replace(semantic_key, "\0")
+
+    async def _lookup(
+        self, prompt: str, semantic: Optional[Tuple[str, str]] = None
+    ) -> Optional[str]:
+        """Return a cached response from the exact or semantic tier, counting
+        the outcome."""
+        value = await self.cache.get(self.cache_key(prompt))
+        if value is not None:
+            self.stats.hits += 1
+        elif self.semantic is not None:
+            match = self.semantic.get(*(semantic or (prompt, "")))
+            if match is not None:
+                value = match[0]
+                self.stats.semantic_hits += 1
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.saved_seconds += value["latency"]
+        return value["response"]
+
+    async def _load(self, prompt: str, semantic: Tuple[str, str]) -> str:
+        started = self._clock()
+        response = await self.provider.generate(prompt)
+        await self._store(prompt, response, self._clock() - started, semantic)
+        return response
+
+    async def _store(
+        self,
+        prompt: str,
+        response: str,
+        latency: float,
+        semantic: Optional[Tuple[str, str]] = None,
+    ) -> None:
+        value = {"response": response, "latency": latency}
+        await self.cache.set(self.cache_key(prompt), value)
+        if self.semantic is not None:
+            text, scope = semantic or (prompt, "")
+            self.semantic.set(text, value, scope)
@@ -0,0 +1,213 @@
+"""LLM provider runtime for ShopAI.
+
+This module provides LLMRuntime, which wraps any BaseLLMProvider with the
+scheduling a high-throughput service needs:
+
+* Micro-batching: concurrent ``generate`` calls arriving within
+  ``batch_window`` seconds are sent to the provider as one
+  ``generate_batch`` call of up to ``max_batch_size`` prompts.
+* Streaming: ``stream`` yields tokens as the provider produces them, so
+  callers can show the first token early.
+* Limits: at most ``max_concurrency`` batches and streams run against the
+  provider at once, and each is cut off after ``timeout`` seconds (for
+  streams, seconds without a new chunk).
+
+LLMRuntime is itself a BaseLLMProvider, so services take either one.
+
+Example:
+    >>> from src.services.llm_runtime import LLMRuntime
+    >>> from src.services.local_llm_provider import LocalLLMProvider
+    >>> llm = LLMRuntime(LocalLLMProvider(), batch_window=0.005)
+    >>> answers = await asyncio.gather(*(llm.generate(p) for p in prompts))
+    >>> async for token in llm.stream("coffee near me"):
+    ...     print(token, end="")
+"""
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from .base_llm_provider import BaseLLMProvider
+
+
+@dataclass
+class LLMStats:
+    """Counters describing LLM runtime activity.
+
+    Attributes:
+        requests: Prompts submitted through ``generate``
+        batches: Provider batch calls made for them
+        streams: Streams started
+        timeouts: Batches and streams cut off by the timeout
+        errors: Batches and streams that failed otherwise
+    """
+
+    requests: int = 0
+    batches: int = 0
+    streams: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+_Pending = Tuple[str, "asyncio.Future[str]"]
+
+
+class LLMRuntime(BaseLLMProvider):
+    """Batching, streaming and concurrency control around an LLM provider.
+
+    Attributes:
+        provider: The wrapped provider
+        max_batch_size: Most prompts sent in one provider call
+        batch_window: Seconds a prompt waits for others to share its batch;
+            0 batches only calls made in the same event loop iteration
+        max_concurrency: Most batches and streams in flight at once
+        timeout: Seconds a batch may take, or a stream may wait for its next
+            chunk; None for no limit
+        stats: Request, batch, stream, timeout and error counters
+    """
+
+    def __init__(
+        self,
+        provider: BaseLLMProvider,
+        max_batch_size: int = 16,
+        batch_window: float = 0.005,
+        max_concurrency: int = 4,
+        timeout: Optional[float] = 30.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        super().__init__(provider.model_name, provider.temperature)
+        self.provider = provider
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.stats = LLMStats()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._pending: List[_Pending] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: Set["asyncio.Task[None]"] = set()
+
+    async def generate(self, prompt: str) -> str:
+        """Generate a response, batched with concurrent calls.
+
+        Args:
+            prompt: Input text prompt
+
+        Returns:
+            Generated text response
+
+        Raises:
+            asyncio.TimeoutError: If the batch took longer than ``timeout``
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[str]" = loop.create_future()
+        self._pending.append((prompt, future))
+        self.stats.requests += 1
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    async def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Generate responses for prompts, batched with concurrent calls."""
+        return list(await asyncio.gather(*(self.generate(p) for p in prompts)))
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream a response chunk by chunk within the concurrency limit.
+
+        Args:
+            prompt: Input text prompt
+
+        Yields:
+            Chunks of the generated text response, in order
+
+        Raises:
+            asyncio.TimeoutError: If the provider went ``timeout`` seconds
+                without producing a chunk
+        """
+        self.stats.streams += 1
+        async with self._slots:
+            chunks = self.provider.stream(prompt).__aiter__()
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            chunks.__anext__(), self.timeout
+                        )
+                    except StopAsyncIteration:
+                        return
+                    except asyncio.TimeoutError:
+                        self.stats.timeouts += 1
+                        raise
+                    except Exception:
+                        self.stats.errors += 1
+                        raise
+                    yield chunk
+            finally:
+                if hasattr(chunks, "aclose"):
+                    await chunks.aclose()
+
+    async def aclose(self) -> None:
+        """Cancel batches in flight and close the wrapped provider."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        for task in list(self._batches):
+            task.cancel()
+        await self.provider.aclose()
+
+    def _flush(self) -> None:
+        """Send the pending prompts to the provider in batches."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # Callers cancelled while waiting for the window drop out of the batch
+        pending = [item for item in self._pending if not item[1].done()]
+        self._pending = []
+        for start in range(0, len(pending), self.max_batch_size):
+            batch = pending[start:start + self.max_batch_size]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[_Pending]) -> None:
+        """Run one provider batch call and deliver its results."""
+        async with self._slots:
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                return
+            self.stats.batches += 1
+            try:
+                responses = await asyncio.wait_for(
+                    self.provider.generate_batch([prompt for prompt, _ in batch]),
+                    self.timeout,
+                )
+                if len(responses) != len(batch):
+                    raise ValueError(
+                        f"provider returned {len(responses)} responses "
+                        f"for {len(batch)} prompts"
+                    )
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.stats.timeouts += 1
+                else:
+                    self.stats.errors += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
@@ -0,0 +1,84 @@
+"""Deterministic local LLM provider for ShopAI.
+
+This module provides LocalLLMProvider, a stand-in for a hosted model that
+answers without network access. Responses come from a ``responder`` function
+(by default the prompt is echoed back) and are split into whitespace-delimited
+tokens. A configurable time-to-first-token and per-token delay imitate a real
+model, with one delay per batch so batching pays off as it does on a GPU. Tests
+and benchmarks use it to exercise the LLM runtime reproducibly.
+
+Example:
+    >>> from src.services.local_llm_provider import LocalLLMProvider
+    >>> provider = LocalLLMProvider(responder=lambda prompt: prompt.upper())
+    >>> await provider.generate("coffee near me")
+    'COFFEE NEAR ME'
+    >>> [chunk async for chunk in provider.stream("coffee near me")]
+    ['COFFEE ', 'NEAR ', 'ME']
+"""
+import asyncio
+import re
+from typing import AsyncIterator, Callable, List, Optional
+
+from .base_llm_provider import BaseLLMProvider
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into word tokens that keep their trailing whitespace."""
+    return _TOKEN.findall(text)
+
+
+class LocalLLMProvider(BaseLLMProvider):
+    """LLM provider that answers locally and deterministically.
+
+    Attributes:
+        responder: Maps a prompt to its full response
+        latency: Seconds before the first token of a call or batch
+        token_latency: Seconds per generated token
+        calls: Number of generate, batch and stream calls served
+        batch_sizes: Number of prompts of each call, in call order
+    """
+
+    def __init__(
+        self,
+        model_name: str = "local",
+        temperature: float = 0.0,
+        responder: Optional[Callable[[str], str]] = None,
+        latency: float = 0.0,
+        token_latency: float = 0.0,
+    ):
+        super().__init__(model_name, temperature)
+        self.responder = responder or (lambda prompt: prompt)
+        self.latency = latency
+        self.token_latency = token_latency
+        self.calls = 0
+        self.batch_sizes: List[int] = []
+
+    async def generate(self, prompt: str) -> str:
+        """Generate the response for a prompt."""
+        return (await self.generate_batch([prompt]))[0]
+
+    async def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Generate responses for several prompts, paying the delay once."""
+        self.calls += 1
+        self.batch_sizes.append(len(prompts))
+        responses = [self.responder(prompt) for prompt in prompts]
+        longest = max((len(tokenize(response)) for response in responses), default=0)
+        await self._sleep(self.latency + longest * self.token_latency)
+        return responses
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield the response for a prompt token by token."""
+        self.calls += 1
+        self.batch_sizes.append(1)
+        tokens = tokenize(self.responder(prompt))
+        await self._sleep(self.latency)
+        for token in tokens:
+            await self._sleep(self.token_latency)
+            yield token
+
+    @staticmethod
+    async def _sleep(seconds: float) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds)
@@ -0,0 +1,308 @@
+"""Shopping intent parsing for ShopAI location search.
+
+This module turns a free-text request such as "cheap vegan takeaway near Kings
+Cross open now" into a LocationIntent: the text to search Places for plus
+filters on place types, price level, opening hours, delivery and dine-in, and
+a place name to search around. LocationIntentParser asks an LLM provider for
+the intent as JSON and falls back to keyword rules when no provider is set or
+its answer is not a valid intent. Parsed intents are cached per normalized
+input and concurrent parses of the same input share one LLM call, so repeat
+queries cost no LLM time.
+
+The module also scores fetched places against an intent: a place that
+contradicts a known filter is dropped, and the rest are ranked by how many
+filters they are known to satisfy.
+
+Example:
+    >>> from src.services.location_intent import LocationIntentParser
+    >>> parser = LocationIntentParser(llm)
+    >>> intent = await parser.parse("cheap vegan takeaway near Kings Cross open now")
+    >>> intent.location, intent.max_price_level, intent.open_now
+    ('Kings Cross', 1, True)
+"""
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from ..models.location import LocationDetails, LocationIntent, LocationSuggestion
+from .base_llm_provider import BaseLLMProvider
+from .cache import TTLCache
+from .llm_cache import CachingLLMProvider
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+INTENT_PROMPT = """\
+Extract a place search from a shopper's request. Reply with a single JSON \
+object and nothing else, with these keys:
+- "query": what to search for, without price, opening, service or location words
+- "types": list of Google Places types the places should have, may be empty
+- "max_price_level": highest acceptable Google price level 0-4, or null
+- "open_now", "delivery", "dine_in": true, false or null if not mentioned
+- "location": name of the place to search around, or null
+Request: {text}"""
+
+# Phrases mapped to the filters they set, matched on word boundaries
+PRICE_WORDS = {
+    "cheap": 1, "budget": 1, "inexpensive": 1, "affordable": 1,
+    "mid-range": 2, "moderate": 2,
+}
+OPEN_NOW_PHRASES = ("open now", "open right now", "currently open")
+DELIVERY_PHRASES = ("delivery", "deliver", "delivers")
+DINE_IN_PHRASES = ("dine in", "dine-in", "eat in", "sit down", "sit-down")
+TYPE_WORDS = {
+    "takeaway": "meal_takeaway", "takeout": "meal_takeaway",
+    "restaurant": "restaurant", "restaurants": "restaurant",
+    "cafe": "cafe", "cafes": "cafe", "coffee": "cafe",
+    "bar": "bar", "bars": "bar", "pub": "bar", "pubs": "bar",
+    "bakery": "bakery", "bakeries": "bakery",
+    "supermarket": "supermarket", "grocery": "supermarket",
+    "pharmacy": "pharmacy", "chemist": "pharmacy",
+    "shoes": "shoe_store", "clothes": "clothing_store",
+    "clothing": "clothing_store", "books": "book_store",
+    "electronics": "electronics_store",
+}
+LOCATION_PREPOSITIONS = ("near", "around", "in", "by")
+# Words left dangling at either end of the query once filters are removed
+CONNECTIVES = frozenset({
+    "a", "an", "and", "any", "are", "for", "is", "that", "the", "which", "with",
+})
+
+# LocationDetails fields each intent filter needs
+INTENT_DETAIL_FIELDS = {
+    "types": "types",
+    "max_price_level": "price_level",
+    "open_now": "opening_hours",
+    "delivery": "delivery",
+    "dine_in": "dine_in",
+}
+
+
+def _phrase(phrases) -> "re.Pattern[str]":
+    alternatives = "|".join(re.escape(phrase) for phrase in phrases)
+    return re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+
+
+_PRICE = _phrase(PRICE_WORDS)
+_OPEN_NOW = _phrase(OPEN_NOW_PHRASES)
+_DELIVERY = _phrase(DELIVERY_PHRASES)
+_DINE_IN = _phrase(DINE_IN_PHRASES)
+_LOCATION = re.compile(
+    rf"\b(?:{'|'.join(LOCATION_PREPOSITIONS)})\s+(.+)$", re.IGNORECASE
+)
+
+
+def parse_intent_rules(text: str) -> LocationIntent:
+    """
+    Parses a request with keyword rules, as a fallback for the LLM.
+    Args:
+        text (str): The free-text request.
+    Returns:
+        LocationIntent: The filters recognized in the text; the remaining words
+        form the query.
+    """
+    filters: Dict[str, object] = {}
+    price = _PRICE.search(text)
+    if price:
+        filters["max_price_level"] = PRICE_WORDS[price.group(0).lower()]
+    if _OPEN_NOW.search(text):
+        filters["open_now"] = True
+    if _DELIVERY.search(text):
+        filters["delivery"] = True
+    if _DINE_IN.search(text):
+        filters["dine_in"] = True
+    rest = text
+    for pattern in (_PRICE, _OPEN_NOW, _DELIVERY, _DINE_IN):
+        rest = pattern.sub(" ", rest)
+    location = _LOCATION.search(rest)
+    if location:
+        filters["location"] = " ".join(location.group(1).split()) or None
+        rest = rest[:location.start()]
+    words = rest.split()
+    while words and words[-1].lower() in CONNECTIVES:
+        words.pop()
+    while words and words[0].lower() in CONNECTIVES:
+        words.pop(0)
+    query = " ".join(words) or " ".join(text.split())
+    types = []
+    for word in query.lower().split():
+        place_type = TYPE_WORDS.get(word)
+        if place_type and place_type not in types:
+            types.append(place_type)
+    return LocationIntent(query=query, types=types, **filters)
+
+
+def parse_intent_json(response: str) -> LocationIntent:
+    """
+    Parses an LLM response holding an intent as a JSON object, optionally in a
+    Markdown code fence.
+    Args:
+        response (str): The LLM response.
+    Returns:
+        LocationIntent: The validated intent.
+    Raises:
+        ValueError: If the response is not a valid intent object.
+    """
+    text = response.strip()
+    fenced = re.fullmatch(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        return LocationIntent.model_validate_json(text)
+    except ValidationError as e:
+        raise ValueError(f"invalid intent: {e}") from e
+
+
+def intent_fields(
+    intent: LocationIntent, fields: Optional[List[str]]
+) -> Optional[List[str]]:
+    """
+    Adds the LocationDetails fields an intent filters on to a projection.
+    Args:
+        intent (LocationIntent): The parsed intent.
+        fields (Optional[List[str]]): The requested fields, or None for all.
+    Returns:
+        Optional[List[str]]: The fields to fetch, or None for all.
+    """
+    if fields is None:
+        return None
+    wanted = list(fields)
+    for name, field in INTENT_DETAIL_FIELDS.items():
+        if getattr(intent, name) not in (None, []) and field not in wanted:
+            wanted.append(field)
+    return wanted
+
+
+def intent_score(
+    details: Optional[LocationDetails], intent: LocationIntent
+) -> Optional[int]:
+    """
+    Scores place details against an intent's filters.
+    Args:
+        details (Optional[LocationDetails]): The place details, if fetched.
+        intent (LocationIntent): The parsed intent.
+    Returns:
+        Optional[int]: None if the place contradicts a filter, otherwise the
+        number of filters it is known to satisfy; unknown values count zero.
+        Types only add to the score, as Places types are often incomplete.
+    """
+    if details is None:
+        return 0
+    checks = []
+    if intent.max_price_level is not None and details.price_level is not None:
+        checks.append(details.price_level <= intent.max_price_level)
+    if intent.open_now is not None and details.opening_hours:
+        open_now = details.opening_hours.get("open_now")
+        if open_now is not None:
+            checks.append(open_now == intent.open_now)
+    for name in ("delivery", "dine_in"):
+        wanted, actual = getattr(intent, name), getattr(details, name)
+        if wanted is not None and actual is not None:
+            checks.append(actual == wanted)
+    if not all(checks):
+        return None
+    score = len(checks)
+    if any(place_type in details.types for place_type in intent.types):
+        score += 1
+    return score
+
+
+def rank_by_intent(
+    suggestions: List[LocationSuggestion], intent: LocationIntent
+) -> List[LocationSuggestion]:
+    """
+    Drops suggestions contradicting an intent and orders the rest by the
+    number of filters they satisfy, keeping the incoming order for ties.
+    """
+    scored = []
+    for suggestion in suggestions:
+        score = intent_score(suggestion.details, intent)
+        if score is not None:
+            scored.append((score, suggestion))
+    scored.sort(key=lambda item: -item[0])
+    return [suggestion for _, suggestion in scored]
+
+
+@dataclass
+class IntentStats:
+    """Counters describing intent parsing.
+
+    Attributes:
+        parsed: Inputs parsed, i.e. intent cache misses
+        cached: Inputs answered from the intent cache
+        fallbacks: Parses answered by keyword rules after an LLM failure
+    """
+
+    parsed: int = 0
+    cached: int = 0
+    fallbacks: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+class LocationIntentParser:
+    """Cached LLM parsing of shopping requests into LocationIntent.
+
+    Attributes:
+        llm: Provider asked for the intent, or None to use keyword rules only
+        prompt: Template with a ``{text}`` placeholder for the request
+        stats: Parsed, cached and fallback counters
+    """
+
+    def __init__(
+        self,
+        llm: Optional[BaseLLMProvider] = None,
+        max_size: int = 10_000,
+        ttl: float = 86_400.0,
+        prompt: str = INTENT_PROMPT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.llm = llm
+        self.prompt = prompt
+        self.stats = IntentStats()
+        self._cache: TTLCache[LocationIntent] = TTLCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self._flight: SingleFlight[LocationIntent] = SingleFlight()
+
+    async def parse(self, text: str) -> LocationIntent:
+        """
+        Parses a request, at most once per normalized input while cached.
+        Args:
+            text (str): The free-text request.
+        Returns:
+            LocationIntent: The parsed intent.
+        """
+        # Same normalization as the autocomplete result cache
+        key = " ".join(text.casefold().split())
+        intent = self._cache.get(key)
+        if intent is not None:
+            self.stats.cached += 1
+            return intent
+        return await self._flight.do(key, lambda: self._parse(key, text))
+
+    async def _parse(self, key: str, text: str) -> LocationIntent:
+        self.stats.parsed += 1
+        intent = None
+        if self.llm is not None:
+            try:
+                prompt = self.prompt.format(text=text)
+                if isinstance(self.llm, CachingLLMProvider):
+                    # Near-duplicate requests are matched on the request alone
+                    response = await self.llm.generate(prompt, semantic_key=text)
+                else:
+                    response = await self.llm.generate(prompt)
+                intent = parse_intent_json(response)
+            except Exception as e:
+                logger.info("Falling back to keyword intent for %r: %s", text, e)
+                self.stats.fallbacks += 1
+        if intent is None:
+            intent = parse_intent_rules(text)
+        self._cache.set(key, intent)
+        return intent
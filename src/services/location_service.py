@@ -12,11 +12,296 @@ Exceptions:
 
 """
 
-from typing import List
-import googlemaps
-from ..core.config import Settings
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from googlemaps import exceptions as maps_exceptions
+from ..core.config import get_settings
+from ..core.degraded import mark_degraded, track_degraded
 from ..core.exceptions import AppException
-from ..models.location import LocationSuggestion, LocationDetails
+from ..core.metrics import CACHE_LOOKUPS, STAGE_SECONDS, UPSTREAM_CALLS
+from ..models.location import (
+    LocationDetails,
+    LocationDetailsEvent,
+    LocationIntent,
+    LocationSuggestion,
+)
+from .cache import CacheTier, PlaceDetailsCache, TieredCache
+from .circuit_breaker import CircuitBreaker, CircuitOpen
+from .geo_index import GeoIndex
+from .location_intent import LocationIntentParser, intent_fields, rank_by_intent
+from .places_client import AsyncPlacesClient
+from .rate_limit import AdaptiveConcurrencyLimiter, RateLimited, UpstreamLimiter
+from .sessions import SessionRegistry, Superseded
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Extra budget charged for every upstream call made within
+# LocationService.charged_to, e.g. by the cache warm-up
+_extra_budget: ContextVar[Optional[UpstreamLimiter]] = ContextVar(
+    "extra_budget", default=None
+)
+
+PLACE_FIELDS = [
+    "formatted_address", "geometry", "name", "type",
+    "vicinity", "url", "website", "formatted_phone_number",
+    "international_phone_number", "rating", "user_ratings_total",
+    "price_level", "opening_hours", "wheelchair_accessible_entrance",
+    "delivery", "dine_in", "editorial_summary"
+]
+
+# Fields that change often enough to need a shorter cache lifetime
+VOLATILE_PLACE_FIELDS = frozenset({
+    "opening_hours", "rating", "user_ratings_total", "price_level",
+    "delivery", "dine_in"
+})
+
+# Places fields whose key in the details result differs from the field name
+PLACE_RESULT_KEYS = {"type": "types"}
+
+# Places fields backing each LocationDetails attribute
+DETAIL_FIELD_SOURCES = {
+    "latitude": "geometry",
+    "longitude": "geometry",
+    "types": "type",
+}
+
+# LocationDetails attributes that are always returned, and their Places fields
+REQUIRED_DETAIL_FIELDS = frozenset({
+    "latitude", "longitude", "formatted_address", "name"
+})
+REQUIRED_PLACE_FIELDS = ["geometry", "formatted_address", "name"]
+
+# Places fields billed as Contact and Atmosphere data, on top of a details call
+CONTACT_PLACE_FIELDS = frozenset({
+    "website", "formatted_phone_number", "international_phone_number",
+    "opening_hours"
+})
+ATMOSPHERE_PLACE_FIELDS = frozenset({
+    "rating", "user_ratings_total", "price_level", "delivery", "dine_in",
+    "editorial_summary"
+})
+
+DEFAULT_LANGUAGE = "en"
+DEFAULT_TYPES = ["geocode", "establishment"]
+
+# Search radius in meters around a location named in a search request
+INTENT_LOCATION_RADIUS = 2_000
+
+# Fixed suggestions served in test mode, built once and copied per request
+MOCK_SUGGESTIONS = (
+    LocationSuggestion(
+        place_id="mock_place_1",
+        description="Mock Location 1, Test City",
+        main_text="Mock Location 1",
+        secondary_text="Test City",
+        details=LocationDetails(
+            latitude=40.7128,
+            longitude=-74.0060,
+            formatted_address="Mock Location 1, Test City, Test Country",
+            types=["establishment", "point_of_interest"],
+            name="Mock Location 1",
+            vicinity="Test City",
+            url="https://maps.google.com/?q=mock1",
+            website="https://mock1.example.com",
+            formatted_phone_number="+1 555-0123",
+            international_phone_number="+1-555-0123",
+            rating=4.5,
+            user_ratings_total=100,
+            price_level=2,
+            opening_hours={
+                "open_now": True,
+                "weekday_text": ["Monday: 9:00 AM – 5:00 PM"]
+            },
+            wheelchair_accessible_entrance=True,
+            delivery=True,
+            dine_in=True,
+            editorial_summary="A mock location for testing"
+        )
+    ),
+    LocationSuggestion(
+        place_id="mock_place_2",
+        description="Mock Location 2, Test City",
+        main_text="Mock Location 2",
+        secondary_text="Test City",
+        details=LocationDetails(
+            latitude=51.5074,
+            longitude=-0.1278,
+            formatted_address="Mock Location 2, Test City, Test Country",
+            types=["establishment", "point_of_interest"],
+            name="Mock Location 2",
+            vicinity="Test City",
+            url="https://maps.google.com/?q=mock2",
+            website="https://mock2.example.com",
+            formatted_phone_number="+1 555-0124",
+            international_phone_number="+1-555-0124",
+            rating=4.8,
+            user_ratings_total=200,
+            price_level=3,
+            opening_hours={
+                "open_now": False,
+                "weekday_text": ["Monday: 10:00 AM – 6:00 PM"]
+            },
+            wheelchair_accessible_entrance=True,
+            delivery=False,
+            dine_in=True,
+            editorial_summary="Another mock location for testing"
+        )
+    ),
+)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a search query for cache lookups by case-folding it and
+    collapsing whitespace, so "Star  Bucks" and "star bucks" share an entry.
+    """
+    return " ".join(query.casefold().split())
+
+
+def suggestions_cache_key(
+    query: str,
+    language: str,
+    types: List[str],
+    near: Optional[Tuple[float, float]] = None,
+    radius: Optional[int] = None,
+) -> str:
+    """
+    Builds the result cache key for an autocomplete request.
+    Args:
+        query (str): The raw search query.
+        language (str): The requested result language.
+        types (List[str]): The requested place types.
+        near (Optional[Tuple[float, float]]): The (lat, lng) bias point, if any.
+            It is rounded to about a kilometer so nearby users share entries.
+        radius (Optional[int]): The bias radius in meters, if any.
+    Returns:
+        str: A key combining the normalized query, language, types and bias.
+    """
+    key = f"{language}|{','.join(sorted(types))}|{normalize_query(query)}"
+    if near is not None:
+        key = f"{key}|{near[0]:.2f},{near[1]:.2f},{radius or ''}"
+    return key
+
+
+def place_fields_for(fields: Optional[List[str]]) -> List[str]:
+    """
+    Maps a LocationDetails field projection onto the Places fields to request.
+    Args:
+        fields (Optional[List[str]]): LocationDetails attribute names, or None
+            for all fields.
+    Returns:
+        List[str]: Places fields in canonical order, always including the fields
+        required to build a LocationDetails.
+    """
+    if fields is None:
+        return list(PLACE_FIELDS)
+    wanted = set(REQUIRED_PLACE_FIELDS)
+    wanted.update(DETAIL_FIELD_SOURCES.get(field, field) for field in fields)
+    return [field for field in PLACE_FIELDS if field in wanted]
+
+
+def details_cost(fields: List[str]) -> float:
+    """
+    Weighs a details call against the upstream budget by the data it bills:
+    Basic data costs 1, and Contact and Atmosphere data add 0.2 and 0.3 like
+    their relative list prices.
+    Args:
+        fields (List[str]): The Places fields requested.
+    Returns:
+        float: The tokens the call consumes.
+    """
+    requested = set(fields)
+    cost = 1.0
+    if requested & CONTACT_PLACE_FIELDS:
+        cost += 0.2
+    if requested & ATMOSPHERE_PLACE_FIELDS:
+        cost += 0.3
+    return cost
+
+
+def is_upstream_overload(error: BaseException) -> bool:
+    """Whether a Places client error means the upstream is over quota or slow."""
+    if isinstance(error, maps_exceptions.ApiError):
+        return error.status == "OVER_QUERY_LIMIT"
+    return isinstance(error, maps_exceptions.Timeout)
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Whether a Places client error reflects upstream health, for the circuit
+    breaker. API errors about the request itself (NOT_FOUND, INVALID_REQUEST,
+    ...) and our own rate limiting do not.
+    """
+    if isinstance(error, RateLimited):
+        return False
+    if isinstance(error, maps_exceptions.ApiError):
+        return error.status in ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+    return True
+
+
+def build_details(place_details: Dict[str, Any]) -> LocationDetails:
+    """
+    Maps a Google Places details result onto a LocationDetails model.
+    Args:
+        place_details (Dict[str, Any]): The ``result`` payload of a place lookup.
+    Returns:
+        LocationDetails: The parsed place details.
+    """
+    return LocationDetails(
+        latitude=place_details["geometry"]["location"]["lat"],
+        longitude=place_details["geometry"]["location"]["lng"],
+        formatted_address=place_details["formatted_address"],
+        types=place_details.get("types") or [],
+        name=place_details["name"],
+        vicinity=place_details.get("vicinity"),
+        url=place_details.get("url"),
+        website=place_details.get("website"),
+        formatted_phone_number=place_details.get("formatted_phone_number"),
+        international_phone_number=place_details.get("international_phone_number"),
+        rating=place_details.get("rating"),
+        user_ratings_total=place_details.get("user_ratings_total"),
+        price_level=place_details.get("price_level"),
+        opening_hours=place_details.get("opening_hours"),
+        wheelchair_accessible_entrance=place_details.get(
+            "wheelchair_accessible_entrance"
+        ),
+        delivery=place_details.get("delivery"),
+        dine_in=place_details.get("dine_in"),
+        editorial_summary=(place_details.get("editorial_summary") or {}).get(
+            "overview"
+        ),
+    )
+
+
+def encode_suggestions(suggestions: List[LocationSuggestion]) -> List[Dict[str, Any]]:
+    """Converts suggestions to JSON-compatible data for persistent cache tiers."""
+    return [suggestion.model_dump() for suggestion in suggestions]
+
+
+def decode_suggestions(data: List[Dict[str, Any]]) -> List[LocationSuggestion]:
+    """Rebuilds suggestions stored by :func:`encode_suggestions`."""
+    return [LocationSuggestion.model_validate(item) for item in data]
 
 
 class LocationService:
@@ -26,160 +311,1019 @@ class LocationService:
     production mode, using the Google Places API to fetch real location suggestions.
     Attributes:
         test_mode (bool): A flag indicating whether the service is in test mode.
-        client (googlemaps.Client): The Google Maps client used to fetch location suggestions.
+        client (AsyncPlacesClient): The Places client used to fetch location suggestions.
+            Any object with googlemaps-compatible ``places_autocomplete`` and ``place``
+            methods works; blocking clients are run in worker threads.
+        blocking_workers (int): Threads running calls of a blocking client. A
+            thread cannot be interrupted, so a call that timed out keeps its
+            thread until the client returns, although its limiter slot is
+            already free; this pool bounds how many such calls run at once.
+        details_timeout (float): Seconds to wait for a single place details lookup.
+        result_cache (TieredCache): Optional cache of suggestions keyed on the
+            normalized query, language and types.
+        details_cache (PlaceDetailsCache): Optional cache of place details keyed by
+            place_id, with a shorter lifetime for volatile fields.
+        suggestions_flight (SingleFlight): Coalesces concurrent upstream lookups
+            for the same normalized query.
+        details_flight (SingleFlight): Coalesces concurrent details lookups for the
+            same place_id.
+        geo_index (GeoIndex): Coordinates of known places, used to rank
+            suggestions by distance and to answer nearby searches locally.
+        autocomplete_limiter (UpstreamLimiter): Rate and concurrency budget for
+            autocomplete calls.
+        details_limiter (UpstreamLimiter): Rate and concurrency budget for
+            details calls, weighted by :func:`details_cost`.
+        circuit_breaker (CircuitBreaker): Optional breaker shared by all upstream
+            calls; while open, calls fail fast and stale cache entries are served.
+        autocomplete_timeout (float): Optional seconds to wait for an
+            autocomplete call.
+        sessions (SessionRegistry): Tracks the latest request of each client
+            session so superseded keystrokes are cancelled.
+        intent_parser (LocationIntentParser): Turns free-text search requests
+            into Places queries and filters; keyword rules unless an LLM is set.
+        shared_details (CacheTier): Optional cache tier shared by all workers,
+            consulted when ``details_cache`` misses and updated after every
+            details fetch.
     Methods:
-        __init__(test_mode: bool = True):
-            Initializes the LocationService instance. If not in test mode, it attempts
-            to initialize the Google Maps client with the provided API key.
-        async get_location_suggestions(query: str) -> List[LocationSuggestion]:
+        __init__(test_mode: bool = True, client: Optional[Any] = None,
+                 details_concurrency: int = 10, details_timeout: float = 5.0,
+                 result_cache: Optional[TieredCache] = None,
+                 details_cache: Optional[PlaceDetailsCache] = None,
+                 batch_concurrency: int = 8,
+                 geo_index: Optional[GeoIndex] = None,
+                 autocomplete_limiter: Optional[UpstreamLimiter] = None,
+                 details_limiter: Optional[UpstreamLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 autocomplete_timeout: Optional[float] = None,
+                 sessions: Optional[SessionRegistry] = None,
+                 intent_parser: Optional[LocationIntentParser] = None,
+                 shared_details: Optional[CacheTier] = None,
+                 blocking_workers: int = 16):
+            Initializes the LocationService instance. If not in test mode and no client
+            is given, it attempts to initialize an AsyncPlacesClient with the provided
+            API key. ``details_concurrency`` caps how many place details lookups run
+            at once, ``batch_concurrency`` how many queries of a batch run at once.
+            Places are added to ``geo_index`` as their details are fetched.
+            Without limiters, autocomplete calls are unlimited and details calls
+            are capped at ``details_concurrency``, waiting for a free slot.
+            Cache entries past their TTL but within the caches' stale window are
+            served immediately and refreshed in the background. Upstream calls
+            no request waits for any more are cancelled.
+        async aclose():
+            Releases the connections held by the Places client and the threads
+            of a blocking client.
+        charged_to(limiter: UpstreamLimiter):
+            Context manager charging every upstream call made within it to
+            ``limiter`` as well, before the endpoint's own budget.
+        async get_location_suggestions(query: str, include_details: bool = True,
+                                       fields: Optional[List[str]] = None,
+                                       near: Optional[Tuple[float, float]] = None,
+                                       radius: Optional[int] = None,
+                                       session_token: Optional[str] = None
+                                       ) -> List[LocationSuggestion]:
             Fetches location suggestions based on the provided query string. If the service
             is in test mode, returns a list of mock location suggestions. Otherwise, it uses
-            the Google Places API to fetch real location suggestions.
+            the Google Places API to fetch real location suggestions, fetching place
+            details concurrently and returning partial results when some lookups fail.
+            A newer request with the same ``session_token`` supersedes this one.
                 AppException: If there is an error while fetching location suggestions from
                 the Google Places API.
+        async get_location_suggestions_batch(queries: List[str], ...):
+            Fetches suggestions for many queries, deduplicated and sharing one
+            concurrency budget, returning per-query results or errors.
+        async stream_location_suggestions(query: str,
+                                          fields: Optional[List[str]] = None):
+            Yields the bare suggestions first, then a LocationDetailsEvent per
+            suggestion as each details lookup completes.
+        async get_place_details(place_id: str, fields: Optional[List[str]] = None
+                                ) -> LocationDetails:
+            Fetches details for a single place.
+        async search_locations(text: str, near: Optional[Tuple[float, float]] = None,
+                               radius: Optional[int] = None,
+                               fields: Optional[List[str]] = None
+                               ) -> Tuple[LocationIntent, List[LocationSuggestion]]:
+            Parses a free-text shopping request into an intent, searches for it and
+            filters and ranks the places against the intent.
+        async get_nearby_places(lat: float, lng: float, radius: float,
+                                limit: int = 20, fields: Optional[List[str]] = None
+                                ) -> List[LocationSuggestion]:
+            Finds known places around a point from the geo index, nearest first.
     """
 
-    def __init__(self, test_mode: bool = True):
+    def __init__(
+        self,
+        test_mode: bool = True,
+        client: Optional[Any] = None,
+        details_concurrency: int = 10,
+        details_timeout: float = 5.0,
+        result_cache: Optional[TieredCache[List[LocationSuggestion]]] = None,
+        details_cache: Optional[PlaceDetailsCache] = None,
+        batch_concurrency: int = 8,
+        geo_index: Optional[GeoIndex] = None,
+        autocomplete_limiter: Optional[UpstreamLimiter] = None,
+        details_limiter: Optional[UpstreamLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        autocomplete_timeout: Optional[float] = None,
+        sessions: Optional[SessionRegistry] = None,
+        intent_parser: Optional[LocationIntentParser] = None,
+        shared_details: Optional[CacheTier] = None,
+        blocking_workers: int = 16,
+    ):
         self.test_mode = test_mode
-        self.client = None
-        if not test_mode:
+        self.batch_concurrency = batch_concurrency
+        self.result_cache = result_cache
+        self.details_cache = details_cache
+        self.suggestions_flight: SingleFlight[List[LocationSuggestion]] = SingleFlight(
+            cancel_abandoned=True
+        )
+        self.details_flight: SingleFlight[
+            Tuple[Optional[LocationDetails], Set[str]]
+        ] = SingleFlight(cancel_abandoned=True)
+        self.details_timeout = details_timeout
+        self.autocomplete_limiter = autocomplete_limiter or UpstreamLimiter(
+            "autocomplete",
+            concurrency=AdaptiveConcurrencyLimiter(
+                initial_limit=1_000, min_limit=1_000, max_limit=1_000
+            ),
+            max_wait=None,
+        )
+        self.details_limiter = details_limiter or UpstreamLimiter(
+            "details",
+            concurrency=AdaptiveConcurrencyLimiter(
+                initial_limit=details_concurrency,
+                min_limit=details_concurrency,
+                max_limit=details_concurrency,
+            ),
+            max_wait=None,
+        )
+        self.circuit_breaker = circuit_breaker
+        self.autocomplete_timeout = autocomplete_timeout
+        self.sessions = sessions or SessionRegistry()
+        self.intent_parser = intent_parser or LocationIntentParser()
+        self.shared_details = shared_details
+        self.blocking_workers = blocking_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._refreshes: Set["asyncio.Task[Any]"] = set()
+        self.geo_index = geo_index if geo_index is not None else GeoIndex()
+        if test_mode:
+            for suggestion in self._mock_suggestions():
+                self.geo_index.add(
+                    suggestion.place_id,
+                    suggestion.details.latitude,
+                    suggestion.details.longitude,
+                )
+        self.client = client
+        if not test_mode and client is None:
             try:
-                self.client = googlemaps.Client(key=Settings().google_maps_api_key)
+                self.client = AsyncPlacesClient(key=get_settings().google_maps_api_key)
             except Exception as e:
                 raise AppException(
                     code="config_error",
                     message=f"Failed to initialize Google Maps client: {str(e)}",
                 ) from e
 
-    async def get_location_suggestions(self, query: str) -> List[LocationSuggestion]:
+    @staticmethod
+    @contextmanager
+    def charged_to(limiter: UpstreamLimiter) -> Iterator[None]:
+        """
+        Charges every upstream call made within the block, including calls of
+        lookups it starts that others join, to ``limiter`` as well, one token
+        per call, before the endpoint's own budget.
+        Args:
+            limiter (UpstreamLimiter): The extra budget, e.g. the warm-up's.
+        """
+        token = _extra_budget.set(limiter)
+        try:
+            yield
+        finally:
+            _extra_budget.reset(token)
+
+    async def aclose(self) -> None:
+        """
+        Cancels background refreshes and releases the pooled connections held by
+        the Places client and the caches, if any. Blocking calls still running
+        are left to finish; queued ones are dropped.
+        """
+        for task in list(self._refreshes):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if hasattr(self.client, "aclose"):
+            await self.client.aclose()
+        if self.result_cache is not None:
+            self.result_cache.close()
+        if self.shared_details is not None:
+            self.shared_details.close()
+
+    async def get_location_suggestions(
+        self,
+        query: str,
+        include_details: bool = True,
+        fields: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None,
+        session_token: Optional[str] = None,
+    ) -> List[LocationSuggestion]:
         """
         Fetches location suggestions based on the provided query string.
         If the service is in test mode, returns a list of mock location suggestions.
-        Otherwise, it uses the Google Places API to fetch real location suggestions.
+        Otherwise, it serves cached predictions when possible and falls back to the
+        Google Places API to fetch real location suggestions. Requests carrying a
+        session token are cancelled, upstream work included, when a newer request
+        arrives on the same session.
         Args:
             query (str): The search query string for location suggestions.
+            include_details (bool): Whether to enrich suggestions with place details.
+                Skipping details costs a single upstream call per query.
+            fields (Optional[List[str]]): LocationDetails fields to fetch; defaults
+                to all. Required fields (coordinates, address, name) are always
+                fetched.
+            near (Optional[Tuple[float, float]]): A (lat, lng) point to bias the
+                search towards. Suggestions with known coordinates are ranked by
+                distance from it, nearest first, and carry ``distance_meters``.
+            radius (Optional[int]): The bias radius in meters around ``near``.
+            session_token (Optional[str]): The client's autocomplete session, also
+                sent to Google as the Places session token.
         Returns:
             List[LocationSuggestion]: A list of location suggestions.
         Raises:
-            AppException: If there is an error while fetching location suggestions from the Google Places API.
+            AppException: If there is an error while fetching location suggestions from the Google Places API,
+                or with code ``request_superseded`` if a newer request on the
+                session replaced this one.
         """
+        if session_token is None:
+            return await self._suggest(query, include_details, fields, near, radius)
+        try:
+            return await self.sessions.run(
+                session_token,
+                lambda: self._suggest(
+                    query, include_details, fields, near, radius, session_token
+                ),
+            )
+        except Superseded as e:
+            raise AppException(
+                code="request_superseded",
+                message="Superseded by a newer request on the same session",
+                details={"query": query},
+            ) from e
 
+    async def _suggest(
+        self,
+        query: str,
+        include_details: bool,
+        fields: Optional[List[str]],
+        near: Optional[Tuple[float, float]],
+        radius: Optional[int],
+        session_token: Optional[str] = None,
+    ) -> List[LocationSuggestion]:
+        """
+        Builds location suggestions, see :meth:`get_location_suggestions`.
+        """
         if self.test_mode:
-            return [
-                LocationSuggestion(
-                    place_id="mock_place_1",
-                    description="Mock Location 1, Test City",
-                    main_text="Mock Location 1",
-                    secondary_text="Test City",
-                    details=LocationDetails(
-                        latitude=40.7128,
-                        longitude=-74.0060,
-                        formatted_address="Mock Location 1, Test City, Test Country",
-                        types=["establishment", "point_of_interest"],
-                        name="Mock Location 1",
-                        vicinity="Test City",
-                        url="https://maps.google.com/?q=mock1",
-                        website="https://mock1.example.com",
-                        formatted_phone_number="+1 555-0123",
-                        international_phone_number="+1-555-0123",
-                        rating=4.5,
-                        user_ratings_total=100,
-                        price_level=2,
-                        opening_hours={
-                            "open_now": True,
-                            "weekday_text": ["Monday: 9:00 AM – 5:00 PM"]
-                        },
-                        wheelchair_accessible_entrance=True,
-                        delivery=True,
-                        dine_in=True,
-                        editorial_summary="A mock location for testing"
-                    )
-                ),
-                LocationSuggestion(
-                    place_id="mock_place_2",
-                    description="Mock Location 2, Test City",
-                    main_text="Mock Location 2",
-                    secondary_text="Test City",
-                    details=LocationDetails(
-                        latitude=51.5074,
-                        longitude=-0.1278,
-                        formatted_address="Mock Location 2, Test City, Test Country",
-                        types=["establishment", "point_of_interest"],
-                        name="Mock Location 2",
-                        vicinity="Test City",
-                        url="https://maps.google.com/?q=mock2",
-                        website="https://mock2.example.com",
-                        formatted_phone_number="+1 555-0124",
-                        international_phone_number="+1-555-0124",
-                        rating=4.8,
-                        user_ratings_total=200,
-                        price_level=3,
-                        opening_hours={
-                            "open_now": False,
-                            "weekday_text": ["Monday: 10:00 AM – 6:00 PM"]
-                        },
-                        wheelchair_accessible_entrance=True,
-                        delivery=False,
-                        dine_in=True,
-                        editorial_summary="Another mock location for testing"
-                    )
+            return self._rank_by_distance(
+                self._mock_suggestions(include_details, fields), near
+            )
+
+        predictions = await self._get_predictions(query, near, radius, session_token)
+        if not include_details:
+            return self._rank_by_distance(
+                [prediction.model_copy() for prediction in predictions], near
+            )
+
+        place_fields = place_fields_for(fields)
+        details = await asyncio.gather(
+            *(
+                self._get_details(prediction.place_id, place_fields)
+                for prediction in predictions
+            )
+        )
+        return self._rank_by_distance(
+            [
+                prediction.model_copy(update={"details": place_details})
+                for prediction, place_details in zip(predictions, details)
+            ],
+            near,
+        )
+
+    async def get_location_suggestions_batch(
+        self,
+        queries: List[str],
+        include_details: bool = True,
+        fields: Optional[List[str]] = None,
+    ) -> List[Union[List[LocationSuggestion], AppException]]:
+        """
+        Fetches location suggestions for many queries at once. Queries are
+        deduplicated by their normalized form and run under a shared concurrency
+        budget of ``batch_concurrency``; predictions and details go through the same
+        caches and coalescing as single requests, so places shared between queries
+        are fetched once.
+        Args:
+            queries (List[str]): The search query strings.
+            include_details (bool): Whether to enrich suggestions with place details.
+            fields (Optional[List[str]]): LocationDetails fields to fetch; defaults
+                to all.
+        Returns:
+            List[Union[List[LocationSuggestion], AppException]]: One entry per input
+            query, in order: its suggestions, or the AppException it failed with;
+            unexpected errors are reported as ``internal_error``.
+        """
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        unique: Dict[str, str] = {}
+        for query in queries:
+            unique.setdefault(normalize_query(query), query)
+
+        async def run(query: str) -> List[LocationSuggestion]:
+            async with semaphore:
+                return await self.get_location_suggestions(
+                    query, include_details=include_details, fields=fields
                 )
+
+        outcomes = await asyncio.gather(
+            *(run(query) for query in unique.values()), return_exceptions=True
+        )
+        results = dict(zip(unique, outcomes))
+        for key, outcome in results.items():
+            if isinstance(outcome, AppException):
+                continue
+            if isinstance(outcome, Exception):
+                # One broken query must not fail the rest of the batch
+                logger.error("Batch query %r failed", unique[key], exc_info=outcome)
+                results[key] = AppException(code="internal_error", message=str(outcome))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+        return [results[normalize_query(query)] for query in queries]
+
+    async def stream_location_suggestions(
+        self,
+        query: str,
+        fields: Optional[List[str]] = None,
+        near: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None,
+    ) -> AsyncIterator[Union[List[LocationSuggestion], LocationDetailsEvent]]:
+        """
+        Streams location suggestions as they become available. The bare
+        predictions are yielded first, followed by one LocationDetailsEvent per
+        suggestion in the order its details lookup completes. Pending lookups are
+        cancelled if the consumer stops iterating, e.g. on client disconnect.
+        Args:
+            query (str): The search query string for location suggestions.
+            fields (Optional[List[str]]): LocationDetails fields to fetch; defaults
+                to all.
+            near (Optional[Tuple[float, float]]): A (lat, lng) point to bias the
+                search towards; suggestions already in the geo index are ranked
+                by distance from it.
+            radius (Optional[int]): The bias radius in meters around ``near``.
+        Yields:
+            List[LocationSuggestion]: Suggestions without details, first.
+            LocationDetailsEvent: Details for one suggestion, as each completes.
+        Raises:
+            AppException: If there is an error while fetching location suggestions from the Google Places API.
+        """
+        if self.test_mode:
+            suggestions = self._rank_by_distance(
+                self._mock_suggestions(True, fields), near
+            )
+            yield [
+                suggestion.model_copy(update={"details": None})
+                for suggestion in suggestions
             ]
+            for suggestion in suggestions:
+                yield LocationDetailsEvent(
+                    place_id=suggestion.place_id, details=suggestion.details
+                )
+            return
+
+        predictions = self._rank_by_distance(
+            [
+                prediction.model_copy()
+                for prediction in await self._get_predictions(query, near, radius)
+            ],
+            near,
+        )
+        yield predictions
 
+        place_fields = place_fields_for(fields)
+        pending = {
+            asyncio.ensure_future(
+                self._get_details(prediction.place_id, place_fields)
+            ): prediction.place_id
+            for prediction in predictions
+        }
         try:
-            results = self.client.places_autocomplete(
-                input_text=query, types=["geocode", "establishment"], language="en"
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    place_id = pending.pop(task)
+                    yield LocationDetailsEvent(place_id=place_id, details=task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_place_details(
+        self, place_id: str, fields: Optional[List[str]] = None
+    ) -> LocationDetails:
+        """
+        Fetches details for a single place, e.g. once the user picks a suggestion.
+        Args:
+            place_id (str): The Google Maps place identifier.
+            fields (Optional[List[str]]): LocationDetails fields to fetch; defaults
+                to all.
+        Returns:
+            LocationDetails: The place details.
+        Raises:
+            AppException: If the place details could not be fetched.
+        """
+        if self.test_mode:
+            for suggestion in self._mock_suggestions(True, fields):
+                if suggestion.place_id == place_id:
+                    return suggestion.details
+            details = None
+        else:
+            details = await self._get_details(place_id, place_fields_for(fields))
+        if details is None:
+            raise AppException(
+                code="place_details_error",
+                message=f"Failed to fetch details for place {place_id}",
+                details={"place_id": place_id},
             )
+        return details
 
-            suggestions = []
-            for result in results:
-                suggestion = LocationSuggestion(
-                    place_id=result["place_id"],
-                    description=result["description"],
-                    main_text=result["structured_formatting"]["main_text"],
-                    secondary_text=result["structured_formatting"].get("secondary_text"),
-                )
-                
-                try:
-                    place_details = self.client.place(
-                        result["place_id"],
-                        fields=[
-                            "formatted_address", "geometry", "name", "type",
-                            "vicinity", "url", "website", "formatted_phone_number",
-                            "international_phone_number", "rating", "user_ratings_total",
-                            "price_level", "opening_hours", "wheelchair_accessible_entrance",
-                            "delivery", "dine_in", "editorial_summary"
-                        ]
-                    )["result"]
-                    
-                    suggestion.details = LocationDetails(
-                        latitude=place_details["geometry"]["location"]["lat"],
-                        longitude=place_details["geometry"]["location"]["lng"],
-                        formatted_address=place_details["formatted_address"],
-                        types=place_details.get("types", []),
-                        name=place_details["name"],
-                        vicinity=place_details.get("vicinity"),
-                        url=place_details.get("url"),
-                        website=place_details.get("website"),
-                        formatted_phone_number=place_details.get("formatted_phone_number"),
-                        international_phone_number=place_details.get("international_phone_number"),
-                        rating=place_details.get("rating"),
-                        user_ratings_total=place_details.get("user_ratings_total"),
-                        price_level=place_details.get("price_level"),
-                        opening_hours=place_details.get("opening_hours"),
-                        wheelchair_accessible_entrance=place_details.get("wheelchair_accessible_entrance"),
-                        delivery=place_details.get("delivery"),
-                        dine_in=place_details.get("dine_in"),
-                        editorial_summary=place_details.get("editorial_summary", {}).get("overview")
-                    )
-                except Exception as e:
-                    print(f"Failed to fetch details for place {result['place_id']}: {str(e)}")
-                
-                suggestions.append(suggestion)
-            
+    async def search_locations(
+        self,
+        text: str,
+        near: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[LocationIntent, List[LocationSuggestion]]:
+        """
+        Searches for places matching a free-text shopping request such as
+        "cheap vegan takeaway near Kings Cross open now". The request is parsed
+        into a LocationIntent (cached per normalized input), the intent's query is
+        searched around ``near`` or the location it names, and the places are
+        filtered and ranked against the intent's filters.
+        Args:
+            text (str): The free-text request.
+            near (Optional[Tuple[float, float]]): A (lat, lng) point to search
+                around; overrides a location named in the request.
+            radius (Optional[int]): The search radius in meters.
+            fields (Optional[List[str]]): LocationDetails fields to fetch; defaults
+                to all. Fields the intent filters on are always fetched.
+        Returns:
+            Tuple[LocationIntent, List[LocationSuggestion]]: The parsed intent and
+            the matching places, best matches first.
+        Raises:
+            AppException: If there is an error while fetching location suggestions from the Google Places API.
+        """
+        intent = await self.intent_parser.parse(text)
+        if near is None and intent.location:
+            near = await self._locate(intent.location)
+            if near is not None and radius is None:
+                radius = INTENT_LOCATION_RADIUS
+        suggestions = await self.get_location_suggestions(
+            intent.query,
+            fields=intent_fields(intent, fields),
+            near=near,
+            radius=radius,
+        )
+        return intent, rank_by_intent(suggestions, intent)
+
+    async def _locate(self, name: str) -> Optional[Tuple[float, float]]:
+        """
+        Resolves a place name to coordinates through the first autocomplete
+        prediction, using the same caches as suggestions.
+        """
+        if self.test_mode:
+            return None
+        try:
+            predictions = await self._get_predictions(name)
+        except AppException as e:
+            logger.info("Could not locate %r: %s", name, e.message)
+            return None
+        if not predictions:
+            return None
+        details = await self._get_details(
+            predictions[0].place_id, REQUIRED_PLACE_FIELDS
+        )
+        if details is None:
+            return None
+        return details.latitude, details.longitude
+
+    async def get_nearby_places(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+        limit: int = 20,
+        fields: Optional[List[str]] = None,
+    ) -> List[LocationSuggestion]:
+        """
+        Finds known places around a point, nearest first. The search runs against
+        the local geo index, which holds the gazetteer and every place whose
+        details were fetched, so it costs no autocomplete call; details come from
+        the details cache when fresh.
+        Args:
+            lat (float): Latitude of the search center.
+            lng (float): Longitude of the search center.
+            radius (float): Search radius in meters.
+            limit (int): Maximum number of places returned.
+            fields (Optional[List[str]]): LocationDetails fields to fetch; defaults
+                to all.
+        Returns:
+            List[LocationSuggestion]: Places with details and ``distance_meters``;
+            places whose details cannot be fetched are left out.
+        """
+        matches = self.geo_index.nearby(lat, lng, radius, limit=limit)
+        if self.test_mode:
+            mocks = {
+                suggestion.place_id: suggestion
+                for suggestion in self._mock_suggestions(True, fields)
+            }
+            return [
+                mocks[place_id].model_copy(update={"distance_meters": distance})
+                for place_id, distance in matches
+                if place_id in mocks
+            ]
+
+        place_fields = place_fields_for(fields)
+        details = await asyncio.gather(
+            *(self._get_details(place_id, place_fields) for place_id, _ in matches)
+        )
+        return [
+            LocationSuggestion(
+                place_id=place_id,
+                description=place_details.formatted_address,
+                main_text=place_details.name,
+                secondary_text=place_details.vicinity,
+                details=place_details,
+                distance_meters=distance,
+            )
+            for (place_id, distance), place_details in zip(matches, details)
+            if place_details is not None
+        ]
+
+    def _rank_by_distance(
+        self,
+        suggestions: List[LocationSuggestion],
+        near: Optional[Tuple[float, float]],
+    ) -> List[LocationSuggestion]:
+        """
+        Sets ``distance_meters`` on suggestions the geo index knows and orders
+        them nearest first. Suggestions without known coordinates keep their
+        relative order after the ranked ones.
+        """
+        if near is None or not suggestions:
             return suggestions
+        distances = self.geo_index.distances(
+            near[0], near[1], [suggestion.place_id for suggestion in suggestions]
+        )
+        for suggestion, distance in zip(suggestions, distances):
+            suggestion.distance_meters = distance
+        return sorted(
+            suggestions,
+            key=lambda suggestion: (
+                suggestion.distance_meters is None,
+                suggestion.distance_meters or 0.0,
+            ),
+        )
+
+    async def _get_predictions(
+        self,
+        query: str,
+        near: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None,
+        session_token: Optional[str] = None,
+    ) -> List[LocationSuggestion]:
+        """
+        Returns autocomplete predictions without details, from the result cache
+        when possible. A stale entry is returned at once and refreshed in the
+        background. Concurrent misses for the same key share one upstream call,
+        made with the session token of the request that started it.
+        """
+        key = suggestions_cache_key(
+            query, DEFAULT_LANGUAGE, DEFAULT_TYPES, near, radius
+        )
+
+        def load() -> Awaitable[List[LocationSuggestion]]:
+            return self._load_predictions(query, key, near, radius, session_token)
+
+        if self.result_cache is not None:
+            with STAGE_SECONDS.time(stage="suggestions_cache"):
+                cached = await self.result_cache.get(key)
+                stale = None if cached is not None else self.result_cache.get_stale(key)
+            if cached is not None:
+                CACHE_LOOKUPS.inc(cache="suggestions", result="hit")
+                return cached
+            if stale is not None:
+                CACHE_LOOKUPS.inc(cache="suggestions", result="stale")
+                mark_degraded("stale_suggestions")
+                self._refresh(self.suggestions_flight, key, load)
+                return stale
+            CACHE_LOOKUPS.inc(cache="suggestions", result="miss")
+
+        return await self.suggestions_flight.do(key, load)
+
+    async def _load_predictions(
+        self,
+        query: str,
+        key: str,
+        near: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None,
+        session_token: Optional[str] = None,
+    ) -> List[LocationSuggestion]:
+        """
+        Fetches predictions upstream and stores them in the result cache.
+        """
+        predictions = await self._fetch_predictions(query, near, radius, session_token)
+        if self.result_cache is not None:
+            await self.result_cache.set(key, predictions)
+        return predictions
+
+    async def _fetch_predictions(
+        self,
+        query: str,
+        near: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None,
+        session_token: Optional[str] = None,
+    ) -> List[LocationSuggestion]:
+        """
+        Fetches autocomplete predictions from the Places client.
+        Args:
+            query (str): The search query string for location suggestions.
+            near (Optional[Tuple[float, float]]): The (lat, lng) bias point, if any.
+            radius (Optional[int]): The bias radius in meters, if any.
+            session_token (Optional[str]): The Places session token, if any.
+        Returns:
+            List[LocationSuggestion]: Location suggestions without details.
+        Raises:
+            AppException: If the autocomplete request fails, times out, does not
+                fit the rate budget in time or the circuit is open.
+        """
+        bias: Dict[str, Any] = {}
+        if near is not None:
+            bias["location"] = near
+            if radius is not None:
+                bias["radius"] = radius
+        if session_token is not None:
+            bias["session_token"] = session_token
+        try:
+            results = await self._call_upstream(
+                "autocomplete",
+                self.autocomplete_limiter,
+                lambda: asyncio.wait_for(
+                    self._call_client(
+                        self.client.places_autocomplete,
+                        input_text=query,
+                        types=DEFAULT_TYPES,
+                        language=DEFAULT_LANGUAGE,
+                        **bias,
+                    ),
+                    timeout=self.autocomplete_timeout,
+                ),
+            )
+        except CircuitOpen as e:
+            raise AppException(
+                code="upstream_unavailable",
+                message="Location search is temporarily unavailable",
+            ) from e
+        except RateLimited as e:
+            raise AppException(
+                code="over_query_limit",
+                message="Location search is busy, please retry shortly",
+            ) from e
         except Exception as e:
             raise AppException(
                 code="google_maps_error",
                 message=f"Failed to fetch location suggestions: {str(e)}",
             ) from e
+
+        return [
+            LocationSuggestion(
+                place_id=result["place_id"],
+                description=result["description"],
+                main_text=result["structured_formatting"]["main_text"],
+                secondary_text=result["structured_formatting"].get("secondary_text"),
+            )
+            for result in results
+        ]
+
+    async def _get_details(
+        self, place_id: str, place_fields: List[str]
+    ) -> Optional[LocationDetails]:
+        """
+        Fetches place details; concurrent lookups for the same place and fields
+        share one upstream call, and all of them are marked degraded if the
+        details it returned are.
+        """
+        details, degraded = await self.details_flight.do(
+            (place_id, tuple(place_fields)),
+            lambda: self._load_details(place_id, place_fields),
+        )
+        mark_degraded(*degraded)
+        return details
+
+    async def _load_details(
+        self, place_id: str, place_fields: List[str], allow_stale: bool = True
+    ) -> Tuple[Optional[LocationDetails], Set[str]]:
+        """
+        Fetches place details along with the reasons they are degraded, which
+        are returned so callers that joined the lookup can record them too.
+        """
+        with track_degraded() as degraded:
+            details = await self._fetch_details(place_id, place_fields, allow_stale)
+        return details, degraded
+
+    @staticmethod
+    def _mock_suggestions(
+        include_details: bool = True, fields: Optional[List[str]] = None
+    ) -> List[LocationSuggestion]:
+        """
+        Returns copies of the fixed mock suggestions served in test mode.
+        Args:
+            include_details (bool): Whether to keep the mock details.
+            fields (Optional[List[str]]): LocationDetails fields to keep; other
+                optional fields are cleared.
+        Returns:
+            List[LocationSuggestion]: Two mock location suggestions.
+        """
+        if not include_details:
+            return [
+                suggestion.model_copy(update={"details": None})
+                for suggestion in MOCK_SUGGESTIONS
+            ]
+        if fields is None:
+            return [suggestion.model_copy() for suggestion in MOCK_SUGGESTIONS]
+        kept = set(fields) | REQUIRED_DETAIL_FIELDS
+        return [
+            suggestion.model_copy(
+                update={
+                    "details": LocationDetails(
+                        **suggestion.details.model_dump(include=kept)
+                    )
+                }
+            )
+            for suggestion in MOCK_SUGGESTIONS
+        ]
+
+    async def _fetch_details(
+        self, place_id: str, place_fields: List[str], allow_stale: bool = True
+    ) -> Optional[LocationDetails]:
+        """
+        Fetches details for a single place without blocking the event loop.
+        Fresh fields are served from the details cache and only missing or stale
+        fields are requested upstream, after checking the cache shared with other
+        workers, if any. If every missing field is still within
+        the cache's stale window, the stale values are served at once and
+        refreshed in the background. Fetched values only enter the cache once
+        they pass validation. Failures are logged and swallowed so the suggestion
+        is still returned, with cached or stale details if any.
+        Args:
+            place_id (str): The Google Maps place identifier.
+            place_fields (List[str]): The Places fields to return.
+            allow_stale (bool): Whether stale values may be served instead of
+                waiting for the upstream; False for the background refresh.
+        Returns:
+            Optional[LocationDetails]: The place details, or None if the lookup
+            failed or timed out and nothing usable was cached.
+        """
+        stale: Dict[str, Any] = {}
+        if self.details_cache is not None:
+            with STAGE_SECONDS.time(stage="details_cache"):
+                values, missing = self.details_cache.get(place_id, place_fields)
+            if missing and await self._load_shared_details(place_id, missing):
+                values, missing = self.details_cache.get(place_id, place_fields)
+            if missing:
+                stale = self.details_cache.get_stale(place_id, missing)
+            if not missing:
+                result = "hit"
+            elif len(stale) == len(missing):
+                result = "stale"
+            else:
+                result = "miss"
+            CACHE_LOOKUPS.inc(cache="details", result=result)
+        else:
+            values, missing = {}, list(place_fields)
+
+        fetched = None
+        if missing and allow_stale and len(stale) == len(missing):
+            self._refresh(
+                self.details_flight,
+                ("refresh", place_id, tuple(place_fields)),
+                lambda: self._load_details(place_id, place_fields, allow_stale=False),
+            )
+            mark_degraded("stale_details")
+            values.update(stale)
+        elif missing:
+            fetched = await self._fetch_place_fields(place_id, missing)
+            if fetched is None:
+                mark_degraded("details_unavailable")
+                values.update(stale)
+                if not values:
+                    return None
+            else:
+                values.update(fetched)
+
+        try:
+            with STAGE_SECONDS.time(stage="build_details"):
+                details = build_details(
+                    {
+                        PLACE_RESULT_KEYS.get(field, field): value
+                        for field, value in values.items()
+                    }
+                )
+        except Exception as e:
+            logger.warning("Incomplete details for place %s: %s", place_id, e)
+            return None
+        if fetched is not None and self.details_cache is not None:
+            self.details_cache.set(place_id, fetched)
+            await self._share_details(place_id)
+        self.geo_index.add(place_id, details.latitude, details.longitude)
+        return details
+
+    async def _load_shared_details(self, place_id: str, missing: List[str]) -> bool:
+        """
+        Copies the details another worker stored in the shared cache into the
+        details cache, keeping their fetch times.
+        Args:
+            place_id (str): The Google Maps place identifier.
+            missing (List[str]): Fields the details cache could not serve; only
+                their field groups are loaded.
+        Returns:
+            bool: Whether the shared cache held the place.
+        """
+        if self.shared_details is None:
+            return False
+        with STAGE_SECONDS.time(stage="shared_details_cache"):
+            shared = await self.shared_details.get(f"details|{place_id}")
+        CACHE_LOOKUPS.inc(
+            cache="shared_details", result="miss" if shared is None else "hit"
+        )
+        if shared is None:
+            return False
+        now = time.time()
+        self.details_cache.load(
+            place_id,
+            {
+                "values": shared["values"],
+                "stable_age": now - shared["stable_at"],
+                "volatile_age": now - shared["volatile_at"],
+            },
+            missing,
+        )
+        return True
+
+    async def _share_details(self, place_id: str) -> None:
+        """
+        Stores the cached details of a place in the shared cache, with the wall
+        clock fetch times of both field groups so other workers age them alike.
+        Args:
+            place_id (str): The Google Maps place identifier.
+        """
+        if self.shared_details is None:
+            return
+        exported = self.details_cache.export(place_id)
+        if exported is None:
+            return
+        now = time.time()
+        await self.shared_details.set(
+            f"details|{place_id}",
+            {
+                "values": exported["values"],
+                "stable_at": now - exported["stable_age"],
+                "volatile_at": now - exported["volatile_age"],
+            },
+            ttl=self.details_cache.ttl + self.details_cache.stale_ttl,
+        )
+
+    async def _fetch_place_fields(
+        self, place_id: str, fields: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Requests the given Places fields for a place. The lookup runs within the
+        details budget and is cut off after ``details_timeout`` seconds; when the
+        budget is exhausted or the circuit is open it is skipped, so callers fall
+        back to cached or no details.
+        Args:
+            place_id (str): The Google Maps place identifier.
+            fields (List[str]): The Places fields to request.
+        Returns:
+            Optional[Dict[str, Any]]: The field values keyed by Places field name,
+            None for fields the place does not have, or None if the lookup failed.
+        """
+        try:
+            response = await self._call_upstream(
+                "details",
+                self.details_limiter,
+                lambda: asyncio.wait_for(
+                    self._call_client(self.client.place, place_id, fields=fields),
+                    timeout=self.details_timeout,
+                ),
+                cost=details_cost(fields),
+            )
+        except RateLimited:
+            logger.info("Details budget exhausted, skipping place %s", place_id)
+            return None
+        except CircuitOpen:
+            logger.info("Circuit open, skipping details for place %s", place_id)
+            return None
+        except asyncio.TimeoutError:
+            logger.warning("Timed out fetching details for place %s", place_id)
+            return None
+        except Exception as e:
+            logger.warning("Failed to fetch details for place %s: %s", place_id, e)
+            return None
+        result = response["result"]
+        return {
+            field: result.get(PLACE_RESULT_KEYS.get(field, field)) for field in fields
+        }
+
+    async def _call_upstream(
+        self,
+        endpoint: str,
+        limiter: UpstreamLimiter,
+        fn: Callable[[], Awaitable[Any]],
+        cost: float = 1.0,
+    ) -> Any:
+        """
+        Runs an upstream call within its rate budget and, if configured, behind
+        the circuit breaker, which rejects it without spending budget while open.
+        Every call is counted by endpoint and outcome, and the latency of calls
+        that were not rejected is recorded as the ``endpoint`` stage. Within
+        :meth:`charged_to`, the call first waits for the extra budget.
+        """
+        extra = _extra_budget.get()
+
+        def limited() -> Awaitable[Any]:
+            def run() -> Awaitable[Any]:
+                return limiter.run(fn, cost=cost, is_overload=is_upstream_overload)
+
+            if extra is None:
+                return run()
+            return extra.run(run, is_overload=is_upstream_overload)
+
+        started = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            if self.circuit_breaker is None:
+                result = await limited()
+            else:
+                result = await self.circuit_breaker.call(
+                    limited, is_failure=is_upstream_failure
+                )
+            outcome = "ok"
+            return result
+        except CircuitOpen:
+            outcome = "circuit_open"
+            raise
+        except RateLimited:
+            outcome = "throttled"
+            raise
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            UPSTREAM_CALLS.inc(endpoint=endpoint, outcome=outcome)
+            if outcome not in ("circuit_open", "throttled"):
+                STAGE_SECONDS.observe(time.perf_counter() - started, stage=endpoint)
+
+    def _refresh(
+        self,
+        flight: SingleFlight[Any],
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """
+        Refreshes a stale cache entry in the background. Refreshes of the same
+        key are coalesced and failures are logged, keeping the stale entry.
+        """
+        task = asyncio.ensure_future(flight.do(key, fn))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: "asyncio.Task[Any]") -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.info("Background refresh failed: %s", task.exception())
+
+    async def _call_client(self, method: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Calls a Places client method without blocking the event loop.
+        Coroutine methods (AsyncPlacesClient) are awaited directly; blocking
+        methods (googlemaps.Client) run on one of ``blocking_workers`` threads.
+        A call that times out keeps its thread until the client returns, so the
+        pool, not the limiters, bounds the blocking calls in flight; calls still
+        queued for a thread when their caller gives up are never started.
+        """
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.blocking_workers, thread_name_prefix="places"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
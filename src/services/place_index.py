@@ -0,0 +1,523 @@
+"""Memory-mapped on-disk place index for ShopAI location search.
+
+This module provides a compact, read-only binary format for large place
+corpora (gazetteer files or exported place details) and a reader that opens it
+with ``mmap``. Every uvicorn worker maps the same file, so the data lives once
+in the OS page cache instead of once per process as Python objects. Nothing is
+decoded at open time; search works directly on the mapped arrays and only the
+top-k hits are decoded into places.
+
+File layout (little-endian, sections 8-byte aligned):
+
+- header: magic, version, counts, maximum popularity, grid cell size and
+  section offsets
+- coordinates: ``float64`` latitudes followed by ``float64`` longitudes
+- string table: ``uint64`` offsets followed by the UTF-8 blob of all interned
+  strings (place ids, names, addresses, tokens, metadata JSON)
+- records: one fixed-width struct per place pointing into the string table
+- id index: ``uint32`` record numbers sorted by place_id
+- prefix index: ``uint32`` (token, record, is_name) triples sorted by token and
+  descending popularity
+- grid: ``int64`` latitude/longitude cell keys in ascending order followed by
+  the ``uint32`` record numbers in the same order, so the places of a row of
+  cells are one contiguous slice
+
+Example:
+    >>> from src.services.gazetteer import load_places
+    >>> from src.services.place_index import PlaceIndex, build_place_index
+    >>> build_place_index(load_places("stores.csv"), "stores.idx")
+    >>> index = PlaceIndex.open("stores.idx")
+    >>> index.search("starb")
+"""
+import argparse
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from googlemaps import exceptions
+
+from .gazetteer import GazetteerPlace, load_places, tokenize
+from .geo_index import EARTH_RADIUS_M, haversine_m
+
+MAGIC = b"SHOPIDX\x00"
+VERSION = 2
+NO_STRING = 0xFFFFFFFF
+# Grid cell edge in degrees, the GeoIndex default (roughly 5 km)
+CELL_SIZE = 0.05
+
+# magic, version, places, strings, keys, max popularity, cell size, then section
+# offsets: coordinates, string offsets, string blob, records, id index, prefix
+# index, grid keys, grid records
+_HEADER = struct.Struct("<8sIIIIdd8Q")
+# place_id, name, address, secondary text, types, metadata, popularity
+_RECORD = struct.Struct("<6If")
+
+
+def build_place_index(
+    places: Iterable[GazetteerPlace], path: str, cell_size: float = CELL_SIZE
+) -> int:
+    """Write places to a binary index file.
+
+    The file is written next to ``path`` and atomically moved into place, so
+    workers that still map the previous version keep a consistent view.
+
+    Args:
+        places: Places to index; later duplicates of a place_id are ignored
+        path: Destination file path
+        cell_size: Grid cell edge in degrees for nearby search
+
+    Returns:
+        int: Number of indexed places
+    """
+    unique: Dict[str, GazetteerPlace] = {}
+    for place in places:
+        unique.setdefault(place.place_id, place)
+    ordered = list(unique.values())
+
+    strings: Dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    records = bytearray()
+    keys: List[Tuple[str, float, int, int]] = []
+    popularity = []
+    for number, place in enumerate(ordered):
+        score = math.log1p(place.metadata.get("user_ratings_total") or 0)
+        popularity.append(score)
+        records += _RECORD.pack(
+            intern(place.place_id),
+            intern(place.name),
+            intern(place.formatted_address),
+            intern(place.secondary_text),
+            intern("|".join(place.types)),
+            intern(json.dumps(place.metadata, separators=(",", ":"))),
+            score,
+        )
+        name_tokens = set(tokenize(place.name))
+        address_tokens = set(tokenize(place.formatted_address)) - name_tokens
+        keys.extend((token, -score, number, 1) for token in name_tokens)
+        keys.extend((token, -score, number, 0) for token in address_tokens)
+    keys.sort()
+
+    key_words = array("I")
+    for token, _, number, is_name in keys:
+        key_words.extend((intern(token), number, is_name))
+    id_order = array(
+        "I", sorted(range(len(ordered)), key=lambda number: ordered[number].place_id)
+    )
+
+    blob = bytearray()
+    string_offsets = array("Q", [0])
+    for value in strings:
+        blob += value.encode("utf-8")
+        string_offsets.append(len(blob))
+
+    coordinates = array("d", [place.latitude for place in ordered])
+    coordinates.extend(place.longitude for place in ordered)
+    grid_keys = _cell_keys(
+        np.array([place.latitude for place in ordered], dtype=np.float64),
+        np.array([place.longitude for place in ordered], dtype=np.float64),
+        cell_size,
+    )
+    grid_order = np.argsort(grid_keys, kind="stable")
+
+    sections = [
+        coordinates.tobytes(),
+        string_offsets.tobytes(),
+        bytes(blob),
+        bytes(records),
+        id_order.tobytes(),
+        key_words.tobytes(),
+        grid_keys[grid_order].tobytes(),
+        grid_order.astype(np.uint32).tobytes(),
+    ]
+    offsets = []
+    position = _align(_HEADER.size)
+    for section in sections:
+        offsets.append(position)
+        position = _align(position + len(section))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(ordered),
+                len(strings),
+                len(keys),
+                max(popularity, default=0.0),
+                cell_size,
+                *offsets,
+            )
+        )
+        for offset, section in zip(offsets, sections):
+            handle.write(b"\x00" * (offset - handle.tell()))
+            handle.write(section)
+    os.replace(tmp_path, path)
+    return len(ordered)
+
+
+class PlaceIndex:
+    """Read-only, memory-mapped view of a file written by :func:`build_place_index`.
+
+    Search uses the same token rules as Gazetteer (every query token must prefix
+    a name or address token, ranked by match quality, a name-prefix bonus and
+    popularity) but without fuzzy matching. Like Gazetteer, it implements the
+    googlemaps-compatible ``places_autocomplete`` and ``place`` methods so it can
+    back LocationService directly.
+
+    Attributes:
+        path: Path of the mapped index file
+        limit: Default number of predictions returned
+        max_candidates: Maximum index entries scanned per query token
+    """
+
+    def __init__(self, path: str, limit: int = 5, max_candidates: int = 10_000):
+        self.path = path
+        self.limit = limit
+        self.max_candidates = max_candidates
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self._count,
+            string_count,
+            key_count,
+            max_popularity,
+            self._cell_size,
+            coordinates_at,
+            string_offsets_at,
+            blob_at,
+            records_at,
+            ids_at,
+            keys_at,
+            grid_keys_at,
+            grid_records_at,
+        ) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {VERSION} place index")
+        self._view = view = memoryview(self._mmap)
+        count = self._count
+        self.latitudes = view[coordinates_at:coordinates_at + 8 * count].cast("d")
+        self.longitudes = view[
+            coordinates_at + 8 * count:coordinates_at + 16 * count
+        ].cast("d")
+        self._string_offsets = view[
+            string_offsets_at:string_offsets_at + 8 * (string_count + 1)
+        ].cast("Q")
+        self._blob_at = blob_at
+        self._records_at = records_at
+        self._ids = view[ids_at:ids_at + 4 * count].cast("I")
+        self._keys = view[keys_at:keys_at + 12 * key_count].cast("I")
+        self._grid_keys = view[grid_keys_at:grid_keys_at + 8 * count].cast("q")
+        self._grid_records = view[
+            grid_records_at:grid_records_at + 4 * count
+        ].cast("I")
+        self._key_tokens = _KeyTokens(self)
+        self._max_popularity = max_popularity or 1.0
+
+    @classmethod
+    def open(cls, path: str, **kwargs: Any) -> "PlaceIndex":
+        """Map an index file; see the constructor for options."""
+        return cls(path, **kwargs)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Release the memory views and unmap the file."""
+        for view in (
+            self.latitudes,
+            self.longitudes,
+            self._string_offsets,
+            self._ids,
+            self._keys,
+            self._grid_keys,
+            self._grid_records,
+            self._view,
+        ):
+            view.release()
+        self._mmap.close()
+
+    async def aclose(self) -> None:
+        """Async alias of :meth:`close` for service shutdown."""
+        self.close()
+
+    def get(self, place_id: str) -> Optional[GazetteerPlace]:
+        """Return the place with ``place_id``, decoded from the index, if known."""
+        number = self._number(place_id)
+        return None if number is None else self._decode_place(number)
+
+    def distances(
+        self, lat: float, lng: float, place_ids: Sequence[str]
+    ) -> List[Optional[float]]:
+        """Distances in meters from a point to each place; None if not indexed."""
+        numbers = [self._number(place_id) for place_id in place_ids]
+        known = [number for number in numbers if number is not None]
+        if not known:
+            return [None] * len(numbers)
+        lats, lngs = self._coordinate_arrays()
+        found = iter(haversine_m(lat, lng, lats[known], lngs[known]).tolist())
+        return [None if number is None else next(found) for number in numbers]
+
+    def nearby(
+        self, lat: float, lng: float, radius: float, limit: int = 20
+    ) -> List[Tuple[str, float]]:
+        """Find indexed places within ``radius`` meters, nearest first.
+
+        Binary searches the mapped grid for the cells overlapping the search
+        circle, so only places in those cells are scored, and only the
+        ``limit`` nearest place ids are decoded; nothing is copied into the
+        process.
+
+        Args:
+            lat: Search center latitude
+            lng: Search center longitude
+            radius: Search radius in meters
+            limit: Maximum number of places returned
+
+        Returns:
+            List of (place_id, distance in meters) pairs
+        """
+        candidates = self._candidate_numbers(lat, lng, radius)
+        if not candidates.size:
+            return []
+        lats, lngs = self._coordinate_arrays()
+        distances = haversine_m(lat, lng, lats[candidates], lngs[candidates])
+        inside = np.flatnonzero(distances <= radius)
+        if inside.size > limit:
+            inside = inside[np.argpartition(distances[inside], limit)[:limit]]
+        inside = inside[np.argsort(distances[inside], kind="stable")]
+        return [
+            (self._string(self._record(int(candidates[i]))[0]), float(distances[i]))
+            for i in inside.tolist()
+        ]
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[float, GazetteerPlace]]:
+        """Find the best matching places for a partial query.
+
+        Args:
+            query: Text the user has typed so far
+            limit: Number of results, defaults to ``self.limit``
+
+        Returns:
+            List of (score, place) pairs, best first; only these are decoded
+        """
+        limit = limit or self.limit
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        per_token = []
+        for token in tokens:
+            matches = self._match_token(token)
+            if not matches:
+                return []
+            per_token.append(matches)
+
+        per_token.sort(key=len)
+        candidates = set(per_token[0])
+        for matches in per_token[1:]:
+            candidates.intersection_update(matches)
+
+        scored = []
+        for number in candidates:
+            score = sum(matches[number] for matches in per_token) / len(tokens)
+            score += 0.1 * self._popularity(number) / self._max_popularity
+            scored.append((score, number))
+        # Only the strongest candidates pay for decoding their name
+        shortlist = heapq.nlargest(limit * 4, scored)
+        normalized = " ".join(tokens)
+        reranked = []
+        for score, number in shortlist:
+            name = " ".join(tokenize(self._string(self._record(number)[1])))
+            if name.startswith(normalized):
+                score += 0.5
+            reranked.append((score, number))
+        best = heapq.nlargest(limit, reranked)
+        return [(score, self._decode_place(number)) for score, number in best]
+
+    async def places_autocomplete(
+        self, input_text: str, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Return Google-shaped predictions for ``input_text``."""
+        return [place.to_prediction() for _, place in self.search(input_text)]
+
+    async def place(
+        self, place_id: str, fields: Optional[Sequence[str]] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Return a Google-shaped details response for ``place_id``.
+
+        Raises:
+            googlemaps.exceptions.ApiError: With status NOT_FOUND for unknown places
+        """
+        place = self.get(place_id)
+        if place is None:
+            raise exceptions.ApiError("NOT_FOUND", f"Unknown place {place_id}")
+        return {"status": "OK", "result": place.to_result()}
+
+    def _match_token(self, token: str) -> Dict[int, float]:
+        start = bisect.bisect_left(self._key_tokens, token)
+        exact_end = bisect.bisect_right(self._key_tokens, token, lo=start)
+        end = bisect.bisect_left(self._key_tokens, token + "\uffff", lo=exact_end)
+        end = min(end, start + self.max_candidates)
+        keys = self._keys
+        matches: Dict[int, float] = {}
+        for position in range(start, end):
+            number = keys[3 * position + 1]
+            quality = 1.0 if position < exact_end else 0.8
+            if not keys[3 * position + 2]:
+                quality *= 0.7
+            if matches.get(number, 0.0) < quality:
+                matches[number] = quality
+        return matches
+
+    def _number(self, place_id: str) -> Optional[int]:
+        ids = _IdView(self)
+        position = bisect.bisect_left(ids, place_id)
+        if position < len(ids) and ids[position] == place_id:
+            return self._ids[position]
+        return None
+
+    def _candidate_numbers(self, lat: float, lng: float, radius: float) -> np.ndarray:
+        cell_size = self._cell_size
+        around = _cells_around(cell_size)
+        dlat = math.degrees(radius / EARTH_RADIUS_M)
+        # Widest longitude span of the circle, at its poleward edge
+        edge = min(abs(lat) + dlat, 90.0)
+        cos_edge = max(math.cos(math.radians(edge)), 1e-6)
+        dlng = min(math.degrees(radius / (EARTH_RADIUS_M * cos_edge)), 180.0)
+        # Unwrapped longitude columns, split in two across the antimeridian
+        lng_lo = math.floor((lng - dlng + 180.0) / cell_size)
+        lng_hi = math.floor((lng + dlng + 180.0) / cell_size)
+        if lng_hi - lng_lo + 1 >= around:
+            columns = [(0, around - 1)]
+        else:
+            first = lng_lo % around
+            last = first + lng_hi - lng_lo
+            columns = [(first, min(last, around - 1))]
+            if last >= around:
+                columns.append((0, last - around))
+        rows = np.arange(
+            math.floor((lat - dlat) / cell_size),
+            math.floor((lat + dlat) / cell_size) + 1,
+            dtype=np.int64,
+        )
+        keys = np.frombuffer(self._grid_keys, dtype=np.int64)
+        starts = np.concatenate(
+            [np.searchsorted(keys, rows * around + first) for first, _ in columns]
+        )
+        ends = np.concatenate(
+            [
+                np.searchsorted(keys, rows * around + last, side="right")
+                for _, last in columns
+            ]
+        )
+        records = np.frombuffer(self._grid_records, dtype=np.uint32)
+        slices = [records[start:end] for start, end in zip(starts, ends) if end > start]
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.uint32)
+
+    def _coordinate_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Zero-copy views of the mapped arrays, dropped after each call so that
+        # close() can release the underlying memoryviews
+        return np.frombuffer(self.latitudes), np.frombuffer(self.longitudes)
+
+    def _record(self, number: int) -> Tuple[int, int, int, int, int, int, float]:
+        return _RECORD.unpack_from(self._mmap, self._records_at + number * _RECORD.size)
+
+    def _popularity(self, number: int) -> float:
+        return self._record(number)[6]
+
+    def _string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        start = self._blob_at + self._string_offsets[string_id]
+        end = self._blob_at + self._string_offsets[string_id + 1]
+        return self._mmap[start:end].decode("utf-8")
+
+    def _decode_place(self, number: int) -> GazetteerPlace:
+        place_id, name, address, secondary, types, metadata, _ = self._record(number)
+        type_string = self._string(types)
+        return GazetteerPlace(
+            place_id=self._string(place_id),
+            name=self._string(name),
+            latitude=self.latitudes[number],
+            longitude=self.longitudes[number],
+            formatted_address=self._string(address),
+            secondary_text=self._string(secondary),
+            types=tuple(type_string.split("|")) if type_string else (),
+            metadata=json.loads(self._string(metadata)),
+        )
+
+
+class _KeyTokens(Sequence[str]):
+    """Sequence view of prefix index tokens, decoded lazily for bisection."""
+
+    def __init__(self, index: PlaceIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index._keys) // 3
+
+    def __getitem__(self, position: int) -> str:
+        return self._index._string(self._index._keys[3 * position])
+
+
+class _IdView(Sequence[str]):
+    """Sequence view of place ids in sorted order, decoded lazily for bisection."""
+
+    def __init__(self, index: PlaceIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, position: int) -> str:
+        number = self._index._ids[position]
+        return self._index._string(self._index._record(number)[0])
+
+
+def _cells_around(cell_size: float) -> int:
+    return int(round(360 / cell_size))
+
+
+def _cell_keys(lats: np.ndarray, lngs: np.ndarray, cell_size: float) -> np.ndarray:
+    # Row-major keys, so each row of cells is contiguous once sorted
+    around = _cells_around(cell_size)
+    rows = np.floor(lats / cell_size).astype(np.int64)
+    columns = np.floor((lngs + 180.0) / cell_size).astype(np.int64) % around
+    return rows * around + columns
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build an index file from a gazetteer CSV or JSONL file."""
+    parser = argparse.ArgumentParser(description="Build a memory-mapped place index")
+    parser.add_argument("source", help="CSV or JSONL place file")
+    parser.add_argument("output", help="Index file to write")
+    args = parser.parse_args(argv)
+    count = build_place_index(load_places(args.source), args.output)
+    print(f"Indexed {count} places into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Async Google Places client for ShopAI.
+
+This module provides a non-blocking Google Places client built on
+``httpx.AsyncClient``. It exposes the subset of the ``googlemaps.Client`` API
+used by LocationService (``places_autocomplete`` and ``place``), returns the same
+payload shapes and raises the same ``googlemaps.exceptions`` errors, so it can be
+used as a drop-in replacement inside async route handlers.
+
+Connections are pooled and kept alive across requests, HTTP/2 can be enabled,
+and retriable failures are retried with the same exponential backoff and jitter
+that ``googlemaps`` uses.
+
+Example:
+    >>> from src.services.places_client import AsyncPlacesClient
+    >>> async with AsyncPlacesClient(key="api-key") as client:
+    ...     predictions = await client.places_autocomplete("Times Square")
+"""
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from googlemaps import exceptions
+
+BASE_URL = "https://maps.googleapis.com"
+AUTOCOMPLETE_PATH = "/maps/api/place/autocomplete/json"
+DETAILS_PATH = "/maps/api/place/details/json"
+
+RETRIABLE_STATUSES = {500, 503, 504}
+
+
+class AsyncPlacesClient:
+    """Pooled, non-blocking client for the Google Places web service.
+
+    Attributes:
+        key: Google Maps API key sent with every request
+        retry_timeout: Total seconds to keep retrying a retriable request
+        max_retries: Maximum retry attempts, or None to rely on retry_timeout
+        retry_over_query_limit: Whether OVER_QUERY_LIMIT responses are retried
+
+    Example:
+        >>> client = AsyncPlacesClient(key="api-key", http2=True)
+        >>> details = await client.place("ChIJ...", fields=["name", "geometry"])
+        >>> await client.aclose()
+    """
+
+    def __init__(
+        self,
+        key: str,
+        base_url: str = BASE_URL,
+        timeout: float = 10.0,
+        retry_timeout: float = 60.0,
+        max_retries: Optional[int] = None,
+        retry_over_query_limit: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if not key:
+            raise ValueError("Must provide API key for the Google Places client")
+        self.key = key
+        self.retry_timeout = retry_timeout
+        self.max_retries = max_retries
+        self.retry_over_query_limit = retry_over_query_limit
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncPlacesClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._http.aclose()
+
+    async def places_autocomplete(
+        self,
+        input_text: str,
+        session_token: Optional[str] = None,
+        location: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None,
+        language: Optional[str] = None,
+        types: Optional[Sequence[str]] = None,
+        strict_bounds: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Fetch autocomplete predictions for a search string.
+
+        Args:
+            input_text: Text the user has typed so far
+            session_token: Places autocomplete session token for billing
+            location: Optional (lat, lng) bias point
+            radius: Bias radius in meters around ``location``
+            language: Language of the returned predictions
+            types: Place types to restrict predictions to
+            strict_bounds: Only return results inside the location/radius area
+
+        Returns:
+            List of prediction payloads, as returned by ``googlemaps``
+        """
+        params: Dict[str, Any] = {"input": input_text}
+        if session_token:
+            params["sessiontoken"] = session_token
+        if location:
+            params["location"] = f"{location[0]},{location[1]}"
+        if radius:
+            params["radius"] = radius
+        if language:
+            params["language"] = language
+        if types:
+            params["types"] = "|".join(types)
+        if strict_bounds:
+            params["strictbounds"] = "true"
+        body = await self._request(AUTOCOMPLETE_PATH, params)
+        return body.get("predictions", [])
+
+    async def place(
+        self,
+        place_id: str,
+        fields: Optional[Sequence[str]] = None,
+        session_token: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Fetch details for a single place.
+
+        Args:
+            place_id: Google Maps place identifier
+            fields: Places fields to return
+            session_token: Places autocomplete session token for billing
+            language: Language of the returned details
+
+        Returns:
+            Response body with the place under ``result``, as returned by
+            ``googlemaps``
+        """
+        params: Dict[str, Any] = {"placeid": place_id}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if session_token:
+            params["sessiontoken"] = session_token
+        if language:
+            params["language"] = language
+        return await self._request(DETAILS_PATH, params)
+
+    async def _request(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Perform a GET request, retrying retriable failures with backoff.
+
+        Raises:
+            googlemaps.exceptions.Timeout: If retries exceed ``retry_timeout``
+            googlemaps.exceptions.TransportError: On connection failures
+            googlemaps.exceptions.HTTPError: On non-retriable HTTP status codes
+            googlemaps.exceptions.ApiError: On non-OK API statuses
+        """
+        params = {**params, "key": self.key}
+        first_request_time = time.monotonic()
+        retry_counter = 0
+
+        while True:
+            if retry_counter > 0:
+                if self.max_retries is not None and retry_counter > self.max_retries:
+                    raise exceptions.Timeout()
+                # Same jittered exponential backoff as googlemaps.Client
+                delay = 0.5 * 1.5 ** (retry_counter - 1) * (random.random() + 0.5)
+                if time.monotonic() - first_request_time + delay > self.retry_timeout:
+                    raise exceptions.Timeout()
+                await asyncio.sleep(delay)
+            retry_counter += 1
+
+            try:
+                response = await self._http.get(path, params=params)
+            except httpx.TimeoutException as e:
+                raise exceptions.Timeout() from e
+            except httpx.HTTPError as e:
+                raise exceptions.TransportError(e) from e
+
+            if response.status_code in RETRIABLE_STATUSES:
+                continue
+            if response.status_code != 200:
+                raise exceptions.HTTPError(response.status_code)
+
+            body = response.json()
+            status = body.get("status")
+            if status in ("OK", "ZERO_RESULTS"):
+                return body
+            if status == "OVER_QUERY_LIMIT" and self.retry_over_query_limit:
+                continue
+            raise exceptions.ApiError(status, body.get("error_message"))
@@ -0,0 +1,294 @@
+"""Upstream admission control for ShopAI services.
+
+This module keeps calls to a quota-limited upstream such as the Google Places
+API inside their budget. A TokenBucket enforces the request rate, with a cost
+weight per call, and an AdaptiveConcurrencyLimiter caps calls in flight. The
+concurrency limit grows additively while latency stays near its baseline and
+shrinks multiplicatively (AIMD) when latency rises or the upstream reports
+overload. UpstreamLimiter combines the two for one upstream endpoint and
+raises RateLimited instead of queueing without bound, so callers can degrade
+to cached or partial results.
+
+Example:
+    >>> from src.services.rate_limit import RateLimited, UpstreamLimiter
+    >>> limiter = UpstreamLimiter("details", rate=100, burst=100)
+    >>> try:
+    ...     response = await limiter.run(lambda: client.place(place_id), cost=1.5)
+    ... except RateLimited:
+    ...     response = None  # serve cached details instead
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RateLimited(Exception):
+    """Raised when a call does not fit the upstream budget in time."""
+
+
+@dataclass
+class LimiterStats:
+    """Counters describing upstream admission.
+
+    Attributes:
+        admitted: Calls let through to the upstream
+        throttled: Calls rejected because the budget was exhausted
+        overloaded: Admitted calls that timed out or were rejected for quota
+    """
+
+    admitted: int = 0
+    throttled: int = 0
+    overloaded: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second.
+
+    Attributes:
+        rate: Tokens added per second
+        capacity: Maximum tokens held, i.e. the allowed burst
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = burst if burst is not None else rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        """Take ``cost`` tokens if available, without waiting."""
+        self._refill()
+        cost = min(cost, self.capacity)
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return True
+        return False
+
+    async def acquire(
+        self, cost: float = 1.0, timeout: Optional[float] = 0.0
+    ) -> bool:
+        """Take ``cost`` tokens, waiting up to ``timeout`` seconds for a refill
+        (None waits as long as it takes).
+
+        Returns:
+            bool: Whether the tokens were taken
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while not self.try_acquire(cost):
+            wait = (min(cost, self.capacity) - self._tokens) / self.rate
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+        return True
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the upstream reported its quota exceeded."""
+        self._refill()
+        self._tokens = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit driven by observed latency.
+
+    Each successful call whose latency stays within ``tolerance`` times the
+    baseline grows the limit by ``1 / limit``, i.e. by about one per window of
+    calls; a slower call or an overload multiplies it by ``backoff``. The
+    baseline is a slow moving average of latency. With ``min_limit`` equal to
+    ``max_limit`` the limiter behaves like a plain semaphore.
+
+    Attributes:
+        limit: Current concurrency limit
+        min_limit: Lower bound of the limit
+        max_limit: Upper bound of the limit
+        in_flight: Calls currently holding a slot
+        baseline: Smoothed latency in seconds, None until the first call
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+        smoothing: float = 0.05,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min <= initial <= max")
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take a slot, waiting up to ``timeout`` seconds (None waits forever).
+
+        Returns:
+            bool: Whether a slot was taken; release it with :meth:`release`
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        if timeout is not None and timeout <= 0:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except BaseException:
+            # Cancelled after a slot was handed over: give it back
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(
+        self, latency: Optional[float] = None, overloaded: bool = False
+    ) -> None:
+        """Return a slot and adapt the limit to the call's outcome.
+
+        Args:
+            latency: Duration of the call in seconds, if it completed
+            overloaded: Whether the upstream timed out or rejected the call
+        """
+        self.in_flight -= 1
+        if overloaded:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif latency is not None:
+            if self.baseline is None:
+                self.baseline = latency
+            if latency > self.tolerance * self.baseline:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.baseline += self.smoothing * (latency - self.baseline)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class UpstreamLimiter:
+    """Rate and concurrency budget for one upstream endpoint.
+
+    Attributes:
+        name: Endpoint name, for logs
+        bucket: Request rate budget, or None for no rate limit
+        concurrency: Adaptive limit on calls in flight
+        max_wait: Seconds a call may wait for budget before RateLimited is
+            raised; None waits as long as it takes
+        stats: Admitted, throttled and overloaded call counters
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        concurrency: Optional[AdaptiveConcurrencyLimiter] = None,
+        max_wait: Optional[float] = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst, clock=clock) if rate else None
+        self.concurrency = concurrency or AdaptiveConcurrencyLimiter()
+        self.max_wait = max_wait
+        self.stats = LimiterStats()
+        self._clock = clock
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        cost: float = 1.0,
+        is_overload: Callable[[BaseException], bool] = lambda e: False,
+    ) -> T:
+        """Run ``fn`` once it fits the rate and concurrency budget.
+
+        Args:
+            fn: Zero-argument coroutine factory performing the upstream call
+            cost: Tokens the call consumes, e.g. more for richer place details
+            is_overload: Tells whether an error means the upstream is overloaded
+                or over quota; timeouts always count
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            RateLimited: If the budget was not available within ``max_wait``
+        """
+        if self.bucket is not None and not await self.bucket.acquire(
+            cost, timeout=self.max_wait
+        ):
+            self.stats.throttled += 1
+            raise RateLimited(f"{self.name} rate budget exhausted")
+        if not await self.concurrency.acquire(self.max_wait):
+            self.stats.throttled += 1
+            raise RateLimited(f"{self.name} concurrency limit reached")
+        self.stats.admitted += 1
+        started = self._clock()
+        try:
+            result = await fn()
+        except BaseException as e:
+            overloaded = isinstance(e, asyncio.TimeoutError) or is_overload(e)
+            if overloaded:
+                self.stats.overloaded += 1
+                if self.bucket is not None and not isinstance(
+                    e, asyncio.TimeoutError
+                ):
+                    self.bucket.drain()
+            self.concurrency.release(overloaded=overloaded)
+            raise
+        self.concurrency.release(self._clock() - started)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limits and counters, e.g. for diagnostics."""
+        return {
+            **self.stats.as_dict(),
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "tokens": None if self.bucket is None else self.bucket.tokens,
+        }
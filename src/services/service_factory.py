@@ -1,7 +1,7 @@
 """Service factory for ShopAI dependency injection.
 
-This module provides factory functions for service instantiation,
-ensuring proper dependency injection and environment-based configuration.
+This module provides dependency functions that resolve services from the
+process-wide ServiceRegistry built during application startup.
 
 Example:
     >>> from fastapi import FastAPI, Depends
@@ -12,18 +12,53 @@ Example:
     ... ):
     ...     return await service.get_location_suggestions("query")
 """
-from typing import Annotated
-from fastapi import Depends
+from fastapi.requests import HTTPConnection
+from ..core.response_cache import ResponseCache
 from .location_service import LocationService
-from ..core.config import Settings, get_settings
+from .service_registry import ServiceRegistry
+from ..core.exceptions import AppException
 
-def get_location_service(settings: Annotated[Settings, Depends(get_settings)]) -> LocationService:
-    """Get configured LocationService instance.
+
+def get_service_registry(request: HTTPConnection) -> ServiceRegistry:
+    """Get the service registry attached to the running application.
+
+    Args:
+        request: Incoming request or WebSocket, used to reach ``app.state``
+
+    Returns:
+        ServiceRegistry: Registry created by the application lifespan
+
+    Raises:
+        AppException: If the application has not been started
+    """
+    services = getattr(request.app.state, "services", None)
+    if services is None:
+        raise AppException(
+            code="service_unavailable",
+            message="Services have not been initialized",
+        )
+    return services
+
+
+def get_location_service(request: HTTPConnection) -> LocationService:
+    """Get the shared LocationService instance.
     
     Args:
-        settings: Application settings from dependency injection
+        request: Incoming request, used to reach the service registry
         
     Returns:
-        LocationService: Service instance configured based on environment
+        LocationService: Process-wide service configured based on environment
+    """
+    return get_service_registry(request).location_service
+
+
+def get_response_cache(request: HTTPConnection) -> ResponseCache:
+    """Get the shared cache of encoded location responses.
+
+    Args:
+        request: Incoming request, used to reach the service registry
+
+    Returns:
+        ResponseCache: Process-wide response cache
     """
-    return LocationService(test_mode=settings.environment != "production")
+    return get_service_registry(request).response_cache
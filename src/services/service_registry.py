@@ -0,0 +1,406 @@
+"""Process-wide service registry for ShopAI.
+
+This module provides the ServiceRegistry, which owns long-lived service
+instances for the lifetime of the application. Services are built once at
+startup from settings, shared across requests through ``app.state`` and closed
+cleanly on shutdown.
+
+Example:
+    >>> from src.core.config import get_settings
+    >>> from src.services.service_registry import ServiceRegistry
+    >>> services = ServiceRegistry.from_settings(get_settings())
+    >>> suggestions = await services.location_service.get_location_suggestions("query")
+    >>> await services.aclose()
+"""
+from typing import Any, Optional, Tuple
+
+import httpx
+
+from ..core.config import Settings
+from ..core.exceptions import AppException
+from ..core.response_cache import ResponseCache
+from .base_llm_provider import BaseLLMProvider
+from .cache import (
+    CacheTier,
+    PlaceDetailsCache,
+    SQLiteCache,
+    TieredCache,
+    TTLCache,
+)
+from .circuit_breaker import CircuitBreaker
+from .geo_index import GeoIndex
+from .llm_cache import CachingLLMProvider, SemanticCache
+from .llm_runtime import LLMRuntime
+from .local_llm_provider import LocalLLMProvider
+from .location_intent import LocationIntentParser
+from .location_service import (
+    PLACE_FIELDS,
+    VOLATILE_PLACE_FIELDS,
+    LocationService,
+    decode_suggestions,
+    encode_suggestions,
+)
+from .places_client import AsyncPlacesClient
+from .rate_limit import AdaptiveConcurrencyLimiter, UpstreamLimiter
+from .sessions import SessionRegistry
+from .shared_cache import RedisCache, SharedMemoryCache
+from .synthetic_places import SyntheticPlaces
+from .warmup import CacheWarmer
+
+
+def _resolve_backend(settings: Settings) -> str:
+    """Resolve ``auto`` to Google in production and mock data otherwise."""
+    if settings.location_backend == "auto":
+        return "google" if settings.environment == "production" else "mock"
+    return settings.location_backend
+
+
+def build_places_client(
+    settings: Settings, transport: Optional[httpx.AsyncBaseTransport] = None
+) -> Optional[Any]:
+    """Build the Places backend selected by ``settings.location_backend``.
+
+    ``auto`` uses Google in production and mock data otherwise. The gazetteer
+    backend loads ``.idx`` files as a shared memory-mapped PlaceIndex and CSV or
+    JSONL files into an in-process Gazetteer. The synthetic backend generates
+    its seeded corpus here, once per process.
+
+    Args:
+        settings: Application settings
+        transport: HTTP transport for the Google client, e.g. one serving a
+            fake Places app in process; None uses the network
+
+    Returns:
+        The Places client, or None when LocationService should serve mock data
+
+    Raises:
+        AppException: If the gazetteer backend is selected without a valid file
+    """
+    backend = _resolve_backend(settings)
+    if backend == "gazetteer":
+        if not settings.gazetteer_path:
+            raise AppException(
+                code="config_error",
+                message="GAZETTEER_PATH is required for the gazetteer backend",
+            )
+        # Imported here so ``python -m src.services.place_index`` runs cleanly
+        from .gazetteer import Gazetteer
+        from .place_index import PlaceIndex
+
+        try:
+            if settings.gazetteer_path.endswith(".idx"):
+                return PlaceIndex.open(settings.gazetteer_path)
+            return Gazetteer.from_file(settings.gazetteer_path)
+        except (OSError, ValueError) as e:
+            raise AppException(
+                code="config_error",
+                message=f"Failed to load gazetteer: {str(e)}",
+            ) from e
+    if backend == "synthetic":
+        return SyntheticPlaces.generate(
+            count=settings.synthetic_place_count,
+            seed=settings.synthetic_seed,
+            limit=settings.synthetic_result_count,
+            latency=settings.synthetic_latency,
+            jitter=settings.synthetic_jitter,
+        )
+    if backend == "google":
+        return AsyncPlacesClient(
+            key=settings.google_maps_api_key,
+            base_url=settings.places_base_url,
+            timeout=settings.places_timeout,
+            retry_timeout=settings.places_retry_timeout,
+            max_connections=settings.places_max_connections,
+            max_keepalive_connections=settings.places_max_keepalive_connections,
+            http2=settings.places_http2,
+            # The upstream limiters back off instead of retrying into the quota
+            retry_over_query_limit=False,
+            transport=transport,
+        )
+    return None
+
+
+def build_upstream_limiters(
+    settings: Settings,
+) -> Tuple[Optional[UpstreamLimiter], Optional[UpstreamLimiter]]:
+    """Build the autocomplete and details budgets for the Google backend.
+
+    Local backends have no quota, so None is returned for them and
+    LocationService falls back to its fixed details concurrency.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        The autocomplete and details limiters, or (None, None)
+    """
+    if _resolve_backend(settings) != "google":
+        return None, None
+    autocomplete = UpstreamLimiter(
+        "autocomplete",
+        rate=settings.places_autocomplete_rate,
+        burst=settings.places_autocomplete_burst,
+        concurrency=AdaptiveConcurrencyLimiter(
+            initial_limit=settings.places_autocomplete_concurrency,
+            max_limit=settings.places_autocomplete_concurrency,
+        ),
+        max_wait=settings.places_rate_limit_wait,
+    )
+    details = UpstreamLimiter(
+        "details",
+        rate=settings.places_details_rate,
+        burst=settings.places_details_burst,
+        concurrency=AdaptiveConcurrencyLimiter(
+            initial_limit=settings.places_details_concurrency,
+            max_limit=settings.places_details_concurrency,
+        ),
+        max_wait=settings.places_rate_limit_wait,
+    )
+    return autocomplete, details
+
+
+def build_shared_cache(
+    settings: Settings,
+) -> Tuple[Optional[CacheTier], Optional[CacheTier]]:
+    """Build the cache tiers shared by all workers, if configured.
+
+    Suggestions and place details get separate tiers over the same backend so
+    each keeps its own TTL and hit counters.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        The suggestions and place details tiers, or (None, None)
+
+    Raises:
+        AppException: If the shm backend's file cannot be opened
+    """
+    backend = settings.shared_cache_backend
+    if backend == "redis":
+        return (
+            RedisCache.from_url(
+                settings.shared_cache_url,
+                ttl=settings.location_cache_ttl,
+                prefix="shopai:suggestions:",
+            ),
+            RedisCache.from_url(
+                settings.shared_cache_url,
+                ttl=settings.place_details_ttl,
+                prefix="shopai:details:",
+            ),
+        )
+    if backend == "shm":
+        try:
+            results = SharedMemoryCache(
+                f"{settings.shared_cache_path}-suggestions",
+                slots=settings.shared_cache_slots,
+                slot_size=settings.shared_cache_slot_size,
+                ttl=settings.location_cache_ttl,
+            )
+            details = SharedMemoryCache(
+                f"{settings.shared_cache_path}-details",
+                slots=settings.shared_cache_slots,
+                slot_size=settings.shared_cache_slot_size,
+                ttl=settings.place_details_ttl,
+            )
+        except (OSError, ValueError) as e:
+            raise AppException(
+                code="config_error",
+                message=f"Failed to open shared cache: {str(e)}",
+            ) from e
+        return results, details
+    return None, None
+
+
+def build_llm(settings: Settings) -> BaseLLMProvider:
+    """Build the LLM runtime with the configured batching, limits and caches.
+
+    The runtime wraps the deterministic LocalLLMProvider. Cache hits are
+    answered before a prompt joins a batch. Only built when ``intent_llm`` is
+    set, for the intent parser.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        BaseLLMProvider: Caching wrapper around the LLM runtime
+    """
+    runtime = LLMRuntime(
+        LocalLLMProvider(),
+        max_batch_size=settings.llm_max_batch_size,
+        batch_window=settings.llm_batch_window,
+        max_concurrency=settings.llm_max_concurrency,
+        timeout=settings.llm_timeout,
+    )
+    persistent = None
+    if settings.llm_cache_path:
+        persistent = SQLiteCache(settings.llm_cache_path, ttl=settings.llm_cache_ttl)
+    semantic = None
+    if settings.llm_semantic_cache_threshold is not None:
+        semantic = SemanticCache(
+            threshold=settings.llm_semantic_cache_threshold,
+            max_size=settings.llm_cache_size,
+            ttl=settings.llm_cache_ttl,
+        )
+    return CachingLLMProvider(
+        runtime,
+        TieredCache(
+            TTLCache(max_size=settings.llm_cache_size, ttl=settings.llm_cache_ttl),
+            persistent,
+        ),
+        semantic=semantic,
+    )
+
+
+class ServiceRegistry:
+    """Container for services shared across requests.
+
+    Tests can swap services by constructing a registry with their own instances
+    and assigning it to ``app.state.services``.
+
+    Attributes:
+        location_service: Shared LocationService instance
+        response_cache: Encoded responses of the location routes
+        llm: LLM runtime parsing search intents, if enabled
+        warmer: Optional cache warm-up run by :meth:`start`
+    """
+
+    def __init__(
+        self,
+        location_service: LocationService,
+        response_cache: Optional[ResponseCache] = None,
+        llm: Optional[BaseLLMProvider] = None,
+        warmer: Optional[CacheWarmer] = None,
+    ):
+        self.location_service = location_service
+        self.response_cache = response_cache or ResponseCache()
+        self.llm = llm
+        self.warmer = warmer
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        places_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> "ServiceRegistry":
+        """Build all services for the configured environment.
+
+        Args:
+            settings: Application settings
+            places_transport: HTTP transport for the Google Places client,
+                see :func:`build_places_client`
+
+        Returns:
+            ServiceRegistry: Registry holding freshly constructed services
+        """
+        client = build_places_client(settings, places_transport)
+        test_mode = client is None
+        persistent = None
+        if settings.location_cache_path:
+            persistent = SQLiteCache(
+                settings.location_cache_path,
+                ttl=settings.location_cache_persistent_ttl,
+            )
+        shared_results, shared_details = build_shared_cache(settings)
+        result_cache = TieredCache(
+            TTLCache(
+                max_size=settings.location_cache_size,
+                ttl=settings.location_cache_ttl,
+                stale_ttl=settings.location_cache_stale_ttl,
+            ),
+            persistent,
+            encode=encode_suggestions,
+            decode=decode_suggestions,
+            shared=shared_results,
+        )
+        geo_index = GeoIndex(
+            max_size=settings.geo_index_max_size,
+            # A mapped index answers nearby searches itself, without a copy
+            base=client if hasattr(client, "nearby") else None,
+        )
+        if hasattr(client, "coordinates"):
+            # In-process backends know every place up front
+            geo_index.add_many(*client.coordinates())
+        autocomplete_limiter, details_limiter = build_upstream_limiters(settings)
+        llm = build_llm(settings) if settings.intent_llm else None
+        circuit_breaker = None
+        if _resolve_backend(settings) == "google":
+            circuit_breaker = CircuitBreaker(
+                failure_threshold=settings.circuit_failure_threshold,
+                recovery_timeout=settings.circuit_recovery_timeout,
+                slow_call_threshold=settings.circuit_slow_call_threshold,
+            )
+        location_service = LocationService(
+            test_mode=test_mode,
+            client=client,
+            details_concurrency=settings.places_details_concurrency,
+            details_timeout=settings.places_details_timeout,
+            result_cache=result_cache,
+            details_cache=PlaceDetailsCache(
+                PLACE_FIELDS,
+                volatile_fields=VOLATILE_PLACE_FIELDS,
+                max_size=settings.place_details_cache_size,
+                ttl=settings.place_details_ttl,
+                volatile_ttl=settings.place_details_volatile_ttl,
+                stale_ttl=settings.place_details_stale_ttl,
+            ),
+            batch_concurrency=settings.location_batch_concurrency,
+            geo_index=geo_index,
+            autocomplete_limiter=autocomplete_limiter,
+            details_limiter=details_limiter,
+            circuit_breaker=circuit_breaker,
+            autocomplete_timeout=settings.places_autocomplete_timeout,
+            sessions=SessionRegistry(
+                debounce=settings.session_debounce,
+                max_sessions=settings.session_max_count,
+            ),
+            # Keyword rules alone unless LLM parsing is enabled
+            intent_parser=LocationIntentParser(
+                llm,
+                max_size=settings.intent_cache_size,
+                ttl=settings.intent_cache_ttl,
+            ),
+            shared_details=shared_details,
+        )
+        response_cache = ResponseCache(
+            max_size=settings.response_cache_size,
+            ttl=settings.response_cache_ttl,
+            gzip_min_size=settings.response_cache_gzip_min_size,
+            degraded_ttl=settings.response_cache_degraded_ttl,
+        )
+        warmer = None
+        if settings.warmup_path:
+            warmer = CacheWarmer(
+                location_service,
+                settings.warmup_path,
+                max_queries=settings.warmup_max_queries,
+                max_places=settings.warmup_max_places,
+                rate=settings.warmup_rate,
+                concurrency=settings.warmup_concurrency,
+                timeout=settings.warmup_timeout,
+            )
+        return cls(
+            location_service=location_service,
+            response_cache=response_cache,
+            llm=llm,
+            warmer=warmer,
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Whether startup jobs such as the cache warm-up have finished."""
+        return self.warmer is None or self.warmer.ready
+
+    def start(self) -> None:
+        """Start background jobs; the cache warm-up runs until it finishes."""
+        if self.warmer is not None:
+            self.warmer.start()
+
+    async def aclose(self) -> None:
+        """Release resources held by the registered services."""
+        if self.warmer is not None:
+            await self.warmer.cancel()
+        await self.location_service.aclose()
+        if self.llm is not None:
+            await self.llm.aclose()
@@ -0,0 +1,126 @@
+"""Keystroke session tracking for ShopAI autocomplete.
+
+This module provides SessionRegistry, which keeps at most one request in flight
+per client session. Autocomplete clients send a request per keystroke; when a
+newer request arrives on the same session token, the older one is cancelled,
+together with any upstream work only it was waiting for, and its caller gets
+Superseded. Requests arriving in quick succession are also debounced: a request
+that follows the previous one on its session within ``debounce`` seconds waits
+that long before starting, so a burst of keystrokes costs one upstream call.
+
+Example:
+    >>> from src.services.sessions import SessionRegistry, Superseded
+    >>> sessions = SessionRegistry(debounce=0.05)
+    >>> try:
+    ...     suggestions = await sessions.run(token, lambda: search("starb"))
+    ... except Superseded:
+    ...     suggestions = None  # a newer keystroke is being answered
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class Superseded(Exception):
+    """Raised when a newer request on the same session replaced this one."""
+
+
+@dataclass
+class SessionStats:
+    """Counters describing session requests.
+
+    Attributes:
+        started: Requests run through a session
+        superseded: Requests cancelled by a newer one on their session
+        debounced: Requests delayed because they followed another one closely
+    """
+
+    started: int = 0
+    superseded: int = 0
+    debounced: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class _Request:
+    task: "asyncio.Task[Any]"
+    arrived: float
+    superseded: bool = False
+
+
+class SessionRegistry:
+    """Latest-request-wins tracking of client sessions.
+
+    Attributes:
+        debounce: Seconds a request waits when it follows the previous request
+            of its session within that time; 0 disables debouncing
+        max_sessions: Sessions remembered at once; the least recently active
+            are forgotten first
+        stats: Started, superseded and debounced request counters
+    """
+
+    def __init__(
+        self,
+        debounce: float = 0.0,
+        max_sessions: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.debounce = debounce
+        self.max_sessions = max_sessions
+        self.stats = SessionStats()
+        self._clock = clock
+        self._requests: "OrderedDict[str, _Request]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    async def run(self, token: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` as the latest request of session ``token``.
+
+        Args:
+            token: Client session token
+            fn: Zero-argument coroutine factory doing the request's work
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            Superseded: If a newer request on the session cancelled this one
+        """
+        now = self._clock()
+        delay = 0.0
+        previous = self._requests.pop(token, None)
+        if previous is not None:
+            if now - previous.arrived < self.debounce:
+                delay = self.debounce
+                self.stats.debounced += 1
+            if not previous.task.done():
+                previous.superseded = True
+                previous.task.cancel()
+        request = _Request(asyncio.ensure_future(self._start(fn, delay)), now)
+        self._requests[token] = request
+        while len(self._requests) > self.max_sessions:
+            self._requests.popitem(last=False)
+        self.stats.started += 1
+        try:
+            return await request.task
+        except asyncio.CancelledError:
+            if request.superseded:
+                self.stats.superseded += 1
+                raise Superseded(
+                    f"superseded by a newer request on {token}"
+                ) from None
+            raise
+
+    @staticmethod
+    async def _start(fn: Callable[[], Awaitable[T]], delay: float) -> T:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await fn()
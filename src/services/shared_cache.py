@@ -0,0 +1,522 @@
+"""Cache tiers shared by all workers of a ShopAI deployment.
+
+With ``uvicorn --workers N`` every worker has its own in-process caches, so
+each one warms up separately and the hit rate is split N ways. The tiers in
+this module sit between the in-process TTLCache and the upstream (see
+``TieredCache``) and are seen by every worker:
+
+- SharedMemoryCache: a fixed-size open-addressing hash table in a memory-mapped
+  file, normally under ``/dev/shm``, for workers on the same host. Entries live
+  in fixed-width slots holding the key hash, a wall-clock expiry, the key and
+  the JSON value; a full probe window evicts the entry closest to expiry.
+  Readers take a shared ``flock``, writers an exclusive one.
+- RedisCache: a minimal asyncio client of the Redis protocol (RESP) for
+  workers on several hosts. Lookups and writes issued in the same event loop
+  tick are pipelined into one round trip, with all lookups in a single MGET.
+
+Both tiers store JSON-compatible values, expose ``get_many`` and ``set_many``
+for bulk access and treat failures as misses, so a shared cache outage only
+costs hit rate.
+
+Example:
+    >>> from src.services.shared_cache import RedisCache, SharedMemoryCache
+    >>> shared = SharedMemoryCache("/dev/shm/shopai-cache", ttl=300)
+    >>> await shared.set_many({"a": 1, "b": 2})
+    >>> await shared.get_many(["a", "b", "c"])
+    [1, 2, None]
+    >>> redis = RedisCache.from_url("redis://localhost:6379/0", ttl=300)
+"""
+import asyncio
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+import orjson
+
+from .cache import CacheStats
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SHOPAIC1"
+VERSION = 1
+
+# magic, version, slot count, slot size
+_HEADER = struct.Struct("<8sIII")
+# key hash (0 for an empty slot), expires at, key length, value length
+_SLOT = struct.Struct("<QdII")
+
+
+def _key_hash(key: bytes) -> int:
+    digest = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+    return digest or 1
+
+
+class SharedMemoryCache:
+    """Cache tier in a memory-mapped hash table shared by local processes.
+
+    The file is created and sized on first use; processes opening it later
+    must use the same geometry. Values that do not fit in a slot are not
+    cached.
+
+    Attributes:
+        path: Path of the backing file, e.g. under ``/dev/shm``
+        slots: Number of fixed-width slots in the table
+        slot_size: Bytes per slot, including a 24-byte slot header
+        ttl: Default time-to-live in seconds
+        max_probes: Slots examined per key before evicting
+        stats: Hit, miss, eviction and expiration counters of this process
+    """
+
+    def __init__(
+        self,
+        path: str,
+        slots: int = 16_384,
+        slot_size: int = 4_096,
+        ttl: float = 86_400.0,
+        max_probes: int = 8,
+    ):
+        if slots <= 0 or max_probes <= 0:
+            raise ValueError("slots and max_probes must be positive")
+        if slot_size <= _SLOT.size:
+            raise ValueError(f"slot_size must be larger than {_SLOT.size}")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.ttl = ttl
+        self.max_probes = min(max_probes, slots)
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        size = _HEADER.size + slots * slot_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size == 0:
+                    os.ftruncate(self._fd, size)
+                    os.pwrite(
+                        self._fd, _HEADER.pack(MAGIC, VERSION, slots, slot_size), 0
+                    )
+                header = os.pread(self._fd, _HEADER.size, 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            if len(header) < _HEADER.size or _HEADER.unpack(header) != (
+                MAGIC, VERSION, slots, slot_size,
+            ):
+                raise ValueError(
+                    f"{path} is not a shared cache with {slots} slots "
+                    f"of {slot_size} bytes"
+                )
+            self._mmap = mmap.mmap(self._fd, size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._closed = False
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the decoded value for ``key``, or None if missing or expired."""
+        return (await self.get_many([key]))[0]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable ``value`` under ``key``."""
+        await self.set_many({key: value}, ttl)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Look up several keys under one lock; missing keys yield None."""
+        now = time.time()
+        with self._locked(fcntl.LOCK_SH):
+            found = [self._read(key.encode(), now) for key in keys]
+        values = []
+        for payload in found:
+            if payload is None:
+                self.stats.misses += 1
+                values.append(None)
+            else:
+                self.stats.hits += 1
+                values.append(orjson.loads(payload))
+        return values
+
+    async def set_many(
+        self, items: Dict[str, Any], ttl: Optional[float] = None
+    ) -> None:
+        """Store several JSON-serializable values under one lock."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        encoded = [(key.encode(), orjson.dumps(value)) for key, value in items.items()]
+        with self._locked(fcntl.LOCK_EX):
+            for key, payload in encoded:
+                self._write(key, payload, expires_at)
+
+    def close(self) -> None:
+        """Unmap the table and close the backing file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._mmap.close()
+            os.close(self._fd)
+
+    def _locked(self, operation: int) -> "_FileLock":
+        return _FileLock(self._lock, self._fd, operation)
+
+    def _probe(self, key_hash: int) -> List[int]:
+        start = key_hash % self.slots
+        return [
+            _HEADER.size + (start + i) % self.slots * self.slot_size
+            for i in range(self.max_probes)
+        ]
+
+    def _read(self, key: bytes, now: float) -> Optional[bytes]:
+        key_hash = _key_hash(key)
+        for offset in self._probe(key_hash):
+            stored_hash, expires_at, key_length, value_length = _SLOT.unpack_from(
+                self._mmap, offset
+            )
+            start = offset + _SLOT.size
+            if stored_hash != key_hash or self._mmap[start:start + key_length] != key:
+                continue
+            if expires_at <= now:
+                self.stats.expirations += 1
+                return None
+            start += key_length
+            return self._mmap[start:start + value_length]
+        return None
+
+    def _write(self, key: bytes, payload: bytes, expires_at: float) -> None:
+        if _SLOT.size + len(key) + len(payload) > self.slot_size:
+            return
+        key_hash = _key_hash(key)
+        now = time.time()
+        target = None
+        soonest = None
+        for offset in self._probe(key_hash):
+            stored_hash, stored_expiry, key_length, _ = _SLOT.unpack_from(
+                self._mmap, offset
+            )
+            start = offset + _SLOT.size
+            if stored_hash == key_hash and self._mmap[start:start + key_length] == key:
+                target = offset
+                break
+            if target is None and (stored_hash == 0 or stored_expiry <= now):
+                target = offset
+            if soonest is None or stored_expiry < soonest[0]:
+                soonest = (stored_expiry, offset)
+        if target is None:
+            target = soonest[1]
+            self.stats.evictions += 1
+        start = target + _SLOT.size
+        self._mmap[start:start + len(key) + len(payload)] = key + payload
+        _SLOT.pack_into(
+            self._mmap, target, key_hash, expires_at, len(key), len(payload)
+        )
+
+
+class _FileLock:
+    """Holds a thread lock and an ``flock`` on a file for a ``with`` block."""
+
+    def __init__(self, lock: threading.Lock, fd: int, operation: int):
+        self._lock = lock
+        self._fd = fd
+        self._operation = operation
+
+    def __enter__(self) -> None:
+        self._lock.acquire()
+        fcntl.flock(self._fd, self._operation)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+def encode_command(*args: Union[str, bytes, int, float]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP reply; error replies are returned as RedisError.
+
+    Raises:
+        ConnectionError: If the connection closes or sends an invalid reply
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("connection closed by server")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        return RedisError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"invalid reply {line[:32]!r}")
+
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class RedisCache:
+    """Cache tier on a Redis-compatible server.
+
+    Values are stored as JSON under ``prefix + key`` with a millisecond expiry.
+    Concurrent ``get`` and ``set`` calls are collected until the event loop
+    has run every ready task, then sent as one pipeline: the writes first, then
+    a single MGET for all lookups. Connection and server errors are logged and
+    reported as misses.
+
+    Attributes:
+        host: Server host
+        port: Server port
+        db: Database number selected on connect
+        ttl: Default time-to-live in seconds
+        prefix: Namespace prepended to every key
+        max_connections: Idle connections kept for reuse
+        timeout: Seconds to wait for connecting or for a pipeline's replies
+        stats: Hit and miss counters
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        ttl: float = 86_400.0,
+        prefix: str = "shopai:",
+        max_connections: int = 4,
+        timeout: float = 1.0,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.ttl = ttl
+        self.prefix = prefix
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.stats = CacheStats()
+        self._password = password
+        self._idle: List[_Connection] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._gets: Dict[str, List["asyncio.Future[Optional[Any]]"]] = {}
+        self._sets: List[Tuple[str, Any, Optional[float], "asyncio.Future[None]"]] = []
+        self._flush_scheduled = False
+        self._flushes: "set[asyncio.Task[None]]" = set()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisCache":
+        """Build a cache from a ``redis://[:password@]host[:port][/db]`` URL.
+
+        Args:
+            url: Server URL
+            **kwargs: Other constructor arguments, e.g. ``ttl``
+
+        Returns:
+            RedisCache: The cache; no connection is opened until first use
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"unsupported cache URL: {url}")
+        path = parsed.path.strip("/")
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(path) if path else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            **kwargs,
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the decoded value for ``key``, or None if missing or unreachable."""
+        loop = self._bind_loop()
+        future = loop.create_future()
+        self._gets.setdefault(key, []).append(future)
+        self._schedule_flush(loop)
+        return await future
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable ``value`` under ``key``."""
+        loop = self._bind_loop()
+        future = loop.create_future()
+        self._sets.append((key, value, ttl, future))
+        self._schedule_flush(loop)
+        await future
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Look up several keys with one MGET; missing keys yield None."""
+        self._bind_loop()
+        return await self._pipeline([], list(keys))
+
+    async def set_many(
+        self, items: Dict[str, Any], ttl: Optional[float] = None
+    ) -> None:
+        """Store several JSON-serializable values in one pipeline."""
+        self._bind_loop()
+        await self._pipeline([(key, value, ttl) for key, value in items.items()], [])
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._idle = []
+            self._gets, self._sets = {}, []
+            self._flush_scheduled = False
+            self._loop = loop
+        return loop
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_scheduled = False
+        gets, self._gets = self._gets, {}
+        sets, self._sets = self._sets, []
+        task = asyncio.ensure_future(self._flush(gets, sets))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(
+        self,
+        gets: Dict[str, List["asyncio.Future[Optional[Any]]"]],
+        sets: List[Tuple[str, Any, Optional[float], "asyncio.Future[None]"]],
+    ) -> None:
+        keys = list(gets)
+        values: List[Optional[Any]] = [None] * len(keys)
+        try:
+            values = await self._pipeline(
+                [(key, value, ttl) for key, value, ttl, _ in sets], keys
+            )
+        finally:
+            # Callers never wait on a failed or cancelled flush
+            for *_, future in sets:
+                if not future.done():
+                    future.set_result(None)
+            for key, value in zip(keys, values):
+                for future in gets[key]:
+                    if not future.done():
+                        future.set_result(value)
+
+    async def _pipeline(
+        self, sets: List[Tuple[str, Any, Optional[float]]], keys: List[str]
+    ) -> List[Optional[Any]]:
+        commands = [
+            encode_command(
+                "SET",
+                self.prefix + key,
+                orjson.dumps(value),
+                "PX",
+                max(1, int((self.ttl if ttl is None else ttl) * 1000)),
+            )
+            for key, value, ttl in sets
+        ]
+        if keys:
+            commands.append(encode_command("MGET", *(self.prefix + k for k in keys)))
+        values: List[Optional[Any]] = [None] * len(keys)
+        if not commands:
+            return values
+        try:
+            replies = await self._execute(commands)
+        except (OSError, ConnectionError, asyncio.TimeoutError, RedisError) as e:
+            logger.warning(
+                "Shared cache at %s:%s unavailable: %s", self.host, self.port, e
+            )
+            self.stats.misses += len(keys)
+            return values
+        for reply in replies[: len(sets)]:
+            if isinstance(reply, RedisError):
+                logger.warning("Shared cache write failed: %s", reply)
+        found = replies[-1] if keys else []
+        if not isinstance(found, list):
+            logger.warning("Shared cache lookup failed: %s", found)
+            found = []
+        for i, payload in enumerate(found[: len(keys)]):
+            if payload is None:
+                continue
+            try:
+                values[i] = orjson.loads(payload)
+            except orjson.JSONDecodeError:
+                continue
+        hits = sum(value is not None for value in values)
+        self.stats.hits += hits
+        self.stats.misses += len(keys) - hits
+        return values
+
+    async def _execute(self, commands: List[bytes]) -> List[Any]:
+        reader, writer = await self._acquire()
+        try:
+            writer.write(b"".join(commands))
+            replies = await asyncio.wait_for(
+                self._read_replies(reader, len(commands)), self.timeout
+            )
+        except BaseException:
+            writer.close()
+            raise
+        if len(self._idle) < self.max_connections:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return replies
+
+    async def _read_replies(
+        self, reader: asyncio.StreamReader, count: int
+    ) -> List[Any]:
+        return [await read_reply(reader) for _ in range(count)]
+
+    async def _acquire(self) -> _Connection:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        setup = []
+        if self._password is not None:
+            setup.append(encode_command("AUTH", self._password))
+        if self.db:
+            setup.append(encode_command("SELECT", self.db))
+        if setup:
+            try:
+                writer.write(b"".join(setup))
+                replies = await asyncio.wait_for(
+                    self._read_replies(reader, len(setup)), self.timeout
+                )
+            except BaseException:
+                writer.close()
+                raise
+            for reply in replies:
+                if isinstance(reply, RedisError):
+                    writer.close()
+                    raise reply
+        return reader, writer
@@ -0,0 +1,106 @@
+"""Request coalescing for ShopAI services.
+
+This module provides SingleFlight, which deduplicates concurrent calls for the
+same key: the first caller starts the upstream call and every concurrent caller
+with the same key awaits that one in-flight result or error instead of starting
+its own.
+
+Example:
+    >>> from src.services.singleflight import SingleFlight
+    >>> flight = SingleFlight()
+    >>> results = await asyncio.gather(
+    ...     flight.do("starbucks", lambda: fetch("starbucks")),
+    ...     flight.do("starbucks", lambda: fetch("starbucks")),
+    ... )
+    >>> flight.stats.coalesced
+    1
+"""
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters describing request coalescing.
+
+    Attributes:
+        executed: Calls that started their own upstream work
+        coalesced: Calls that joined an in-flight call for the same key
+    """
+
+    executed: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicates concurrent async calls that share a key.
+
+    The shared call runs as its own task, so cancelling one waiter does not
+    cancel the work other waiters depend on. With ``cancel_abandoned`` the
+    shared call is cancelled once every waiter has been cancelled, so work
+    nobody waits for any more stops early.
+
+    Attributes:
+        stats: Executed and coalesced call counters
+        cancel_abandoned: Whether calls left without waiters are cancelled
+    """
+
+    def __init__(self, cancel_abandoned: bool = False):
+        self.stats = SingleFlightStats()
+        self.cancel_abandoned = cancel_abandoned
+        self._calls: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self._waiters: Dict["asyncio.Task[T]", int] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identity of the call, e.g. a normalized query or place_id
+            fn: Zero-argument coroutine factory performing the upstream call
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised, delivered to every waiter
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.stats.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.stats.coalesced += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._leave(key, task)
+
+    def _leave(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        remaining = self._waiters.pop(task) - 1
+        if remaining:
+            self._waiters[task] = remaining
+        elif self.cancel_abandoned and not task.done():
+            # Let a later call for the key start afresh instead of joining
+            if self._calls.get(key) is task:
+                del self._calls[key]
+            task.cancel()
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the error as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,172 @@
+"""Synthetic places backend for ShopAI load testing.
+
+This module generates a large, seeded corpus of realistic places (names built
+from shop kinds and descriptive words, addresses across several cities, full
+ratings, price levels, opening hours and summaries) and serves it through the
+Gazetteer's prefix matching. SyntheticPlaces adds a simulated per-call latency
+with jitter, so staging can be load-tested with real payload sizes and cache
+hit patterns without a Google key. The same seed always yields the same places
+and the same latencies.
+
+The corpus is built once, when the service registry is created at startup.
+
+Example:
+    >>> from src.services.synthetic_places import SyntheticPlaces
+    >>> places = SyntheticPlaces.generate(count=50_000, seed=7, latency=0.05)
+    >>> predictions = await places.places_autocomplete("golden cof")
+    >>> details = await places.place(predictions[0]["place_id"])
+"""
+import asyncio
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+from .gazetteer import Gazetteer, GazetteerPlace
+
+NAME_WORDS = (
+    "Corner", "Market", "Garden", "Harbour", "Station", "Park", "Bridge",
+    "Royal", "Golden", "Little", "Old", "New", "Central", "River", "Hill",
+)
+# Shop kind -> Places types
+PLACE_KINDS = {
+    "Coffee": ("cafe", "food"),
+    "Bakery": ("bakery", "food"),
+    "Books": ("book_store", "store"),
+    "Pharmacy": ("pharmacy", "health"),
+    "Supermarket": ("supermarket", "grocery_or_supermarket"),
+    "Pizza": ("restaurant", "meal_takeaway"),
+    "Sushi": ("restaurant",),
+    "Shoes": ("shoe_store", "store"),
+    "Electronics": ("electronics_store", "store"),
+    "Florist": ("florist", "store"),
+}
+# City -> (latitude, longitude) of its centre
+CITIES = {
+    "London": (51.5074, -0.1278),
+    "Manchester": (53.4808, -2.2426),
+    "Leeds": (53.8008, -1.5491),
+    "Bristol": (51.4545, -2.5879),
+    "Glasgow": (55.8642, -4.2518),
+    "Cardiff": (51.4816, -3.1791),
+}
+STREETS = (
+    "High Street", "Station Road", "Church Lane", "Market Street", "Park Road",
+    "Victoria Road", "King Street", "Queen Street", "Mill Lane", "North Road",
+)
+WEEKDAYS = (
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+)
+CITY_RADIUS_DEGREES = 0.08
+
+
+def synthetic_places(count: int, seed: int = 0) -> List[GazetteerPlace]:
+    """Generate a reproducible corpus of places.
+
+    Args:
+        count: Number of places
+        seed: Random seed; the same seed yields the same places
+
+    Returns:
+        List[GazetteerPlace]: Places with ids ``syn_0`` to ``syn_<count-1>``
+    """
+    rng = random.Random(seed)
+    kinds = list(PLACE_KINDS)
+    cities = list(CITIES)
+    places = []
+    for i in range(count):
+        kind = rng.choice(kinds)
+        name = f"{rng.choice(NAME_WORDS)} {kind}"
+        city = rng.choice(cities)
+        street = f"{rng.randint(1, 250)} {rng.choice(STREETS)}"
+        latitude, longitude = CITIES[city]
+        opens, closes = rng.randint(6, 10), rng.randint(17, 23)
+        hours = f"{opens}:00 AM – {closes - 12}:00 PM"
+        phone = f"{rng.randint(1000, 9999)} {rng.randint(100000, 999999)}"
+        places.append(GazetteerPlace(
+            place_id=f"syn_{i}",
+            name=name,
+            latitude=round(latitude + rng.uniform(-1, 1) * CITY_RADIUS_DEGREES, 6),
+            longitude=round(longitude + rng.uniform(-1, 1) * CITY_RADIUS_DEGREES, 6),
+            formatted_address=f"{street}, {city}, UK",
+            secondary_text=f"{street}, {city}",
+            types=PLACE_KINDS[kind] + ("point_of_interest", "establishment"),
+            metadata={
+                "vicinity": f"{street}, {city}",
+                "url": f"https://maps.google.com/?cid={10**12 + i}",
+                "website": f"https://{name.lower().replace(' ', '-')}-{i}.example.com",
+                "formatted_phone_number": f"0{phone}",
+                "international_phone_number": f"+44 {phone}",
+                "rating": round(rng.uniform(2.5, 5.0), 1),
+                "user_ratings_total": int(rng.paretovariate(1.2) * 10),
+                "price_level": rng.randint(0, 4),
+                "opening_hours": {
+                    "open_now": rng.random() < 0.7,
+                    "weekday_text": [f"{day}: {hours}" for day in WEEKDAYS],
+                },
+                "wheelchair_accessible_entrance": rng.random() < 0.8,
+                "delivery": rng.random() < 0.4,
+                "dine_in": rng.random() < 0.5,
+                "editorial_summary": (
+                    f"{kind} shop on {street} in {city}, "
+                    f"open {hours} every day."
+                ),
+            },
+        ))
+    return places
+
+
+class SyntheticPlaces(Gazetteer):
+    """Gazetteer over synthetic places with simulated upstream latency.
+
+    Attributes:
+        latency: Seconds every call takes before jitter
+        jitter: Extra seconds added uniformly at random, up to this amount
+    """
+
+    def __init__(
+        self,
+        places: Sequence[GazetteerPlace],
+        limit: int = 5,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+        **kwargs: Any,
+    ):
+        super().__init__(places, limit=limit, **kwargs)
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def generate(
+        cls, count: int = 10_000, seed: int = 0, **kwargs: Any
+    ) -> "SyntheticPlaces":
+        """Build a backend over ``count`` places generated from ``seed``.
+
+        Args:
+            count: Number of places
+            seed: Seed of the corpus and of the latency jitter
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            SyntheticPlaces: The backend
+        """
+        return cls(synthetic_places(count, seed), seed=seed, **kwargs)
+
+    async def places_autocomplete(
+        self, input_text: str, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Return predictions for ``input_text`` after the simulated latency."""
+        await self._delay()
+        return await super().places_autocomplete(input_text, **kwargs)
+
+    async def place(
+        self, place_id: str, fields: Optional[Sequence[str]] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Return details for ``place_id`` after the simulated latency."""
+        await self._delay()
+        return await super().place(place_id, fields, **kwargs)
+
+    async def _delay(self) -> None:
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,300 @@
+"""Cache warm-up for ShopAI location services.
+
+After a deploy every cache starts empty, so the first minutes of autocomplete
+traffic all go upstream. The CacheWarmer replays the most requested queries
+and place_ids through LocationService at startup, filling the result and
+details caches (and the shared tier, if configured) before the app reports
+ready. It runs in the background under its own rate budget, charged for every
+upstream Places call (a query costs its autocomplete call plus one details
+call per suggestion), so warm-up never sends more than ``rate`` upstream calls
+per second on top of live traffic. It gives up after ``timeout`` seconds so a
+slow upstream cannot hold readiness back forever.
+
+The list of queries and places comes from either a JSON snapshot of the form
+``{"queries": [...], "place_ids": [...]}``, already in priority order, or a
+JSONL traffic log with one request object per line holding a ``query``
+and/or a ``place_id``, ranked here by how often each appears. A snapshot can
+be built from logs with ``python -m src.services.warmup``.
+
+Example:
+    >>> from src.services.warmup import CacheWarmer
+    >>> warmer = CacheWarmer(location_service, "warmup.json", rate=5)
+    >>> warmer.start()
+    >>> warmer.status()
+    {'state': 'running', 'ready': False, 'progress': 0.1, ...}
+"""
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import orjson
+
+from ..core.exceptions import AppException
+from .location_service import LocationService, normalize_query
+from .rate_limit import AdaptiveConcurrencyLimiter, UpstreamLimiter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupPlan:
+    """Queries and places to warm, most important first.
+
+    Attributes:
+        queries: Autocomplete queries
+        place_ids: Places whose details are fetched
+    """
+
+    queries: List[str] = field(default_factory=list)
+    place_ids: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        """Return the plan in the snapshot format."""
+        return asdict(self)
+
+
+@dataclass
+class WarmupProgress:
+    """Counters describing a warm-up run.
+
+    Attributes:
+        queries: Queries in the plan
+        places: Places in the plan
+        warmed: Queries and places looked up successfully
+        failed: Queries and places whose lookup failed
+    """
+
+    queries: int = 0
+    places: int = 0
+    warmed: int = 0
+    failed: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+def load_warmup_plan(
+    paths: Union[str, Path, Sequence[Union[str, Path]]],
+    max_queries: int = 500,
+    max_places: int = 1_000,
+) -> WarmupPlan:
+    """Read a warm-up plan from a snapshot or from traffic logs.
+
+    Args:
+        paths: A JSON snapshot, or one or more JSONL traffic logs
+        max_queries: Most queries kept
+        max_places: Most place_ids kept
+
+    Returns:
+        WarmupPlan: The plan; log entries are ranked by frequency
+
+    Raises:
+        ValueError: If a file is neither a snapshot nor a JSONL request log
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    queries: "Counter[str]" = Counter()
+    place_ids: "Counter[str]" = Counter()
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            snapshot = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            snapshot = None
+        if isinstance(snapshot, dict) and {"queries", "place_ids"} & set(snapshot):
+            # Snapshots are ranked already; earlier entries weigh more
+            for rank, query in enumerate(reversed(snapshot.get("queries", []))):
+                queries[normalize_query(query)] += rank + 1
+            for rank, place_id in enumerate(reversed(snapshot.get("place_ids", []))):
+                place_ids[place_id] += rank + 1
+            continue
+        for number, line in enumerate(data.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: not a request object") from e
+            if not isinstance(entry, dict):
+                raise ValueError(f"{path}:{number}: not a request object")
+            if isinstance(entry.get("query"), str) and entry["query"].strip():
+                queries[normalize_query(entry["query"])] += 1
+            if isinstance(entry.get("place_id"), str):
+                place_ids[entry["place_id"]] += 1
+    return WarmupPlan(
+        queries=[query for query, _ in queries.most_common(max_queries)],
+        place_ids=[place_id for place_id, _ in place_ids.most_common(max_places)],
+    )
+
+
+class CacheWarmer:
+    """Fills the location caches from a warm-up plan in the background.
+
+    Attributes:
+        service: LocationService whose caches are filled
+        limiter: Rate and concurrency budget of the warm-up's upstream calls,
+            charged on top of the budgets protecting live traffic
+        timeout: Seconds after which warm-up stops and the app reports ready
+        include_details: Whether query lookups also fetch place details
+        state: ``pending``, ``running``, ``done``, ``timed_out`` or ``failed``
+        progress: Counters of the run
+    """
+
+    def __init__(
+        self,
+        service: LocationService,
+        source: Union[WarmupPlan, str, Path, Sequence[Union[str, Path]]],
+        max_queries: int = 500,
+        max_places: int = 1_000,
+        rate: float = 5.0,
+        concurrency: int = 4,
+        timeout: Optional[float] = 120.0,
+        include_details: bool = True,
+    ):
+        self.service = service
+        self.limiter = UpstreamLimiter(
+            "warmup",
+            rate=rate,
+            burst=max(rate, 1.0),
+            concurrency=AdaptiveConcurrencyLimiter(
+                initial_limit=concurrency, min_limit=concurrency, max_limit=concurrency
+            ),
+            max_wait=None,
+        )
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.include_details = include_details
+        self.state = "pending"
+        self.progress = WarmupProgress()
+        self._source = source
+        self._max_queries = max_queries
+        self._max_places = max_places
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether warm-up has finished, successfully or not."""
+        return self.state not in ("pending", "running")
+
+    def status(self) -> Dict[str, Any]:
+        """Current state and progress, e.g. for the readiness endpoint."""
+        total = self.progress.queries + self.progress.places
+        done = self.progress.warmed + self.progress.failed
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.monotonic()) - self._started
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "progress": round(done / total, 3) if total else float(self.ready),
+            **self.progress.as_dict(),
+            "elapsed": round(elapsed, 3),
+        }
+
+    def start(self) -> "asyncio.Task[None]":
+        """Run the warm-up as a background task of the running event loop."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def cancel(self) -> None:
+        """Stop a running warm-up, e.g. on shutdown."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self) -> None:
+        """Load the plan and warm every query and place within the timeout."""
+        self.state = "running"
+        self._started = time.monotonic()
+        try:
+            if isinstance(self._source, WarmupPlan):
+                plan = self._source
+            else:
+                plan = await asyncio.to_thread(
+                    load_warmup_plan, self._source, self._max_queries, self._max_places
+                )
+        except (OSError, ValueError) as e:
+            logger.warning("Cache warm-up skipped: %s", e)
+            self.state = "failed"
+            self._finished = time.monotonic()
+            return
+        self.progress.queries = len(plan.queries)
+        self.progress.places = len(plan.place_ids)
+        try:
+            await asyncio.wait_for(self._warm(plan), self.timeout)
+            self.state = "done"
+        except asyncio.TimeoutError:
+            logger.warning("Cache warm-up timed out after %ss", self.timeout)
+            self.state = "timed_out"
+        except Exception:
+            # Readiness must not hang on a warm-up that cannot finish
+            logger.exception("Cache warm-up failed")
+            self.state = "failed"
+        finally:
+            self._finished = time.monotonic()
+        logger.info("Cache warm-up %s: %s", self.state, self.progress.as_dict())
+
+    async def _warm(self, plan: WarmupPlan) -> None:
+        # Queries first: they serve autocomplete and fetch details of their places
+        items = [("query", query) for query in plan.queries]
+        items += [("place", place_id) for place_id in plan.place_ids]
+        pending = iter(items)
+
+        async def worker() -> None:
+            for kind, value in pending:
+                try:
+                    with self.service.charged_to(self.limiter):
+                        await self._warm_one(kind, value)
+                except AppException as e:
+                    logger.info("Warm-up of %s %r failed: %s", kind, value, e.message)
+                    self.progress.failed += 1
+                except Exception:
+                    logger.exception("Warm-up of %s %r failed", kind, value)
+                    self.progress.failed += 1
+                else:
+                    self.progress.warmed += 1
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def _warm_one(self, kind: str, value: str) -> None:
+        if kind == "query":
+            await self.service.get_location_suggestions(
+                value, include_details=self.include_details
+            )
+        else:
+            await self.service.get_place_details(value)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build a warm-up snapshot from JSONL traffic logs."""
+    parser = argparse.ArgumentParser(description="Build a cache warm-up snapshot")
+    parser.add_argument("logs", nargs="+", help="JSONL request logs")
+    parser.add_argument("output", help="Snapshot file to write")
+    parser.add_argument("--max-queries", type=int, default=500)
+    parser.add_argument("--max-places", type=int, default=1_000)
+    args = parser.parse_args(argv)
+    plan = load_warmup_plan(args.logs, args.max_queries, args.max_places)
+    with open(args.output, "wb") as f:
+        f.write(orjson.dumps(plan.as_dict(), option=orjson.OPT_INDENT_2))
+    print(
+        f"Wrote {len(plan.queries)} queries and {len(plan.place_ids)} places "
+        f"to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,5 +13,6 @@ def client():
         return LocationService(test_mode=True)
     
     app.dependency_overrides[get_location_service] = get_test_location_service
-    yield TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
     app.dependency_overrides.clear()
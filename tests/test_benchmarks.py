@@ -0,0 +1,153 @@
+import asyncio
+
+import httpx
+import pytest
+from googlemaps import exceptions
+
+from src.benchmarks.fake_places import FakePlacesServer, synthetic_places
+from src.services.places_client import AsyncPlacesClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client(server: FakePlacesServer) -> AsyncPlacesClient:
+    return AsyncPlacesClient(
+        key="benchmark",
+        transport=httpx.ASGITransport(app=server),
+        retry_over_query_limit=False,
+    )
+
+
+def test_fake_places_matches_prefixes_and_injects_failures():
+    """Word prefixes match, field masks apply, errors and quotas are enforced"""
+    clock = FakeClock()
+    places = synthetic_places(200, seed=3)
+    server = FakePlacesServer(places, qps=3, quota=5, clock=clock)
+    flaky = FakePlacesServer(places, error_rate=1.0)
+
+    async def run():
+        async with _client(server) as client:
+            predictions = await client.places_autocomplete("COFF")
+            details = await client.place(
+                predictions[0]["place_id"], fields=["name", "type"]
+            )
+            await client.places_autocomplete("zzz")
+            with pytest.raises(exceptions.ApiError) as throttled:
+                await client.places_autocomplete("coffee")
+            clock.now = 1.0
+            await client.places_autocomplete("coffee")
+            clock.now = 2.0
+            with pytest.raises(exceptions.ApiError) as exhausted:
+                await client.places_autocomplete("coffee")
+        async with _client(flaky) as client:
+            with pytest.raises(exceptions.ApiError) as failed:
+                await client.places_autocomplete("coffee")
+        return predictions, details, throttled, exhausted, failed
+
+    predictions, details, throttled, exhausted, failed = asyncio.run(run())
+
+    assert 0 < len(predictions) <= 5
+    assert all(
+        "coff" in p["structured_formatting"]["main_text"].lower() for p in predictions
+    )
+    assert set(details["result"]) == {"name", "types"}
+    assert throttled.value.status == "OVER_QUERY_LIMIT"
+    assert exhausted.value.status == "OVER_QUERY_LIMIT"
+    assert failed.value.status == "UNKNOWN_ERROR"
+    assert server.stats.as_dict() == {
+        "autocomplete": 5, "details": 1, "errors": 0, "throttled": 2,
+    }
+    assert synthetic_places(200, seed=3) == places
+
+
+def test_traces_are_reproducible_and_load_from_request_logs(tmp_path):
+    """Synthesized traces depend only on the seed; logs expand into keystrokes"""
+    from src.benchmarks.trace import (
+        keystrokes,
+        load_trace,
+        save_trace,
+        synthesize_trace,
+    )
+
+    assert [k.query for k in keystrokes("a cafe", "s")] == [
+        "a c", "a ca", "a caf", "a cafe",
+    ]
+    trace = synthesize_trace(users=3, searches_per_user=2, seed=7)
+    assert trace == synthesize_trace(users=3, searches_per_user=2, seed=7)
+    assert [k.at for k in trace] == sorted(k.at for k in trace)
+    assert len({k.session for k in trace}) == 6
+
+    path = tmp_path / "trace.jsonl"
+    save_trace(trace, path)
+    assert load_trace(path) == trace
+
+    log = tmp_path / "requests.jsonl"
+    log.write_text('{"query": "tea"}\n\n{"query": "books", "session": "b"}\n')
+    loaded = load_trace(log, interval=0.1, think_time=1.0)
+    assert [(k.at, k.session, k.query) for k in loaded] == [
+        (0.0, "line1", "te"),
+        (0.1, "line1", "tea"),
+        (1.1, "b", "bo"),
+        (1.2, "b", "boo"),
+        (1.3, "b", "book"),
+        (1.4, "b", "books"),
+    ]
+    log.write_text("[1, 2]\n")
+    with pytest.raises(ValueError):
+        load_trace(log)
+
+
+def test_benchmark_replays_trace_and_flags_regressions(tmp_path):
+    """The driver reports latency and upstream usage and compares baselines"""
+    from dataclasses import replace
+    from src.benchmarks.driver import (
+        benchmark_settings,
+        compare_to_baseline,
+        load_baselines,
+        percentile,
+        run_benchmark,
+        save_baseline,
+    )
+    from src.benchmarks.trace import keystrokes
+    from src.main import app
+
+    server = FakePlacesServer(synthetic_places(100))
+    trace = keystrokes("coffee", "s1", interval=0.05) + keystrokes(
+        "books", "s2", start=0.3, interval=0.0
+    )
+    result = asyncio.run(
+        run_benchmark(
+            app,
+            trace,
+            server,
+            settings=benchmark_settings(session_debounce=0),
+            speed=1.0,
+            scenario="test",
+        )
+    )
+
+    assert result.requests == len(trace)
+    assert result.completed + result.superseded + result.errors == result.requests
+    assert result.errors == 0
+    assert result.completed >= 2
+    assert result.upstream_calls == server.stats.total
+    assert result.upstream_per_request == server.stats.total / len(trace)
+    assert 0 < result.latency_p50 <= result.latency_p95 <= result.latency_p99
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+
+    path = tmp_path / "baseline.json"
+    save_baseline(path, result)
+    baseline = load_baselines(path)["test"]
+    assert compare_to_baseline(result, baseline) == []
+    slower = replace(result, latency_p95=result.latency_p95 + 0.05)
+    chattier = replace(result, upstream_per_request=result.upstream_per_request + 1)
+    assert compare_to_baseline(slower, baseline)[0].startswith("latency_p95")
+    assert compare_to_baseline(chattier, baseline)[0].startswith(
+        "upstream_per_request"
+    )
@@ -0,0 +1,206 @@
+import asyncio
+
+from src.services.cache import SQLiteCache, TieredCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_lru_eviction():
+    """The least recently used entry is evicted once the cache is full"""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+
+
+def test_ttl_cache_expiry():
+    """Entries stop being served once their TTL has elapsed"""
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats.expirations == 1
+    assert len(cache) == 1
+
+
+def test_sqlite_tier_survives_restart_and_promotes(tmp_path):
+    """Persisted entries are readable by a new process and promoted to memory"""
+    path = str(tmp_path / "cache.db")
+
+    async def write():
+        cache = TieredCache(TTLCache(), SQLiteCache(path))
+        await cache.set("key", {"value": 1})
+        cache.close()
+
+    async def read():
+        cache = TieredCache(TTLCache(), SQLiteCache(path))
+        first = await cache.get("key")
+        second = await cache.get("key")
+        stats = cache.stats()
+        cache.close()
+        return first, second, stats
+
+    asyncio.run(write())
+    first, second, stats = asyncio.run(read())
+
+    assert first == second == {"value": 1}
+    assert stats["persistent"]["hits"] == 1
+    assert stats["memory"]["hits"] == 1
+
+
+def test_sqlite_tier_expiry(tmp_path):
+    """Expired persistent entries are treated as misses"""
+    async def run():
+        cache = SQLiteCache(str(tmp_path / "cache.db"))
+        await cache.set("key", [1, 2], ttl=-1)
+        value = await cache.get("key")
+        cache.close()
+        return value, cache.stats
+
+    value, stats = asyncio.run(run())
+    assert value is None
+    assert stats.expirations == 1
+
+
+def test_place_details_cache_field_level_freshness():
+    """Volatile fields expire before stable ones and are reported as missing"""
+    from src.services.cache import PlaceDetailsCache
+
+    clock = FakeClock()
+    cache = PlaceDetailsCache(
+        ["name", "geometry", "opening_hours"],
+        volatile_fields={"opening_hours"},
+        ttl=100,
+        volatile_ttl=10,
+        clock=clock,
+    )
+    cache.set("p1", {"name": "Cafe", "geometry": {"lat": 1}, "opening_hours": None})
+
+    assert cache.get("p1") == (
+        {"name": "Cafe", "geometry": {"lat": 1}, "opening_hours": None},
+        [],
+    )
+
+    clock.now = 50
+    values, missing = cache.get("p1")
+    assert values == {"name": "Cafe", "geometry": {"lat": 1}}
+    assert missing == ["opening_hours"]
+
+    cache.set("p1", {"opening_hours": {"open_now": False}})
+    clock.now = 55
+    assert cache.get("p1")[1] == []
+
+    clock.now = 95
+    cache.set("p1", {"opening_hours": {"open_now": True}})
+    clock.now = 101
+    values, missing = cache.get("p1")
+    assert values == {"opening_hours": {"open_now": True}}
+    assert missing == ["name", "geometry"]
+
+    clock.now = 200
+    assert cache.get("p1") == ({}, ["name", "geometry", "opening_hours"])
+    assert len(cache) == 0
+
+
+def test_place_details_cache_merges_partial_group_writes():
+    """Writing some fields of a group keeps its other fresh fields"""
+    from src.services.cache import PlaceDetailsCache
+
+    clock = FakeClock()
+    cache = PlaceDetailsCache(
+        ["name", "website", "vicinity", "rating"],
+        volatile_fields={"rating"},
+        ttl=100,
+        volatile_ttl=10,
+        clock=clock,
+    )
+    cache.set("p1", {"name": "Cafe", "website": "https://cafe.test"})
+    clock.now = 40
+    cache.set("p1", {"vicinity": "High St", "rating": 4.5})
+
+    assert cache.get("p1")[1] == []
+    # The stable group is as old as its oldest field
+    clock.now = 100
+    values, missing = cache.get("p1", ["name", "vicinity"])
+    assert values == {} and missing == ["name", "vicinity"]
+
+    clock.now = 200
+    cache.set("p1", {"name": "Cafe"})
+    cache.set("p1", {"website": None})
+    assert cache.get("p1", ["name", "website"]) == (
+        {"name": "Cafe", "website": None},
+        [],
+    )
+
+
+def test_place_details_cache_eviction():
+    """Least recently used places are evicted once the cache is full"""
+    from src.services.cache import PlaceDetailsCache
+
+    cache = PlaceDetailsCache(["name"], max_size=2)
+    cache.set("p1", {"name": "a"})
+    cache.set("p2", {"name": "b"})
+    cache.get("p1")
+    cache.set("p3", {"name": "c"})
+
+    assert cache.get("p2") == ({}, ["name"])
+    assert cache.get("p1") == ({"name": "a"}, [])
+    assert cache.stats.evictions == 1
+
+
+def test_stale_entries_are_kept_for_stale_reads():
+    """Expired entries miss but stay readable as stale within stale_ttl"""
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=10, clock=clock, stale_ttl=20)
+    cache.set("k", "v")
+
+    clock.now = 15
+    assert cache.get("k") is None
+    assert cache.get_stale("k") == "v"
+
+    clock.now = 31
+    assert cache.get_stale("k") is None
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_place_details_stale_values():
+    """Expired detail fields are served by get_stale within stale_ttl"""
+    from src.services.cache import PlaceDetailsCache
+
+    clock = FakeClock()
+    cache = PlaceDetailsCache(
+        ["name", "rating"],
+        volatile_fields={"rating"},
+        ttl=100,
+        volatile_ttl=10,
+        stale_ttl=50,
+        clock=clock,
+    )
+    cache.set("p1", {"name": "Cafe", "rating": 4.5})
+
+    clock.now = 20
+    assert cache.get("p1", ["name", "rating"]) == ({"name": "Cafe"}, ["rating"])
+    assert cache.get_stale("p1", ["rating"]) == {"rating": 4.5}
+
+    clock.now = 200
+    assert cache.get_stale("p1", ["name", "rating"]) == {}
+    assert len(cache) == 0
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpen
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _ok():
+    return "ok"
+
+
+async def _fail():
+    raise RuntimeError("upstream down")
+
+
+def test_circuit_opens_after_consecutive_failures_and_fails_fast():
+    """The circuit opens at the threshold and rejects calls without running them"""
+    breaker = CircuitBreaker(
+        failure_threshold=2, recovery_timeout=30, clock=FakeClock()
+    )
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await breaker.call(_fail)
+        with pytest.raises(CircuitOpen):
+            await breaker.call(_ok)
+
+    asyncio.run(scenario())
+    assert breaker.state == "open"
+    assert breaker.stats.as_dict() == {
+        "successes": 0, "failures": 2, "rejected": 1, "opened": 1
+    }
+
+
+def test_half_open_probe_closes_or_reopens_circuit():
+    """After the recovery timeout one probe decides whether the circuit closes"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 60
+    assert asyncio.run(breaker.call(_ok)) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_as_failures_and_request_errors_do_not():
+    """Slow successes trip the breaker; errors judged healthy leave it alone"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=2, slow_call_threshold=1.0, clock=clock
+    )
+
+    async def slow():
+        clock.now += 2
+        return "late"
+
+    async def not_found():
+        raise LookupError("NOT_FOUND")
+
+    async def scenario():
+        assert await breaker.call(slow) == "late"
+        for _ in range(3):
+            with pytest.raises(LookupError):
+                await breaker.call(not_found, is_failure=lambda e: False)
+        assert breaker.state == "closed"
+        await breaker.call(slow)
+
+    asyncio.run(scenario())
+    assert breaker.state == "open"
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+from googlemaps import exceptions
+
+from src.services.gazetteer import Gazetteer, GazetteerPlace
+from src.services.location_service import LocationService
+
+CSV_PLACES = """place_id,name,lat,lng,address,types,rating,user_ratings_total,delivery
+sb1,Starbucks Reserve,51.5,-0.12,"Starbucks Reserve, 1 Strand, London",cafe|food,4.2,900,true
+sb2,Starbucks,51.6,-0.10,"Starbucks, 22 King's Road, London",cafe,4.0,50,false
+st1,Star Pizza,51.4,-0.11,"Star Pizza, 5 Camden Street, London",restaurant,4.6,300,
+mo1,Café Montmartre,48.88,2.34,"Café Montmartre, Paris",cafe,,,
+"""
+
+
+@pytest.fixture
+def gazetteer(tmp_path) -> Gazetteer:
+    path = tmp_path / "places.csv"
+    path.write_text(CSV_PLACES, encoding="utf-8")
+    return Gazetteer.from_file(str(path))
+
+
+def test_prefix_search_ranks_by_match_and_popularity(gazetteer: Gazetteer):
+    """Prefix matches are returned with name and popularity ranking"""
+    results = gazetteer.search("starb")
+    assert [place.place_id for _, place in results] == ["sb1", "sb2"]
+
+    results = gazetteer.search("star")
+    assert {place.place_id for _, place in results} == {"sb1", "sb2", "st1"}
+
+    results = gazetteer.search("star camden")
+    assert [place.place_id for _, place in results] == ["st1"]
+
+
+def test_fuzzy_and_accent_insensitive_search(gazetteer: Gazetteer):
+    """Typos and missing accents still find the place"""
+    assert gazetteer.search("starbcks")[0][1].place_id in {"sb1", "sb2"}
+    assert gazetteer.search("cafe montm")[0][1].place_id == "mo1"
+    assert gazetteer.search("zzzz") == []
+
+
+def test_jsonl_loading_and_generated_ids(tmp_path):
+    """JSONL records load with aliases and get stable generated ids"""
+    path = tmp_path / "places.jsonl"
+    record = {"name": "Corner Shop", "latitude": 1.5, "longitude": 2.5}
+    path.write_text(json.dumps(record) + "\n", encoding="utf-8")
+
+    first = Gazetteer.from_file(str(path))
+    second = Gazetteer.from_file(str(path))
+
+    place_id = first.search("corner")[0][1].place_id
+    assert place_id.startswith("gz_")
+    assert second.get(place_id) is not None
+
+    with pytest.raises(ValueError):
+        GazetteerPlace.from_record({"name": "No coordinates"})
+
+
+def test_location_service_with_gazetteer_backend(gazetteer: Gazetteer):
+    """LocationService returns the usual models from the gazetteer"""
+    service = LocationService(test_mode=False, client=gazetteer)
+
+    suggestions = asyncio.run(service.get_location_suggestions("starbucks res"))
+
+    assert len(suggestions) == 1
+    suggestion = suggestions[0]
+    assert suggestion.place_id == "sb1"
+    assert suggestion.main_text == "Starbucks Reserve"
+    assert suggestion.secondary_text == "1 Strand, London"
+    assert suggestion.details.latitude == 51.5
+    assert suggestion.details.types == ["cafe", "food"]
+    assert suggestion.details.rating == 4.2
+    assert suggestion.details.delivery is True
+
+    with pytest.raises(exceptions.ApiError):
+        asyncio.run(gazetteer.place("missing"))
@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.services.geo_index import GeoIndex, haversine_m
+
+
+def test_haversine_matches_known_distance():
+    """London to Paris is about 344 km"""
+    distances = haversine_m(51.5074, -0.1278, np.array([48.8566]), np.array([2.3522]))
+    assert abs(distances[0] - 343_500) < 1_000
+
+
+def test_nearby_returns_places_inside_radius_nearest_first():
+    """Only places within the radius are returned, sorted by distance"""
+    index = GeoIndex()
+    index.add_many(
+        ["far", "near", "nearest", "paris"],
+        [51.60, 51.51, 51.5075, 48.8566],
+        [-0.10, -0.13, -0.1278, 2.3522],
+    )
+
+    results = index.nearby(51.5074, -0.1278, radius=5_000)
+    assert [place_id for place_id, _ in results] == ["nearest", "near"]
+    assert results[0][1] < results[1][1] <= 5_000
+
+    assert len(index.nearby(51.5074, -0.1278, radius=20_000, limit=2)) == 2
+    assert index.nearby(0.0, 0.0, radius=1_000) == []
+
+
+def test_nearby_crosses_cell_and_antimeridian_boundaries():
+    """Neighbouring cells, including across the antimeridian, are searched"""
+    index = GeoIndex(cell_size=0.01)
+    index.add("east", 0.0, 179.999)
+    index.add("west", 0.0, -179.999)
+
+    results = index.nearby(0.0, 179.9995, radius=1_000)
+    assert {place_id for place_id, _ in results} == {"east", "west"}
+
+
+def test_add_moves_existing_place_and_distances_keeps_order():
+    """Re-adding a place moves it; distances align with the requested ids"""
+    index = GeoIndex(max_size=2)
+    index.add("a", 10.0, 10.0)
+    index.add("a", 20.0, 20.0)
+    index.add("b", 20.0, 20.001)
+    index.add("c", 20.0, 20.002)
+
+    assert len(index) == 2 and "c" not in index
+    assert index.coordinates("a") == (20.0, 20.0)
+    assert index.nearby(10.0, 10.0, radius=1_000) == []
+
+    distances = index.distances(20.0, 20.0, ["b", "unknown", "a"])
+    assert distances[1] is None
+    assert distances[2] == 0.0 and 100 < distances[0] < 110
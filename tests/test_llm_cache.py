@@ -0,0 +1,145 @@
+import asyncio
+
+from src.services.cache import SQLiteCache, TieredCache, TTLCache
+from src.services.llm_cache import (
+    CachingLLMProvider,
+    SemanticCache,
+    hashed_ngram_embedding,
+)
+from src.services.local_llm_provider import LocalLLMProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_exact_tier_serves_repeats_and_counts_saved_latency(tmp_path):
+    """Repeat prompts skip the provider, also across restarts via SQLite"""
+    provider = LocalLLMProvider(responder=str.upper, latency=0.02)
+
+    def build():
+        return CachingLLMProvider(
+            provider,
+            TieredCache(
+                TTLCache(max_size=10, ttl=60), SQLiteCache(str(tmp_path / "llm.db"))
+            ),
+        )
+
+    async def run():
+        llm = build()
+        first = await asyncio.gather(llm.generate("shoes"), llm.generate("shoes"))
+        second = await llm.generate("shoes")
+        batch = await llm.generate_batch(["shoes", "socks", "socks"])
+        await llm.aclose()
+        restarted = build()
+        return llm, first, second, batch, await restarted.generate("socks")
+
+    llm, first, second, batch, restarted = asyncio.run(run())
+
+    assert first == ["SHOES", "SHOES"] and second == "SHOES"
+    assert batch == ["SHOES", "SOCKS", "SOCKS"]
+    assert restarted == "SOCKS"
+    # One call for the coalesced "shoes", one batch for "socks"
+    assert provider.batch_sizes == [1, 1]
+    assert llm.stats.hits == 2
+    assert llm.stats.saved_seconds >= 0.04
+    assert llm.stats.hit_rate == 0.4
+
+
+def test_semantic_tier_matches_near_duplicates():
+    """Near-duplicate prompts reuse a response; unrelated ones do not"""
+    provider = LocalLLMProvider(responder=lambda prompt: f"answer to {prompt}")
+    llm = CachingLLMProvider(provider, semantic=SemanticCache(threshold=0.8))
+
+    async def run():
+        return [
+            await llm.generate(prompt)
+            for prompt in (
+                "coffee shops near me",
+                "Coffee shop near  me",
+                "running shoes under $100",
+            )
+        ]
+
+    results = asyncio.run(run())
+
+    assert results[1] == "answer to coffee shops near me"
+    assert results[2] == "answer to running shoes under $100"
+    assert llm.stats.semantic_hits == 1
+    assert provider.calls == 2
+
+
+def test_semantic_cache_evicts_oldest_and_expires():
+    """The semantic tier is bounded and honours its TTL"""
+    clock = FakeClock()
+    cache = SemanticCache(threshold=0.99, max_size=2, ttl=10, clock=clock)
+    for prompt in ("red dress", "blue jeans", "green hat"):
+        cache.set(prompt, {"response": prompt, "latency": 0.0})
+
+    assert len(cache) == 2
+    assert cache.get("red dress") is None
+    assert cache.get("green hat")[0]["response"] == "green hat"
+    clock.now = 11
+    assert cache.get("green hat") is None
+    assert not hashed_ngram_embedding("").any()
+
+
+def test_sampled_providers_bypass_the_cache():
+    """A provider with non-zero temperature is never served from cache"""
+    provider = LocalLLMProvider(temperature=0.7)
+    llm = CachingLLMProvider(provider)
+
+    async def run():
+        await llm.generate("gift ideas")
+        chunks = [chunk async for chunk in llm.stream("gift ideas")]
+        return chunks
+
+    assert asyncio.run(run()) == ["gift ", "ideas"]
+    assert provider.calls == 2
+    assert llm.stats.bypassed == 2
+    assert llm.stats.hits == 0
+
+
+def test_semantic_tier_compares_only_the_request_of_a_template():
+    """Different requests filling one template never share a response"""
+    from src.services.location_intent import INTENT_PROMPT, LocationIntentParser
+
+    prompts = [INTENT_PROMPT.format(text=text) for text in ("a", "b")]
+    full = [hashed_ngram_embedding(prompt) for prompt in prompts]
+    # The shared template wording alone makes full prompts look alike
+    assert float(full[0] @ full[1]) > 0.92
+
+    provider = LocalLLMProvider(responder=lambda prompt: prompt.rsplit(": ", 1)[1])
+    llm = CachingLLMProvider(provider, semantic=SemanticCache())
+    parser = LocationIntentParser(llm)
+    requests = (
+        "cheap vegan takeaway near Kings Cross",
+        "bookshops open now in Camden",
+        "cheap vegan takeaways near Kings Cross",
+    )
+
+    async def run():
+        answers = [
+            await llm.generate(INTENT_PROMPT.format(text=text), semantic_key=text)
+            for text in requests
+        ]
+        # The same request in another template is not a match either
+        other = await llm.generate(
+            f"Summarize: {requests[0]}", semantic_key=requests[0]
+        )
+        await parser.parse("late night pharmacy")
+        return answers, other
+
+    answers, other = asyncio.run(run())
+
+    assert answers == [requests[0], requests[1], requests[0]]
+    assert other == requests[0] and provider.calls == 4
+    assert llm.stats.semantic_hits == 1
+    # The parser sends the request as the key, scoped by its template
+    template = INTENT_PROMPT.replace("{text}", "\0")
+    assert llm.semantic.get("late night pharmacy", template) is not None
+    assert llm.semantic.get("late night pharmacy") is None
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from src.services.llm_runtime import LLMRuntime
+from src.services.local_llm_provider import LocalLLMProvider
+
+
+def test_concurrent_generate_calls_are_micro_batched():
+    """Calls within the batch window share provider calls of bounded size"""
+    provider = LocalLLMProvider(responder=lambda prompt: prompt.upper())
+    llm = LLMRuntime(provider, max_batch_size=4, batch_window=0.01)
+
+    async def run():
+        return await asyncio.gather(*(llm.generate(f"p{i}") for i in range(10)))
+
+    results = asyncio.run(run())
+
+    assert results == [f"P{i}" for i in range(10)]
+    assert sorted(provider.batch_sizes) == [2, 4, 4]
+    assert llm.stats.as_dict() == {
+        "requests": 10,
+        "batches": 3,
+        "streams": 0,
+        "timeouts": 0,
+        "errors": 0,
+    }
+
+
+def test_stream_yields_tokens_as_they_are_generated():
+    """The first token arrives long before the whole response"""
+    import time
+
+    provider = LocalLLMProvider(token_latency=0.02)
+    llm = LLMRuntime(provider)
+
+    async def run():
+        started = time.perf_counter()
+        arrivals, chunks = [], []
+        async for chunk in llm.stream("one two three four five"):
+            arrivals.append(time.perf_counter() - started)
+            chunks.append(chunk)
+        return arrivals, chunks
+
+    arrivals, chunks = asyncio.run(run())
+
+    assert chunks == ["one ", "two ", "three ", "four ", "five"]
+    assert arrivals[0] < arrivals[-1] / 2
+
+
+def test_concurrency_and_timeout_limits():
+    """Provider calls respect max_concurrency and are cut off after timeout"""
+    in_flight, peak = 0, 0
+
+    class SlowProvider(LocalLLMProvider):
+        async def generate_batch(self, prompts):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(0.05 if prompts[0] != "stuck" else 1)
+                return prompts
+            finally:
+                in_flight -= 1
+
+    llm = LLMRuntime(
+        SlowProvider(), max_batch_size=1, max_concurrency=2, timeout=0.2
+    )
+
+    async def run():
+        ok = await asyncio.gather(*(llm.generate(f"p{i}") for i in range(4)))
+        with pytest.raises(asyncio.TimeoutError):
+            await llm.generate("stuck")
+        return ok
+
+    assert asyncio.run(run()) == ["p0", "p1", "p2", "p3"]
+    assert peak == 2
+    assert llm.stats.timeouts == 1
@@ -91,3 +91,833 @@ def test_real_location_autocomplete(client: TestClient):
     finally:
         # Clean up dependency override
         client.app.dependency_overrides.clear()
+
+class FakePlacesClient:
+    """Blocking stand-in for googlemaps.Client with per-place latency."""
+
+    def __init__(self, place_ids, delay=0.05, failing=(), slow=()):
+        self.place_ids = place_ids
+        self.delay = delay
+        self.failing = set(failing)
+        self.slow = set(slow)
+        self.autocomplete_calls = 0
+        self.place_calls = []
+
+    def places_autocomplete(self, input_text, types=None, language=None):
+        self.autocomplete_calls += 1
+        return [
+            {
+                "place_id": place_id,
+                "description": f"{place_id}, Test City",
+                "structured_formatting": {
+                    "main_text": place_id,
+                    "secondary_text": "Test City",
+                },
+            }
+            for place_id in self.place_ids
+        ]
+
+    def place(self, place_id, fields=None):
+        import time
+
+        self.place_calls.append((place_id, list(fields or [])))
+        time.sleep(1.0 if place_id in self.slow else self.delay)
+        if place_id in self.failing:
+            raise RuntimeError("upstream failure")
+        return {
+            "result": {
+                "geometry": {"location": {"lat": 1.0, "lng": 2.0}},
+                "formatted_address": f"{place_id}, Test City",
+                "name": place_id,
+            }
+        }
+
+
+def _real_service(client, **kwargs):
+    from src.services.location_service import LocationService
+
+    return LocationService(test_mode=False, client=client, **kwargs)
+
+
+def test_details_fetched_concurrently():
+    """Place details lookups run in parallel instead of back to back"""
+    import asyncio
+    import time
+
+    client = FakePlacesClient([f"place_{i}" for i in range(5)], delay=0.1)
+    service = _real_service(client)
+
+    started = time.perf_counter()
+    suggestions = asyncio.run(service.get_location_suggestions("Test"))
+    elapsed = time.perf_counter() - started
+
+    assert [s.place_id for s in suggestions] == client.place_ids
+    assert all(s.details is not None for s in suggestions)
+    assert elapsed < 0.4
+
+
+def test_details_partial_results_on_failure_and_timeout():
+    """Failed or slow detail lookups drop details but keep the suggestion"""
+    import asyncio
+
+    client = FakePlacesClient(
+        ["ok", "broken", "slow"], delay=0.01, failing=["broken"], slow=["slow"]
+    )
+    service = _real_service(client, details_timeout=0.2)
+
+    suggestions = asyncio.run(service.get_location_suggestions("Test"))
+
+    details = {s.place_id: s.details for s in suggestions}
+    assert details["ok"].name == "ok"
+    assert details["broken"] is None
+    assert details["slow"] is None
+
+
+def test_timed_out_blocking_calls_are_bounded_by_the_thread_pool():
+    """Abandoned blocking calls hold a pool thread; queued ones never start"""
+    import asyncio
+
+    client = FakePlacesClient(["a", "b", "c"], slow=["a", "b", "c"])
+    service = _real_service(
+        client, details_timeout=0.1, details_concurrency=3, blocking_workers=1
+    )
+
+    async def run():
+        suggestions = await service.get_location_suggestions("Test")
+        # Every limiter slot is free again while the first call still runs
+        free = service.details_limiter.concurrency.in_flight
+        await service.aclose()
+        return suggestions, free
+
+    suggestions, free = asyncio.run(run())
+
+    assert all(s.details is None for s in suggestions)
+    assert free == 0
+    assert [place_id for place_id, _ in client.place_calls] == ["a"]
+
+
+def test_location_service_shared_across_requests():
+    """The lifespan registry serves one LocationService and closes it on shutdown"""
+    from fastapi.testclient import TestClient
+    from src.main import app
+    from src.services.location_service import LocationService
+    from src.services.service_registry import ServiceRegistry
+
+    class TrackingLocationService(LocationService):
+        instances = 0
+        closed = False
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            TrackingLocationService.instances += 1
+
+        async def aclose(self) -> None:
+            TrackingLocationService.closed = True
+
+    with TestClient(app) as client:
+        client.app.state.services = ServiceRegistry(TrackingLocationService())
+        for _ in range(3):
+            response = client.post(
+                "/api/v1/locations/autocomplete", json={"query": "Times Square"}
+            )
+            assert response.status_code == 200
+
+    assert TrackingLocationService.instances == 1
+    assert TrackingLocationService.closed
+
+
+def test_result_cache_serves_normalized_repeat_queries():
+    """Repeated queries differing only in case and spacing hit the result cache"""
+    import asyncio
+    from src.services.cache import TieredCache, TTLCache
+
+    client = FakePlacesClient(["place_1"], delay=0)
+    cache = TieredCache(TTLCache(max_size=10, ttl=60))
+    service = _real_service(client, result_cache=cache)
+
+    async def run():
+        first = await service.get_location_suggestions("Star Bucks")
+        second = await service.get_location_suggestions("  star   bucks ")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert client.autocomplete_calls == 1
+    assert cache.stats()["memory"] == {
+        "hits": 1, "misses": 1, "evictions": 0, "expirations": 0
+    }
+
+
+def test_details_cache_refetches_only_stale_fields():
+    """Repeat place_ids reuse cached details and only refresh volatile fields"""
+    import asyncio
+    from src.services.cache import PlaceDetailsCache
+    from src.services.location_service import PLACE_FIELDS, VOLATILE_PLACE_FIELDS
+
+    now = [0.0]
+    cache = PlaceDetailsCache(
+        PLACE_FIELDS,
+        volatile_fields=VOLATILE_PLACE_FIELDS,
+        ttl=1000,
+        volatile_ttl=10,
+        clock=lambda: now[0],
+    )
+    client = FakePlacesClient(["place_1"], delay=0)
+    service = _real_service(client, details_cache=cache)
+
+    first = asyncio.run(service.get_location_suggestions("first query"))
+    asyncio.run(service.get_location_suggestions("second query"))
+    now[0] = 60
+    third = asyncio.run(service.get_location_suggestions("third query"))
+
+    assert len(client.place_calls) == 2
+    assert client.place_calls[0][1] == PLACE_FIELDS
+    assert set(client.place_calls[1][1]) == VOLATILE_PLACE_FIELDS
+    assert first[0].details == third[0].details
+
+
+def test_details_fetched_for_one_projection_serve_the_others():
+    """Alternating field projections fetch each field once"""
+    import asyncio
+    from src.services.cache import PlaceDetailsCache
+    from src.services.location_service import PLACE_FIELDS, VOLATILE_PLACE_FIELDS
+
+    client = FakePlacesClient(["place_1"], delay=0)
+    service = _real_service(
+        client,
+        details_cache=PlaceDetailsCache(
+            PLACE_FIELDS, volatile_fields=VOLATILE_PLACE_FIELDS
+        ),
+    )
+
+    async def run():
+        for fields in (["website"], ["vicinity"]) * 2 + (["website", "vicinity"],):
+            await service.get_place_details("place_1", fields=fields)
+        await service.get_place_details("place_1", fields=["rating"])
+        await service.get_place_details("place_1", fields=["website", "rating"])
+
+    asyncio.run(run())
+
+    assert client.place_calls == [
+        ("place_1", ["formatted_address", "geometry", "name", "website"]),
+        ("place_1", ["vicinity"]),
+        ("place_1", ["rating"]),
+    ]
+
+
+def test_concurrent_identical_queries_are_coalesced():
+    """Concurrent requests for the same query share one upstream lookup"""
+    import asyncio
+
+    client = FakePlacesClient(["place_1", "place_2"], delay=0.05)
+    service = _real_service(client)
+
+    async def run():
+        return await asyncio.gather(
+            *(service.get_location_suggestions("Star Bucks") for _ in range(10))
+        )
+
+    results = asyncio.run(run())
+
+    assert all(result == results[0] for result in results)
+    assert client.autocomplete_calls == 1
+    assert len(client.place_calls) == 2
+    assert service.suggestions_flight.stats.coalesced == 9
+
+
+def test_autocomplete_without_details(client: TestClient):
+    """Clients can skip place details entirely"""
+    response = client.post(
+        "/api/v1/locations/autocomplete",
+        json={"query": "Times Square", "include_details": False}
+    )
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert len(suggestions) > 0
+    assert all(suggestion["details"] is None for suggestion in suggestions)
+
+
+def test_autocomplete_field_projection(client: TestClient):
+    """Only requested detail fields are returned, plus the required ones"""
+    response = client.post(
+        "/api/v1/locations/autocomplete",
+        json={"query": "Times Square", "fields": ["rating"]}
+    )
+    assert response.status_code == 200
+    details = response.json()["suggestions"][0]["details"]
+    assert details["rating"] == 4.5
+    assert details["name"] == "Mock Location 1"
+    assert details["latitude"] == 40.7128
+    assert details["website"] is None
+
+    response = client.post(
+        "/api/v1/locations/autocomplete",
+        json={"query": "Times Square", "fields": ["not_a_field"]}
+    )
+    assert response.status_code == 422
+
+
+def test_get_location_details(client: TestClient):
+    """Details for a selected place can be loaded separately"""
+    response = client.get("/api/v1/locations/mock_place_2")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Mock Location 2"
+
+    response = client.get("/api/v1/locations/unknown_place")
+    assert response.status_code == 400
+    assert response.json()["code"] == "place_details_error"
+
+    # Other routes' paths are not place ids
+    response = client.get("/api/v1/locations/search")
+    assert response.status_code == 405
+    assert response.headers["allow"] == "POST"
+    response = client.get("/api/v1/locations/autocomplete:batch")
+    assert response.status_code == 405
+
+
+def test_projection_requests_only_needed_places_fields():
+    """Upstream details calls ask only for the projected Places fields"""
+    import asyncio
+
+    client = FakePlacesClient(["place_1"], delay=0)
+    service = _real_service(client)
+
+    bare = asyncio.run(
+        service.get_location_suggestions("Test", include_details=False)
+    )
+    projected = asyncio.run(
+        service.get_location_suggestions("Test", fields=["latitude", "rating"])
+    )
+
+    assert bare[0].details is None
+    assert projected[0].details.name == "place_1"
+    assert client.place_calls == [
+        ("place_1", ["formatted_address", "geometry", "name", "rating"])
+    ]
+
+
+def test_stream_autocomplete_ndjson(client: TestClient):
+    """The NDJSON stream sends bare suggestions, then details, then done"""
+    import json
+
+    response = client.post(
+        "/api/v1/locations/autocomplete/stream", json={"query": "Times Square"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["event"] == "suggestions"
+    assert all(s["details"] is None for s in events[0]["data"]["suggestions"])
+    details = [event["data"] for event in events if event["event"] == "details"]
+    assert {d["place_id"] for d in details} == {"mock_place_1", "mock_place_2"}
+    assert events[-1] == {"event": "done", "data": {}}
+
+
+def test_stream_autocomplete_sse(client: TestClient):
+    """Clients accepting text/event-stream get Server-Sent Events"""
+    response = client.post(
+        "/api/v1/locations/autocomplete/stream",
+        json={"query": "Times Square", "include_details": False},
+        headers={"Accept": "text/event-stream"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = response.text.strip().split("\n\n")
+    assert messages[0].startswith("event: suggestions\ndata: ")
+    assert messages[-1] == "event: done\ndata: {}"
+    assert len(messages) == 2
+
+
+def test_stream_yields_details_as_they_complete():
+    """Fast detail lookups are streamed before slow ones finish"""
+    import asyncio
+
+    client = FakePlacesClient(["slow", "fast"], delay=0.01, slow=["slow"])
+    service = _real_service(client, details_timeout=2)
+
+    async def run():
+        events = []
+        async for event in service.stream_location_suggestions("Test"):
+            events.append(event)
+        return events
+
+    events = asyncio.run(run())
+
+    assert [s.place_id for s in events[0]] == ["slow", "fast"]
+    assert [event.place_id for event in events[1:]] == ["fast", "slow"]
+
+
+def test_batch_autocomplete(client: TestClient):
+    """A batch returns one result per query, in order"""
+    response = client.post(
+        "/api/v1/locations/autocomplete:batch",
+        json={"queries": ["Times Square", "times  square", "Soho"]}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["query"] for r in results] == ["Times Square", "times  square", "Soho"]
+    assert all(r["error"] is None and len(r["suggestions"]) > 0 for r in results)
+
+    response = client.post("/api/v1/locations/autocomplete:batch", json={"queries": []})
+    assert response.status_code == 422
+
+
+def test_batch_dedupes_queries_and_reports_errors_per_item():
+    """Duplicate queries share one lookup and failures stay per item"""
+    import asyncio
+    from src.core.exceptions import AppException
+
+    class FlakyClient(FakePlacesClient):
+        def places_autocomplete(self, input_text, types=None, language=None):
+            if input_text == "broken":
+                raise RuntimeError("upstream failure")
+            return super().places_autocomplete(input_text, types, language)
+
+    from src.services.cache import PlaceDetailsCache
+    from src.services.location_service import PLACE_FIELDS
+
+    client = FlakyClient(["place_1"], delay=0)
+    service = _real_service(
+        client, batch_concurrency=2, details_cache=PlaceDetailsCache(PLACE_FIELDS)
+    )
+
+    results = asyncio.run(
+        service.get_location_suggestions_batch(
+            ["Star Bucks", "star bucks", "broken", "Other"]
+        )
+    )
+
+    assert results[0] == results[1]
+    assert isinstance(results[2], AppException)
+    assert results[2].code == "google_maps_error"
+    assert results[3][0].place_id == "place_1"
+    assert client.autocomplete_calls == 2
+    assert len(client.place_calls) == 1
+
+
+def test_batch_reports_unexpected_errors_per_item(client: TestClient):
+    """A query raising an unexpected error gets an internal_error entry"""
+    from src.services.location_service import LocationService
+    from src.services.service_factory import get_location_service
+
+    class BrokenLocationService(LocationService):
+        async def get_location_suggestions(self, query, **kwargs):
+            if query == "broken":
+                raise RuntimeError("client bug")
+            return await super().get_location_suggestions(query, **kwargs)
+
+    service = BrokenLocationService(test_mode=True)
+    client.app.dependency_overrides[get_location_service] = lambda: service
+    response = client.post(
+        "/api/v1/locations/autocomplete:batch",
+        json={"queries": ["Times Square", "broken"], "include_details": False},
+    )
+
+    assert response.status_code == 200
+    first, broken = response.json()["results"]
+    assert len(first["suggestions"]) == 2 and first["error"] is None
+    assert broken["suggestions"] is None
+    assert broken["error"] == {"code": "internal_error", "message": "client bug"}
+
+
+def test_nearby_locations(client: TestClient):
+    """Nearby search returns indexed places within the radius, nearest first"""
+    response = client.get(
+        "/api/v1/locations/nearby",
+        params={"lat": 51.5, "lng": -0.12, "radius": 2000, "fields": ["rating"]},
+    )
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert [s["place_id"] for s in suggestions] == ["mock_place_2"]
+    assert 0 < suggestions[0]["distance_meters"] < 2000
+    assert suggestions[0]["details"]["rating"] == 4.8
+    assert suggestions[0]["details"]["website"] is None
+
+    response = client.get("/api/v1/locations/nearby", params={"lat": 91, "lng": 0})
+    assert response.status_code == 422
+
+
+def test_autocomplete_ranks_by_distance_from_near(client: TestClient):
+    """Suggestions are ordered by distance from the requested point"""
+    response = client.post(
+        "/api/v1/locations/autocomplete",
+        json={"query": "Mock", "near": {"lat": 51.5, "lng": -0.12}},
+    )
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert [s["place_id"] for s in suggestions] == ["mock_place_2", "mock_place_1"]
+    assert suggestions[0]["distance_meters"] < suggestions[1]["distance_meters"]
+
+
+def test_location_bias_is_sent_upstream_and_places_are_indexed():
+    """near/radius bias the upstream call and fetched places feed nearby search"""
+    import asyncio
+
+    coordinates = {"far": (48.8566, 2.3522), "close": (51.5080, -0.1280)}
+
+    class GeoClient(FakePlacesClient):
+        def places_autocomplete(self, input_text, types=None, language=None, **bias):
+            self.bias = bias
+            return super().places_autocomplete(input_text, types, language)
+
+        def place(self, place_id, fields=None):
+            response = super().place(place_id, fields)
+            lat, lng = coordinates[place_id]
+            response["result"]["geometry"]["location"] = {"lat": lat, "lng": lng}
+            return response
+
+    client = GeoClient(["far", "close"], delay=0)
+    service = _real_service(client)
+
+    async def scenario():
+        suggestions = await service.get_location_suggestions(
+            "cafe", near=(51.5074, -0.1278), radius=3000
+        )
+        nearby = await service.get_nearby_places(51.5074, -0.1278, 1000)
+        return suggestions, nearby
+
+    suggestions, nearby = asyncio.run(scenario())
+
+    assert client.bias == {"location": (51.5074, -0.1278), "radius": 3000}
+    assert [s.place_id for s in suggestions] == ["close", "far"]
+    assert suggestions[0].distance_meters < 100
+    assert [s.place_id for s in nearby] == ["close"]
+    assert nearby[0].main_text == "close"
+
+
+def test_invalid_upstream_details_are_not_cached():
+    """Upstream details are cached only once they pass validation"""
+    import asyncio
+    import json
+    from src.core.responses import dumps
+    from src.services.cache import PlaceDetailsCache
+    from src.services.location_service import PLACE_FIELDS
+
+    class BadPriceClient(FakePlacesClient):
+        def place(self, place_id, fields=None):
+            response = super().place(place_id, fields)
+            response["result"]["price_level"] = 9 if place_id == "bad" else 2
+            return response
+
+    client = BadPriceClient(["good", "bad"], delay=0)
+    details_cache = PlaceDetailsCache(PLACE_FIELDS)
+    service = _real_service(client, details_cache=details_cache)
+
+    first = asyncio.run(service.get_location_suggestions("query"))
+    second = asyncio.run(service.get_location_suggestions("query"))
+
+    assert first[0].details.price_level == 2
+    assert first[1].details is None
+    assert details_cache.get("bad", PLACE_FIELDS)[0] == {}
+    assert sorted(call[0] for call in client.place_calls) == ["bad", "bad", "good"]
+    assert json.loads(dumps(second)) == [s.model_dump() for s in first]
+
+
+def test_autocomplete_responses_are_cached_with_etag(client: TestClient):
+    """Repeat requests are served from the response cache and revalidate with 304"""
+    from src.services.location_service import LocationService
+    from src.services.service_factory import get_location_service
+
+    calls = []
+
+    class CountingLocationService(LocationService):
+        async def get_location_suggestions(self, query, **kwargs):
+            calls.append(query)
+            return await super().get_location_suggestions(query, **kwargs)
+
+    service = CountingLocationService(test_mode=True)
+    client.app.dependency_overrides[get_location_service] = lambda: service
+
+    first = client.post("/api/v1/locations/autocomplete", json={"query": "Times Square"})
+    second = client.get(
+        "/api/v1/locations/autocomplete", params={"query": "times  square"}
+    )
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert calls == ["Times Square"]
+    assert first.headers["cache-control"].startswith("public, max-age=")
+
+    revalidated = client.get(
+        "/api/v1/locations/autocomplete",
+        params={"query": "Times Square"},
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+    response = client.get("/api/v1/locations/autocomplete", params={"query": "x"})
+    assert response.status_code == 422
+
+
+def test_exhausted_budget_degrades_to_cached_or_detailless_results():
+    """Over budget, details fall back to the cache or are omitted"""
+    import asyncio
+    import pytest
+    from src.core.exceptions import AppException
+    from src.services.cache import PlaceDetailsCache
+    from src.services.location_service import PLACE_FIELDS
+    from src.services.rate_limit import UpstreamLimiter
+
+    client = FakePlacesClient(["place_1", "place_2"], delay=0)
+    details_cache = PlaceDetailsCache(PLACE_FIELDS)
+    details_cache.set(
+        "place_1",
+        {
+            "geometry": {"location": {"lat": 1.0, "lng": 2.0}},
+            "formatted_address": "place_1, Test City",
+            "name": "place_1",
+        },
+    )
+    service = _real_service(
+        client,
+        details_cache=details_cache,
+        autocomplete_limiter=UpstreamLimiter("autocomplete", rate=1, max_wait=0),
+        details_limiter=UpstreamLimiter("details", rate=1, burst=1, max_wait=0),
+    )
+    service.details_limiter.bucket.drain()
+
+    suggestions = asyncio.run(service.get_location_suggestions("query"))
+    assert suggestions[0].details.name == "place_1"
+    assert suggestions[1].details is None
+    assert client.place_calls == []
+
+    with pytest.raises(AppException) as error:
+        asyncio.run(service.get_location_suggestions("other query"))
+    assert error.value.code == "over_query_limit"
+    assert client.autocomplete_calls == 1
+
+
+def test_stale_results_are_served_and_refreshed_in_background():
+    """Expired suggestions are served at once while a refresh runs behind them"""
+    import asyncio
+    from src.services.cache import TieredCache, TTLCache
+
+    class Clock:
+        now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    clock = Clock()
+    client = FakePlacesClient(["place_1"], delay=0)
+    service = _real_service(
+        client,
+        result_cache=TieredCache(TTLCache(ttl=10, clock=clock, stale_ttl=100)),
+    )
+
+    async def scenario():
+        await service.get_location_suggestions("query", include_details=False)
+        clock.now = 20
+        client.place_ids = ["place_2"]
+        stale = await service.get_location_suggestions("query", include_details=False)
+        await asyncio.gather(*service._refreshes)
+        fresh = await service.get_location_suggestions("query", include_details=False)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    assert [s.place_id for s in stale] == ["place_1"]
+    assert [s.place_id for s in fresh] == ["place_2"]
+    assert client.autocomplete_calls == 2
+
+
+def test_open_circuit_fails_fast_and_falls_back_to_stale_details():
+    """With the circuit open, nothing goes upstream and stale details are served"""
+    import asyncio
+    import pytest
+    from src.core.exceptions import AppException
+    from src.services.cache import PlaceDetailsCache
+    from src.services.circuit_breaker import CircuitBreaker
+    from src.services.location_service import PLACE_FIELDS
+
+    class Clock:
+        now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    clock = Clock()
+    client = FakePlacesClient(["place_1"], delay=0)
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    details_cache = PlaceDetailsCache(
+        PLACE_FIELDS, ttl=10, volatile_ttl=10, stale_ttl=100, clock=clock
+    )
+    service = _real_service(
+        client, details_cache=details_cache, circuit_breaker=breaker
+    )
+
+    asyncio.run(service.get_location_suggestions("query"))
+    clock.now = 20
+    breaker.record_failure()
+
+    details = asyncio.run(service.get_place_details("place_1"))
+    assert details.name == "place_1"
+    with pytest.raises(AppException) as error:
+        asyncio.run(service.get_location_suggestions("other"))
+    assert error.value.code == "upstream_unavailable"
+    assert client.autocomplete_calls == 1
+    assert len(client.place_calls) == 1
+
+
+def test_session_token_supersedes_and_reaches_upstream():
+    """A newer query on a session cancels the older upstream call"""
+    import asyncio
+
+    from src.core.exceptions import AppException
+
+    class SessionClient(FakePlacesClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.tokens = []
+            self.cancelled = []
+
+        async def places_autocomplete(self, input_text, session_token=None, **kw):
+            self.tokens.append(session_token)
+            try:
+                await asyncio.sleep(0.05 if input_text == "st" else 0)
+            except asyncio.CancelledError:
+                self.cancelled.append(input_text)
+                raise
+            return FakePlacesClient.places_autocomplete(self, input_text)
+
+    client = SessionClient(["p1"], delay=0)
+    service = _real_service(client)
+
+    async def scenario():
+        first = asyncio.ensure_future(
+            service.get_location_suggestions(
+                "st", include_details=False, session_token="tok"
+            )
+        )
+        await asyncio.sleep(0.01)
+        second = await service.get_location_suggestions(
+            "sta", include_details=False, session_token="tok"
+        )
+        return await asyncio.gather(first, return_exceptions=True), second
+
+    (first,), second = asyncio.run(scenario())
+
+    assert isinstance(first, AppException)
+    assert first.code == "request_superseded"
+    assert [s.place_id for s in second] == ["p1"]
+    assert client.tokens == ["tok", "tok"]
+    assert client.cancelled == ["st"]
+
+
+def test_autocomplete_websocket(client: TestClient):
+    """The WebSocket answers each keystroke and reports invalid messages"""
+    with client.websocket_connect("/api/v1/locations/autocomplete/ws") as ws:
+        ws.send_json({"query": "Times Square", "include_details": False})
+        message = ws.receive_json()
+        assert message["query"] == "Times Square"
+        assert [s["place_id"] for s in message["suggestions"]] == [
+            "mock_place_1",
+            "mock_place_2",
+        ]
+        assert message["suggestions"][0]["details"] is None
+
+        ws.send_json({"query": "T"})
+        message = ws.receive_json()
+        assert message["query"] is None
+        assert message["error"]["code"] == "invalid_request"
+
+
+def test_autocomplete_websocket_reports_unexpected_errors(client: TestClient):
+    """An unexpected service error is answered with an internal_error message"""
+    from src.services.location_service import LocationService
+    from src.services.service_factory import get_location_service
+
+    class BrokenLocationService(LocationService):
+        async def get_location_suggestions(self, query, **kwargs):
+            if query == "broken":
+                raise RuntimeError("client bug")
+            return await super().get_location_suggestions(query, **kwargs)
+
+    service = BrokenLocationService(test_mode=True)
+    client.app.dependency_overrides[get_location_service] = lambda: service
+    with client.websocket_connect("/api/v1/locations/autocomplete/ws") as ws:
+        ws.send_json({"query": "broken"})
+        message = ws.receive_json()
+        assert message["query"] == "broken"
+        assert message["error"] == {"code": "internal_error", "message": "client bug"}
+        # The connection keeps answering later keystrokes
+        ws.send_json({"query": "Times Square"})
+        assert len(ws.receive_json()["suggestions"]) == 2
+
+
+def test_search_locations_filters_by_parsed_intent(client: TestClient):
+    """Free-text search returns the parsed intent and matching places only"""
+    response = client.post(
+        "/api/v1/locations/search",
+        json={"query": "coffee with delivery open now", "fields": ["website"]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["intent"]["query"] == "coffee"
+    assert data["intent"]["delivery"] is True
+    assert data["intent"]["open_now"] is True
+    # mock_place_2 neither delivers nor is open now
+    assert [s["place_id"] for s in data["suggestions"]] == ["mock_place_1"]
+    details = data["suggestions"][0]["details"]
+    assert details["delivery"] is True
+    assert details["website"] == "https://mock1.example.com"
+    assert details["rating"] is None
+
+
+def test_search_locations_biases_to_named_location():
+    """A location named in the request is resolved and used as search bias"""
+    import asyncio
+
+    class GeoClient(FakePlacesClient):
+        def places_autocomplete(self, input_text, types=None, language=None, **bias):
+            self.queries = getattr(self, "queries", []) + [(input_text, bias)]
+            return super().places_autocomplete(input_text, types, language)
+
+    client = GeoClient(["p1"], delay=0)
+    service = _real_service(client)
+
+    intent, suggestions = asyncio.run(
+        service.search_locations("cheap pizza near Kings Cross")
+    )
+
+    assert intent.location == "Kings Cross"
+    assert client.queries == [
+        ("Kings Cross", {}),
+        ("pizza", {"location": (1.0, 2.0), "radius": 2_000}),
+    ]
+    assert [s.place_id for s in suggestions] == ["p1"]
+
+
+def test_upstream_calls_and_cache_lookups_are_measured():
+    """Upstream outcomes, stage latency and cache results reach the metrics"""
+    import asyncio
+    from src.core.metrics import CACHE_LOOKUPS, STAGE_SECONDS, UPSTREAM_CALLS
+    from src.services.cache import PlaceDetailsCache, TieredCache, TTLCache
+    from src.services.location_service import PLACE_FIELDS
+
+    def snapshot():
+        return (
+            UPSTREAM_CALLS.value(endpoint="autocomplete", outcome="ok"),
+            UPSTREAM_CALLS.value(endpoint="details", outcome="ok"),
+            UPSTREAM_CALLS.value(endpoint="details", outcome="error"),
+            STAGE_SECONDS.count(stage="autocomplete"),
+            STAGE_SECONDS.count(stage="build_details"),
+            CACHE_LOOKUPS.value(cache="suggestions", result="miss"),
+            CACHE_LOOKUPS.value(cache="suggestions", result="hit"),
+            CACHE_LOOKUPS.value(cache="details", result="hit"),
+        )
+
+    client = FakePlacesClient(["place_1", "place_2"], delay=0, failing={"place_2"})
+    service = _real_service(
+        client,
+        result_cache=TieredCache(TTLCache(max_size=10, ttl=60)),
+        details_cache=PlaceDetailsCache(PLACE_FIELDS, ttl=60),
+    )
+    before = snapshot()
+    asyncio.run(service.get_location_suggestions("metrics query"))
+    asyncio.run(service.get_location_suggestions("metrics query"))
+    after = snapshot()
+
+    # place_2 fails on both queries; place_1's details are cached for the second
+    assert [b - a for a, b in zip(before, after)] == [1, 1, 2, 1, 2, 1, 1, 1]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+from src.models.location import LocationDetails, LocationIntent, LocationSuggestion
+from src.services.local_llm_provider import LocalLLMProvider
+from src.services.location_intent import (
+    LocationIntentParser,
+    intent_fields,
+    parse_intent_rules,
+    rank_by_intent,
+)
+
+
+def test_keyword_rules_extract_filters_and_location():
+    """The fallback rules split filters and location from the query"""
+    intent = parse_intent_rules("cheap vegan takeaway near Kings Cross open now")
+
+    assert intent == LocationIntent(
+        query="vegan takeaway",
+        types=["meal_takeaway"],
+        max_price_level=1,
+        open_now=True,
+        location="Kings Cross",
+    )
+    assert parse_intent_rules("pizza delivery").delivery is True
+    assert intent_fields(intent, ["website"]) == [
+        "website", "types", "price_level", "opening_hours"
+    ]
+    assert intent_fields(intent, None) is None
+
+
+def test_intents_are_parsed_once_per_normalized_input():
+    """LLM intents are cached per normalized input and invalid output falls back"""
+    def respond(prompt):
+        text = prompt.rsplit("Request: ", 1)[1]
+        if "broken" in text:
+            return "Sure! Here is your intent."
+        return "```json\n" + json.dumps({"query": "sushi", "dine_in": True}) + "\n```"
+
+    provider = LocalLLMProvider(responder=respond)
+    parser = LocationIntentParser(provider)
+
+    async def run():
+        first = await asyncio.gather(
+            parser.parse("Sushi  to eat in"), parser.parse("sushi to eat in")
+        )
+        again = await parser.parse("SUSHI to eat in")
+        fallback = await parser.parse("broken cheap cafe")
+        return first, again, fallback
+
+    first, again, fallback = asyncio.run(run())
+
+    assert first[0] == first[1] == again
+    assert again.query == "sushi" and again.dine_in is True
+    assert fallback.query == "broken cafe" and fallback.max_price_level == 1
+    assert provider.calls == 2
+    assert parser.stats.as_dict() == {"parsed": 2, "cached": 1, "fallbacks": 1}
+
+
+
+def test_registry_builds_the_llm_only_for_intent_parsing():
+    """Intents come from keyword rules unless LLM parsing is enabled"""
+    from src.core.config import Settings
+    from src.services.llm_cache import CachingLLMProvider
+    from src.services.service_registry import ServiceRegistry
+
+    rules = ServiceRegistry.from_settings(Settings(google_maps_api_key="unused"))
+    llm = ServiceRegistry.from_settings(
+        Settings(google_maps_api_key="unused", intent_llm=True)
+    )
+
+    async def run():
+        try:
+            return [
+                await registry.location_service.intent_parser.parse(
+                    "cheap cafe open now"
+                )
+                for registry in (rules, llm)
+            ]
+        finally:
+            await rules.aclose()
+            await llm.aclose()
+
+    intents = asyncio.run(run())
+
+    assert rules.llm is None
+    assert rules.location_service.intent_parser.llm is None
+    assert rules.location_service.intent_parser.stats.fallbacks == 0
+    parser = llm.location_service.intent_parser
+    assert isinstance(llm.llm, CachingLLMProvider) and parser.llm is llm.llm
+    # The local provider echoes the prompt, which is not an intent
+    assert llm.llm.stats.misses == 1 and parser.stats.fallbacks == 1
+    assert intents == [parse_intent_rules("cheap cafe open now")] * 2
+
+
+def test_rank_by_intent_drops_contradicting_places():
+    """Known mismatches are dropped and better matches ranked first"""
+    def suggestion(place_id, **details):
+        return LocationSuggestion(
+            place_id=place_id,
+            description=place_id,
+            main_text=place_id,
+            details=LocationDetails(
+                latitude=0, longitude=0, formatted_address=place_id, name=place_id,
+                **details,
+            ),
+        )
+
+    intent = LocationIntent(
+        query="takeaway", types=["meal_takeaway"], max_price_level=1, delivery=True
+    )
+    ranked = rank_by_intent(
+        [
+            suggestion("unknown"),
+            suggestion("pricey", price_level=3, delivery=True),
+            suggestion("match", price_level=1, delivery=True),
+            suggestion("typed", types=["meal_takeaway"], delivery=True),
+            suggestion("no_delivery", delivery=False),
+        ],
+        intent,
+    )
+
+    assert [s.place_id for s in ranked] == ["match", "typed", "unknown"]
@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+
+
+def test_metrics_render_prometheus_text():
+    """Counters and histograms render in the text exposition format"""
+    import pytest
+    from src.core.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", labels=("outcome",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    calls.inc(outcome="ok")
+    calls.inc(2, outcome="error")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    assert registry.render().splitlines() == [
+        "# HELP calls_total Calls",
+        "# TYPE calls_total counter",
+        'calls_total{outcome="error"} 2',
+        'calls_total{outcome="ok"} 1',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+    assert latency.count() == 3
+    with pytest.raises(ValueError):
+        calls.inc(status="ok")
+    with pytest.raises(ValueError):
+        registry.counter("calls_total", "Duplicate")
+
+
+def test_metrics_endpoint_reports_requests_and_errors(client: TestClient):
+    """Request latency by route template, error codes and Server-Timing"""
+    from src.core.metrics import ERRORS, REQUEST_SECONDS, STAGE_SECONDS
+
+    labels = {
+        "method": "POST", "route": "/api/v1/locations/autocomplete", "status": "200",
+    }
+    requests = REQUEST_SECONDS.count(**labels)
+    serialized = STAGE_SECONDS.count(stage="serialization")
+    missing = {
+        "method": "GET", "route": "/api/v1/locations/{place_id}", "status": "400",
+    }
+    failures = REQUEST_SECONDS.count(**missing)
+    errors = ERRORS.value(code="place_details_error")
+
+    response = client.post(
+        "/api/v1/locations/autocomplete", json={"query": "Metrics Square"}
+    )
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("app;dur=")
+    assert client.get("/api/v1/locations/unknown_place").status_code == 400
+
+    assert REQUEST_SECONDS.count(**labels) == requests + 1
+    assert STAGE_SECONDS.count(stage="serialization") > serialized
+    assert REQUEST_SECONDS.count(**missing) == failures + 1
+    assert ERRORS.value(code="place_details_error") == errors + 1
+
+    response = client.get("/api/v1/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'shopai_http_request_duration_seconds_count{method="POST",'
+        'route="/api/v1/locations/autocomplete",status="200"}'
+    ) in response.text
+    assert "# TYPE shopai_upstream_calls_total counter" in response.text
@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+from src.services.gazetteer import Gazetteer, GazetteerPlace
+from src.services.location_service import LocationService
+from src.services.place_index import PlaceIndex, build_place_index
+
+
+def _places():
+    return [
+        GazetteerPlace.from_record(record)
+        for record in [
+            {
+                "place_id": "sb1", "name": "Starbucks Reserve", "lat": 51.5,
+                "lng": -0.12, "address": "Starbucks Reserve, 1 Strand, London",
+                "types": "cafe|food", "rating": "4.2", "user_ratings_total": "900",
+                "editorial_summary": "Roastery",
+            },
+            {
+                "place_id": "sb2", "name": "Starbucks", "lat": 51.6, "lng": -0.1,
+                "address": "Starbucks, 22 King's Road, London",
+                "user_ratings_total": "50",
+            },
+            {
+                "place_id": "st1", "name": "Star Pizza", "lat": 51.4, "lng": -0.11,
+                "address": "Star Pizza, 5 Camden Street, London",
+                "user_ratings_total": "300",
+            },
+            {"place_id": "mo1", "name": "Café Montmartre", "lat": 48.88,
+             "lng": 2.34, "address": "Paris"},
+        ]
+    ]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "places.idx")
+    assert build_place_index(_places(), path) == 4
+    index = PlaceIndex.open(path)
+    yield index
+    index.close()
+
+
+def test_search_matches_in_memory_gazetteer(index: PlaceIndex):
+    """The mapped index ranks prefix queries like the in-memory gazetteer"""
+    gazetteer = Gazetteer(_places())
+    for query in ["starb", "star", "star camden", "cafe mont", "london"]:
+        expected = [place.place_id for _, place in gazetteer.search(query)]
+        actual = [place.place_id for _, place in index.search(query)]
+        assert actual == expected, query
+    assert index.search("zzz") == []
+
+
+def test_lookup_and_zero_copy_coordinates(index: PlaceIndex):
+    """Places decode on demand and coordinates are exposed as mapped arrays"""
+    place = index.get("sb1")
+    assert place == _places()[0]
+    assert index.get("unknown") is None
+    assert len(index) == 4
+    assert list(index.latitudes) == [51.5, 51.6, 51.4, 48.88]
+    assert index.longitudes.format == "d"
+
+
+def test_index_backs_location_service(index: PlaceIndex):
+    """Top hits are decoded into suggestions with details by LocationService"""
+    service = LocationService(test_mode=False, client=index)
+    results = asyncio.run(service.get_location_suggestions("starbucks res"))
+
+    expected = [place.place_id for _, place in index.search("starbucks res")]
+    assert [s.place_id for s in results] == expected
+    assert results[0].details.editorial_summary == "Roastery"
+    assert results[0].details.user_ratings_total == 900
+
+
+def test_rejects_foreign_files(tmp_path):
+    """Opening a file that is not a place index fails cleanly"""
+    path = tmp_path / "bogus.idx"
+    path.write_bytes(b"not an index" * 10)
+    with pytest.raises(ValueError):
+        PlaceIndex.open(str(path))
+
+
+def test_nearby_search_reads_the_mapped_coordinates(index: PlaceIndex):
+    """Index-backed services answer nearby searches without copying places"""
+    from src.core.config import Settings
+    from src.services.service_registry import ServiceRegistry
+
+    near = index.nearby(51.5, -0.12, radius=15_000)
+    assert [place_id for place_id, _ in near] == ["sb1", "st1", "sb2"]
+    assert near[0][1] == 0.0
+    assert index.nearby(51.5, -0.12, radius=15_000, limit=1) == near[:1]
+    assert index.nearby(0.0, 0.0, radius=1_000) == []
+    distances = index.distances(51.5, -0.12, ["st1", "unknown"])
+    assert distances[0] == near[1][1] and distances[1] is None
+
+    settings = Settings(
+        google_maps_api_key="unused",
+        location_backend="gazetteer",
+        gazetteer_path=index.path,
+    )
+    registry = ServiceRegistry.from_settings(settings)
+    service = registry.location_service
+    # A place fetched since startup moves in the grid and wins over the index
+    service.geo_index.add("st1", 51.501, -0.12)
+    assert len(service.geo_index) == 1
+
+    async def run():
+        try:
+            return await service.get_nearby_places(51.5, -0.12, 15_000)
+        finally:
+            await registry.aclose()
+
+    nearby = asyncio.run(run())
+
+    assert [s.place_id for s in nearby] == ["sb1", "st1", "sb2"]
+    assert service.geo_index.distances(51.5, -0.12, ["st1", "sb2"])[1] == near[2][1]
+
+
+def test_nearby_search_scans_only_the_cells_in_range(tmp_path, monkeypatch):
+    """Grid lookups match a full scan, across the antimeridian and near a pole"""
+    import numpy as np
+
+    from src.services import place_index
+    from src.services.geo_index import haversine_m
+
+    rng = np.random.default_rng(7)
+    centers = [(51.5, -0.12), (0.0, 179.99), (-0.01, -179.99), (89.5, 10.0)]
+    places = [
+        GazetteerPlace.from_record(
+            {
+                "place_id": f"p{number}",
+                "name": f"Shop {number}",
+                "lat": float(np.clip(lat + rng.normal(0, 0.3), -90, 90)),
+                "lng": float((lng + rng.normal(0, 0.3) + 180) % 360 - 180),
+            }
+        )
+        for number, (lat, lng) in enumerate(centers * 500)
+    ]
+    path = str(tmp_path / "grid.idx")
+    build_place_index(places, path)
+    index = PlaceIndex.open(path)
+    scanned = []
+
+    def counting_haversine(lat, lng, lats, lngs):
+        scanned.append(lats.size)
+        return haversine_m(lat, lng, lats, lngs)
+
+    monkeypatch.setattr(place_index, "haversine_m", counting_haversine)
+    lats = np.array([place.latitude for place in places])
+    lngs = np.array([place.longitude for place in places])
+    try:
+        for lat, lng in centers + [(89.99, -170.0), (10.0, 10.0)]:
+            for radius in (2_000, 25_000, 400_000):
+                found = index.nearby(lat, lng, radius, limit=len(places))
+                distances = haversine_m(lat, lng, lats, lngs)
+                expected = {
+                    place.place_id
+                    for place, distance in zip(places, distances)
+                    if distance <= radius
+                }
+                assert {place_id for place_id, _ in found} == expected
+                assert [d for _, d in found] == sorted(d for _, d in found)
+        index.nearby(51.5, -0.12, radius=5_000)
+        assert scanned[-1] < len(places) // 20
+    finally:
+        index.close()
@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+from googlemaps import exceptions
+
+from src.services.places_client import AsyncPlacesClient
+
+
+def _client(handler, **kwargs) -> AsyncPlacesClient:
+    return AsyncPlacesClient(
+        key="test-key", transport=httpx.MockTransport(handler), **kwargs
+    )
+
+
+def test_autocomplete_request_and_payload():
+    """Autocomplete sends googlemaps-style params and returns predictions"""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(
+            200, json={"status": "OK", "predictions": [{"place_id": "p1"}]}
+        )
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.places_autocomplete(
+                "Times Square", types=["geocode", "establishment"], language="en"
+            )
+
+    predictions = asyncio.run(run())
+
+    assert predictions == [{"place_id": "p1"}]
+    params = seen[0].url.params
+    assert seen[0].url.path == "/maps/api/place/autocomplete/json"
+    assert params["input"] == "Times Square"
+    assert params["types"] == "geocode|establishment"
+    assert params["key"] == "test-key"
+
+
+def test_place_joins_fields():
+    """Details requests send a comma separated field mask"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["fields"] == "name,geometry"
+        assert request.url.params["placeid"] == "p1"
+        return httpx.Response(200, json={"status": "OK", "result": {"name": "x"}})
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.place("p1", fields=["name", "geometry"])
+
+    assert asyncio.run(run())["result"] == {"name": "x"}
+
+
+def test_retries_retriable_status_and_over_query_limit(monkeypatch):
+    """5xx and OVER_QUERY_LIMIT responses are retried before succeeding"""
+    monkeypatch.setattr("src.services.places_client.asyncio.sleep", _no_sleep)
+    responses = [
+        httpx.Response(503),
+        httpx.Response(200, json={"status": "OVER_QUERY_LIMIT"}),
+        httpx.Response(200, json={"status": "ZERO_RESULTS", "predictions": []}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.places_autocomplete("nowhere")
+
+    assert asyncio.run(run()) == []
+    assert responses == []
+
+
+def test_api_error_and_retry_exhaustion(monkeypatch):
+    """Non-OK statuses raise ApiError and exhausted retries raise Timeout"""
+    monkeypatch.setattr("src.services.places_client.asyncio.sleep", _no_sleep)
+
+    def denied(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"status": "REQUEST_DENIED"})
+
+    def unavailable(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    async def run(handler, **kwargs):
+        async with _client(handler, **kwargs) as client:
+            return await client.place("p1")
+
+    with pytest.raises(exceptions.ApiError) as error:
+        asyncio.run(run(denied))
+    assert error.value.status == "REQUEST_DENIED"
+
+    with pytest.raises(exceptions.Timeout):
+        asyncio.run(run(unavailable, max_retries=2))
+
+
+async def _no_sleep(delay: float) -> None:
+    return None
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from src.services.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    RateLimited,
+    TokenBucket,
+    UpstreamLimiter,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_rate_and_caps_at_burst():
+    """Tokens are spent by cost, refilled over time and capped at the burst"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=5, clock=clock)
+
+    assert bucket.try_acquire(cost=3)
+    assert bucket.try_acquire(cost=2)
+    assert not bucket.try_acquire()
+
+    clock.now = 0.25
+    assert bucket.tokens == pytest.approx(2.5)
+    clock.now = 60
+    assert bucket.tokens == 5
+
+    bucket.drain()
+    assert not bucket.try_acquire(cost=0.5)
+
+
+def test_token_bucket_acquire_waits_within_timeout():
+    """acquire waits for the refill only if it arrives before the timeout"""
+    bucket = TokenBucket(rate=100, burst=1)
+    assert bucket.try_acquire()
+
+    assert asyncio.run(bucket.acquire(timeout=0.1))
+    assert not asyncio.run(bucket.acquire(cost=1, timeout=0.001))
+
+
+def test_adaptive_limit_grows_while_fast_and_backs_off_when_slow():
+    """The limit grows additively on fast calls and shrinks on slow ones"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8)
+
+    async def call(latency):
+        assert await limiter.acquire()
+        limiter.release(latency)
+
+    async def scenario():
+        for _ in range(40):
+            await call(0.01)
+        grown = limiter.limit
+        await call(0.5)
+        return grown, limiter.limit
+
+    grown, backed_off = asyncio.run(scenario())
+    assert grown > 6
+    assert backed_off == pytest.approx(grown * 0.9)
+
+    limiter.in_flight += 1
+    limiter.release(overloaded=True)
+    assert limiter.limit == pytest.approx(backed_off * 0.9)
+
+
+def test_concurrency_slots_are_handed_to_waiters():
+    """Waiters get freed slots in order and time out when none frees up"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_limit=1)
+
+    async def scenario():
+        assert await limiter.acquire()
+        assert not await limiter.acquire(timeout=0.01)
+        waiter = asyncio.ensure_future(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        limiter.release()
+        return await waiter
+
+    assert asyncio.run(scenario())
+    assert limiter.in_flight == 1
+
+
+def test_upstream_limiter_throttles_and_backs_off_on_overload():
+    """Exhausted budgets raise RateLimited; overload drains the bucket"""
+    limiter = UpstreamLimiter("details", rate=1, burst=2, max_wait=0)
+
+    async def ok():
+        return "ok"
+
+    async def over_quota():
+        raise RuntimeError("OVER_QUERY_LIMIT")
+
+    async def scenario():
+        assert await limiter.run(ok) == "ok"
+        with pytest.raises(RuntimeError):
+            await limiter.run(
+                over_quota, is_overload=lambda e: "OVER_QUERY_LIMIT" in str(e)
+            )
+        with pytest.raises(RateLimited):
+            await limiter.run(ok)
+
+    asyncio.run(scenario())
+    assert limiter.stats.as_dict() == {"admitted": 2, "throttled": 1, "overloaded": 1}
+    assert limiter.concurrency.in_flight == 0
+    assert limiter.concurrency.limit < 10
@@ -0,0 +1,140 @@
+import asyncio
+import gzip
+import json
+
+from starlette.requests import Request
+
+from src.core.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(**headers) -> Request:
+    raw = [
+        (name.replace("_", "-").encode(), value.encode())
+        for name, value in headers.items()
+    ]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_serve_encodes_once_and_replays_bytes():
+    """A hit replays the stored body without producing the content again"""
+    cache = ResponseCache(ttl=30)
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        return {"suggestions": [{"place_id": "p1"}]}
+
+    first = asyncio.run(cache.serve(_request(), "key", produce))
+    second = asyncio.run(cache.serve(_request(), "key", produce))
+
+    assert len(calls) == 1
+    assert first.body == second.body
+    assert json.loads(first.body) == {"suggestions": [{"place_id": "p1"}]}
+    assert first.headers["etag"].startswith('W/"')
+    assert first.headers["cache-control"] == "public, max-age=30"
+    assert cache.stats.hits == 1
+
+
+def test_if_none_match_returns_304():
+    """A matching If-None-Match gets an empty 304 with the same ETag"""
+    cache = ResponseCache()
+    entry = cache.put("key", {"a": 1})
+
+    response = cache.render(entry, _request(if_none_match=f'"other", {entry.etag}'))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == entry.etag
+
+    response = cache.render(entry, _request(if_none_match='"other"'))
+    assert response.status_code == 200
+
+
+def test_large_bodies_are_gzipped_for_clients_that_accept_it():
+    """Bodies above the threshold are stored and served gzipped when accepted"""
+    cache = ResponseCache(gzip_min_size=100)
+    small = cache.put("small", {"a": 1})
+    large = cache.put("large", {"text": "x" * 500})
+    assert small.gzipped is None
+
+    response = cache.render(large, _request(accept_encoding="br, gzip"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body) == large.body
+
+    response = cache.render(large, _request(accept_encoding="gzip;q=0"))
+    assert "content-encoding" not in response.headers
+    assert response.body == large.body
+
+
+def test_entries_expire_after_ttl():
+    """Entries are produced again once the TTL has elapsed"""
+    clock = FakeClock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.put("key", {"a": 1})
+
+    clock.now = 11
+    assert cache.get("key") is None
+
+
+def test_degraded_responses_are_not_cached_as_complete():
+    """Detail-less or stale results are sent no-store, or cached briefly"""
+    from src.core.degraded import track_degraded
+    from src.services.cache import TieredCache, TTLCache
+    from src.services.location_service import LocationService
+    from src.services.synthetic_places import SyntheticPlaces
+
+    class FlakyPlaces(SyntheticPlaces):
+        failing = True
+
+        async def place(self, place_id, fields=None, **kwargs):
+            if FlakyPlaces.failing:
+                raise RuntimeError("details unavailable")
+            return await super().place(place_id, fields, **kwargs)
+
+    clock = FakeClock()
+    service = LocationService(
+        test_mode=False,
+        client=FlakyPlaces.generate(count=100, seed=3, limit=2),
+        result_cache=TieredCache(
+            TTLCache(max_size=10, ttl=10, stale_ttl=60, clock=clock)
+        ),
+    )
+    cache = ResponseCache(ttl=30)
+    brief = ResponseCache(ttl=30, degraded_ttl=5)
+
+    async def produce():
+        return {"suggestions": await service.get_location_suggestions("coffee")}
+
+    async def coalesced():
+        async def lookup():
+            with track_degraded() as degraded:
+                await service.get_location_suggestions("books")
+            return degraded
+
+        return await asyncio.gather(lookup(), lookup())
+
+    degraded = asyncio.run(cache.serve(_request(), "key", produce))
+    assert degraded.headers["cache-control"] == "no-store"
+    assert len(cache) == 0
+    briefly = asyncio.run(brief.serve(_request(), "key", produce))
+    assert briefly.headers["cache-control"] == "public, max-age=5"
+    assert brief.get("key").max_age == 5
+    # Callers that joined another's details lookup are marked as well
+    assert asyncio.run(coalesced()) == [{"details_unavailable"}] * 2
+
+    FlakyPlaces.failing = False
+    complete = asyncio.run(cache.serve(_request(), "key", produce))
+    assert complete.headers["cache-control"] == "public, max-age=30"
+    assert len(cache) == 1
+
+    clock.now = 20
+    stale = asyncio.run(cache.serve(_request(), "stale", produce))
+    assert stale.headers["cache-control"] == "no-store"
+    assert stale.body == complete.body
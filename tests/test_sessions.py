@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from src.services.sessions import SessionRegistry, Superseded
+
+
+def test_newer_request_supersedes_older_one():
+    """A newer request on a session cancels the older one; other sessions run on"""
+    cancelled = []
+
+    async def search(query, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        return query
+
+    async def run():
+        sessions = SessionRegistry()
+        first = asyncio.ensure_future(sessions.run("s1", lambda: search("st", 0.05)))
+        other = asyncio.ensure_future(sessions.run("s2", lambda: search("ca", 0.01)))
+        await asyncio.sleep(0.005)
+        second = await sessions.run("s1", lambda: search("sta", 0.01))
+        with pytest.raises(Superseded):
+            await first
+        return sessions, second, await other
+
+    sessions, second, other = asyncio.run(run())
+
+    assert (second, other) == ("sta", "ca")
+    assert cancelled == ["st"]
+    assert sessions.stats.as_dict() == {"started": 3, "superseded": 1, "debounced": 0}
+
+
+def test_keystroke_bursts_are_debounced():
+    """Only requests closely following the previous one on a session wait"""
+    calls = []
+
+    async def search(query):
+        calls.append(query)
+        return query
+
+    async def run():
+        sessions = SessionRegistry(debounce=0.05)
+        assert await sessions.run("s", lambda: search("s")) == "s"
+        second = asyncio.ensure_future(sessions.run("s", lambda: search("st")))
+        await asyncio.sleep(0.01)
+        third = await sessions.run("s", lambda: search("sta"))
+        with pytest.raises(Superseded):
+            await second
+        return sessions, third
+
+    sessions, third = asyncio.run(run())
+
+    # The debounced "st" never reached the search
+    assert calls == ["s", "sta"]
+    assert third == "sta"
+    assert sessions.stats.debounced == 2
+
+
+def test_forgets_least_recently_active_sessions():
+    """The registry remembers at most max_sessions sessions"""
+    async def run():
+        sessions = SessionRegistry(max_sessions=2)
+        for token in ("a", "b", "c"):
+            await sessions.run(token, lambda: asyncio.sleep(0))
+        return sessions
+
+    assert len(asyncio.run(run())) == 2
@@ -0,0 +1,177 @@
+import asyncio
+import time
+
+import pytest
+
+from src.services.shared_cache import RedisCache, SharedMemoryCache, read_reply
+
+
+def test_shared_memory_cache_is_seen_by_every_process(tmp_path):
+    """Two handles on one file share entries, expiry and eviction"""
+    path = str(tmp_path / "cache")
+    first = SharedMemoryCache(path, slots=4, slot_size=128, ttl=60, max_probes=4)
+    second = SharedMemoryCache(path, slots=4, slot_size=128, ttl=60, max_probes=4)
+
+    async def run():
+        await first.set_many({"a": {"n": 1}, "b": [1, 2], "c": "x"})
+        await first.set("gone", 1, ttl=-1)
+        await first.set("big", "x" * 200)
+        found = await second.get_many(["a", "b", "c", "gone", "big", "d"])
+        await second.set("a", {"n": 2})
+        updated = await first.get("a")
+        # A fifth live key evicts the entry closest to expiry
+        await second.set("short", 0, ttl=1)
+        await second.set("e", 5)
+        return found, updated, await first.get_many(["short", "e", "b"])
+
+    found, updated, after_eviction = asyncio.run(run())
+
+    assert found == [{"n": 1}, [1, 2], "x", None, None, None]
+    assert updated == {"n": 2}
+    assert after_eviction == [None, 5, [1, 2]]
+    assert second.stats.expirations == 1
+    assert second.stats.evictions == 1
+    with pytest.raises(ValueError):
+        SharedMemoryCache(path, slots=8, slot_size=128)
+    first.close()
+    first.close()
+    second.close()
+
+
+class FakeRedis:
+    """Stand-in Redis server speaking enough RESP for RedisCache."""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.batches = []
+
+    async def handle(self, reader, writer):
+        authed = self.password is None
+        while True:
+            try:
+                command = await read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                break
+            # Commands already buffered arrived in the same pipeline
+            batch = [command]
+            while reader._buffer:
+                batch.append(await read_reply(reader))
+            self.batches.append([c[0].decode().upper() for c in batch])
+            for name, *args in batch:
+                name = name.decode().upper()
+                self.commands.append((name, args))
+                if name == "AUTH":
+                    authed = args[0].decode() == self.password
+                    writer.write(b"+OK\r\n" if authed else b"-ERR invalid password\r\n")
+                elif not authed:
+                    writer.write(b"-NOAUTH Authentication required.\r\n")
+                elif name == "SELECT":
+                    writer.write(b"+OK\r\n")
+                elif name == "SET":
+                    expires = time.time() + int(args[3]) / 1000
+                    self.data[args[0]] = (args[1], expires)
+                    writer.write(b"+OK\r\n")
+                elif name == "MGET":
+                    writer.write(b"*%d\r\n" % len(args))
+                    for key in args:
+                        value, expires = self.data.get(key, (None, 0))
+                        if value is None or expires <= time.time():
+                            writer.write(b"$-1\r\n")
+                        else:
+                            writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def test_redis_cache_pipelines_concurrent_calls():
+    """Lookups of one tick share an MGET; writes precede it in the pipeline"""
+    fake = FakeRedis(password="s3cret")
+
+    async def run():
+        server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        cache = RedisCache.from_url(f"redis://:s3cret@127.0.0.1:{port}/2", ttl=60)
+        try:
+            await cache.set_many({"a": {"n": 1}, "b": [1, 2]})
+            fake.batches.clear()
+            found = await asyncio.gather(
+                cache.set("c", "x"),
+                *(cache.get(key) for key in ("a", "b", "c", "a", "missing")),
+            )
+            bulk = await cache.get_many(["b", "c"])
+            await cache.set("gone", 1, ttl=0.001)
+            await asyncio.sleep(0.01)
+            gone = await cache.get("gone")
+        finally:
+            cache.close()
+            server.close()
+            await server.wait_closed()
+        unreachable = RedisCache(port=port, timeout=0.2)
+        return found[1:], bulk, gone, await unreachable.get("a"), unreachable
+
+    found, bulk, gone, unreachable_value, unreachable = asyncio.run(run())
+
+    assert found == [{"n": 1}, [1, 2], "x", {"n": 1}, None]
+    assert bulk == [[1, 2], "x"]
+    assert gone is None
+    assert fake.batches[0] == ["SET", "MGET"]
+    mget = [args for name, args in fake.commands if name == "MGET"][0]
+    assert mget == [b"shopai:a", b"shopai:b", b"shopai:c", b"shopai:missing"]
+    assert [name for name, _ in fake.commands[:2]] == ["AUTH", "SELECT"]
+    assert unreachable_value is None and unreachable.stats.misses == 1
+
+
+def test_place_details_are_shared_between_workers(tmp_path):
+    """A worker reuses details another fetched, keeping their fetch time"""
+    from src.services.cache import PlaceDetailsCache
+    from src.services.location_service import (
+        PLACE_FIELDS,
+        VOLATILE_PLACE_FIELDS,
+        LocationService,
+    )
+    from src.services.synthetic_places import SyntheticPlaces
+
+    class CountingPlaces(SyntheticPlaces):
+        details_calls = 0
+
+        async def place(self, place_id, fields=None, **kwargs):
+            CountingPlaces.details_calls += 1
+            return await super().place(place_id, fields, **kwargs)
+
+    places = CountingPlaces.generate(count=200, seed=1, limit=3)
+    path = str(tmp_path / "details")
+
+    def worker():
+        return LocationService(
+            test_mode=False,
+            client=places,
+            details_cache=PlaceDetailsCache(
+                PLACE_FIELDS, volatile_fields=VOLATILE_PLACE_FIELDS
+            ),
+            shared_details=SharedMemoryCache(path, slots=64, slot_size=4096),
+        )
+
+    first, second = worker(), worker()
+
+    async def run():
+        try:
+            one = await first.get_location_suggestions("coffee")
+            calls = CountingPlaces.details_calls
+            two = await second.get_location_suggestions("coffee")
+            return one, calls, two
+        finally:
+            await first.aclose()
+            await second.aclose()
+
+    one, calls, two = asyncio.run(run())
+
+    assert calls == 3
+    assert CountingPlaces.details_calls == 3
+    assert [s.details for s in two] == [s.details for s in one]
+    assert second.shared_details.stats.hits == 3
+    exported = second.details_cache.export(one[0].place_id)
+    assert 0 <= exported["volatile_age"] < 5
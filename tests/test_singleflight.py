@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from src.services.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    """Concurrent callers for the same key receive one shared result"""
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(
+            *(flight.do("a", lambda: fetch("a")) for _ in range(5)),
+            flight.do("b", lambda: fetch("b")),
+        )
+        return flight, results
+
+    flight, results = asyncio.run(run())
+
+    assert results == ["A"] * 5 + ["B"]
+    assert calls == ["a", "b"]
+    assert flight.stats.as_dict() == {"executed": 2, "coalesced": 4}
+    assert len(flight) == 0
+
+
+def test_errors_propagate_to_every_waiter():
+    """A failing shared call raises the same error for all waiters"""
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.do("a", fail), flight.do("a", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    """Cancelling the first caller leaves the shared call running for others"""
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("a", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("a", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_abandoned_call_is_cancelled():
+    """With cancel_abandoned the shared call stops once every waiter has left"""
+    started = []
+
+    async def fetch():
+        started.append(True)
+        await asyncio.sleep(1)
+        return "done"
+
+    async def run():
+        flight = SingleFlight(cancel_abandoned=True)
+        first = asyncio.ensure_future(flight.do("a", fetch))
+        second = asyncio.ensure_future(flight.do("a", fetch))
+        await asyncio.sleep(0)
+        shared = flight._calls["a"]
+        first.cancel()
+        await asyncio.sleep(0)
+        assert not shared.cancelled()
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flight, shared
+
+    flight, shared = asyncio.run(run())
+
+    assert shared.cancelled()
+    assert len(flight) == 0
+    assert started == [True]
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from src.services.synthetic_places import SyntheticPlaces, synthetic_places
+
+
+def test_corpus_is_seeded_and_prefix_searchable():
+    """The same seed yields the same places; queries match by prefix"""
+    assert synthetic_places(50, seed=4) == synthetic_places(50, seed=4)
+    assert synthetic_places(50, seed=4) != synthetic_places(50, seed=5)
+
+    places = SyntheticPlaces.generate(count=2_000, seed=4, limit=8)
+
+    async def run():
+        predictions = await places.places_autocomplete("golden cof")
+        details = await places.place(predictions[0]["place_id"])
+        return predictions, details
+
+    predictions, details = asyncio.run(run())
+
+    assert len(places) == 2_000
+    assert len(predictions) == 8
+    assert all(
+        p["structured_formatting"]["main_text"] == "Golden Coffee" for p in predictions
+    )
+    result = details["result"]
+    assert "cafe" in result["types"]
+    assert len(result["opening_hours"]["weekday_text"]) == 7
+    assert result["editorial_summary"]["overview"]
+
+
+def test_calls_take_the_simulated_latency():
+    """Every call waits latency plus jitter"""
+    places = SyntheticPlaces.generate(count=100, latency=0.02, jitter=0.01)
+
+    async def run():
+        started = time.perf_counter()
+        await places.places_autocomplete("books")
+        await places.place("syn_0")
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) >= 0.04
+
+
+def test_synthetic_backend_is_built_once_from_settings():
+    """The registry serves the generated corpus; test mode keeps the fixed list"""
+    from src.core.config import Settings
+    from src.services.location_service import LocationService
+    from src.services.service_registry import ServiceRegistry
+
+    settings = Settings(
+        google_maps_api_key="unused",
+        location_backend="synthetic",
+        synthetic_place_count=500,
+        synthetic_result_count=3,
+    )
+    registry = ServiceRegistry.from_settings(settings)
+    service = registry.location_service
+
+    async def run():
+        try:
+            return await service.get_location_suggestions("pizza")
+        finally:
+            await registry.aclose()
+
+    suggestions = asyncio.run(run())
+
+    assert not service.test_mode
+    assert isinstance(service.client, SyntheticPlaces)
+    assert len(service.geo_index) == 500
+    assert len(suggestions) == 3
+    assert all("Pizza" in s.main_text and s.details for s in suggestions)
+
+    mock = LocationService(test_mode=True)
+    first = asyncio.run(mock.get_location_suggestions("pizza", include_details=False))
+    second = asyncio.run(mock.get_location_suggestions("anything"))
+    assert [s.place_id for s in second] == ["mock_place_1", "mock_place_2"]
+    assert first[0].details is None and second[0].details is not None
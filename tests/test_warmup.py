@@ -0,0 +1,126 @@
+import asyncio
+
+import orjson
+import pytest
+
+from src.services.warmup import CacheWarmer, WarmupPlan, load_warmup_plan, main
+
+
+def test_plans_rank_log_entries_and_keep_snapshot_order(tmp_path):
+    """Logs are ranked by frequency; snapshots keep their order"""
+    log = tmp_path / "requests.jsonl"
+    log.write_text(
+        '{"query": "Coffee"}\n{"query": "books"}\n\n'
+        '{"query": " coffee ", "session": "a"}\n{"place_id": "p2"}\n'
+        '{"place_id": "p1"}\n{"place_id": "p1", "query": ""}\n'
+    )
+    plan = load_warmup_plan(log, max_queries=5, max_places=1)
+    assert plan == WarmupPlan(queries=["coffee", "books"], place_ids=["p1"])
+
+    snapshot = tmp_path / "snapshot.json"
+    main([str(log), str(snapshot)])
+    assert orjson.loads(snapshot.read_bytes()) == {
+        "queries": ["coffee", "books"], "place_ids": ["p1", "p2"],
+    }
+    snapshot.write_text('{"queries": ["zoo", "art", "bar"], "place_ids": []}')
+    assert load_warmup_plan(snapshot, max_queries=2).queries == ["zoo", "art"]
+
+    log.write_text('{"query": "tea"}\n[1]\n')
+    with pytest.raises(ValueError):
+        load_warmup_plan(log)
+
+
+def test_warmer_fills_caches_within_its_budget_and_gates_readiness(client):
+    """Warmed queries and places are then served without upstream calls"""
+    from src.services.cache import PlaceDetailsCache, TieredCache, TTLCache
+    from src.services.location_service import (
+        PLACE_FIELDS,
+        VOLATILE_PLACE_FIELDS,
+        LocationService,
+    )
+    from src.services.service_registry import ServiceRegistry
+    from src.services.synthetic_places import SyntheticPlaces
+
+    class CountingPlaces(SyntheticPlaces):
+        calls = 0
+
+        async def places_autocomplete(self, input_text, **kwargs):
+            CountingPlaces.calls += 1
+            return await super().places_autocomplete(input_text, **kwargs)
+
+        async def place(self, place_id, fields=None, **kwargs):
+            CountingPlaces.calls += 1
+            return await super().place(place_id, fields, **kwargs)
+
+    service = LocationService(
+        test_mode=False,
+        client=CountingPlaces.generate(count=300, seed=2, limit=3),
+        result_cache=TieredCache(TTLCache(max_size=100, ttl=60)),
+        details_cache=PlaceDetailsCache(
+            PLACE_FIELDS, volatile_fields=VOLATILE_PLACE_FIELDS
+        ),
+    )
+    plan = WarmupPlan(queries=["coffee", "books", "pizza"], place_ids=["syn_7"])
+    warmer = CacheWarmer(service, plan, rate=20, concurrency=2)
+    previous = client.app.state.services
+    client.app.state.services = ServiceRegistry(service, warmer=warmer)
+
+    pending = client.get("/api/v1/ready")
+    assert pending.status_code == 503
+    assert pending.json()["warmup"]["state"] == "pending"
+
+    async def run():
+        await warmer.run()
+        calls = CountingPlaces.calls
+        await service.get_location_suggestions("books")
+        await service.get_place_details("syn_7")
+        return calls
+
+    warm_calls = asyncio.run(run())
+
+    # One autocomplete and three details lookups per query, one details lookup
+    assert warm_calls == 3 * 4 + 1
+    assert CountingPlaces.calls == warm_calls
+    # The warm-up budget is charged for every upstream call
+    assert warmer.limiter.stats.admitted == warm_calls
+    ready = client.get("/api/v1/ready")
+    client.app.state.services = previous
+    assert ready.status_code == 200
+    assert ready.json()["warmup"]["progress"] == 1.0
+    assert ready.json()["warmup"]["warmed"] == 4
+
+    queries = [f"shop {i}" for i in range(10)]
+    slow = CacheWarmer(service, WarmupPlan(queries=queries), rate=1, timeout=0.1)
+    missing = CacheWarmer(service, "/nonexistent/warmup.json")
+    asyncio.run(slow.run())
+    asyncio.run(missing.run())
+    assert slow.state == "timed_out" and slow.ready
+    assert missing.state == "failed" and missing.ready
+
+
+def test_unexpected_errors_count_as_failures_and_never_block_readiness():
+    """A service raising anything still lets warm-up finish"""
+    from src.services.location_service import LocationService
+
+    class BrokenService:
+        charged_to = staticmethod(LocationService.charged_to)
+
+        async def get_location_suggestions(self, query, include_details=True):
+            raise RuntimeError("upstream client bug")
+
+        async def get_place_details(self, place_id):
+            return None
+
+    plan = WarmupPlan(queries=["coffee", "books"], place_ids=["p1"])
+    warmer = CacheWarmer(BrokenService(), plan, rate=100)
+    asyncio.run(warmer.run())
+    assert warmer.state == "done" and warmer.ready
+    assert (warmer.progress.warmed, warmer.progress.failed) == (1, 2)
+
+    async def crash(plan):
+        raise RuntimeError("limiter bug")
+
+    broken = CacheWarmer(BrokenService(), plan)
+    broken._warm = crash
+    asyncio.run(broken.run())
+    assert broken.state == "failed" and broken.ready